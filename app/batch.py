@@ -0,0 +1,58 @@
+import asyncio
+import logging
+import os
+from typing import AsyncIterator, List, Optional, Tuple
+
+from app.limiter import ScrapeLimiter
+from app.models import BatchItem, ScraperError, StrategyMode
+from app.singleflight import coalesced_scrape
+from app.utils import is_absolute_url
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+BATCH_MAX_URLS = int(os.getenv("BATCH_MAX_URLS", "500"))
+
+
+async def iter_batch(
+    urls: List[str],
+    strategy: StrategyMode = "auto",
+    limiter: Optional[ScrapeLimiter] = None
+) -> AsyncIterator[Tuple[int, BatchItem]]:
+    """
+    Scrape URLs concurrently under the limiter's limits
+    Yields (position, item) pairs in completion order; a failing URL
+    yields an item with an error instead of failing the batch
+    """
+    limiter = limiter or ScrapeLimiter()
+
+    async def scrape_one(position: int, url: str) -> Tuple[int, BatchItem]:
+        if not is_absolute_url(url):
+            error = ScraperError(message="URL must start with http:// or https://", phase="validation")
+            return position, BatchItem(url=url, error=error)
+        try:
+            result = await coalesced_scrape(url, strategy=strategy, limiter=limiter)
+            return position, BatchItem(url=url, result=result)
+        except Exception as e:
+            logger.error(f"[BATCH] Scrape of {url} failed: {e}")
+            return position, BatchItem(url=url, error=ScraperError(message=str(e), phase="unknown"))
+
+    tasks = [asyncio.create_task(scrape_one(i, url)) for i, url in enumerate(urls)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def run_batch(
+    urls: List[str],
+    strategy: StrategyMode = "auto",
+    limiter: Optional[ScrapeLimiter] = None
+) -> List[BatchItem]:
+    """Scrape URLs concurrently and return their items in input order"""
+    items: List[Optional[BatchItem]] = [None] * len(urls)
+    async for position, item in iter_batch(urls, strategy, limiter):
+        items[position] = item
+    return items
@@ -0,0 +1,179 @@
+import asyncio
+import contextlib
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional
+
+from playwright.async_api import async_playwright, Browser, BrowserContext, Playwright
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "1"))
+BROWSER_MAX_CONTEXTS = int(os.getenv("BROWSER_MAX_CONTEXTS", "4"))
+BROWSER_RECYCLE_AFTER_PAGES = int(os.getenv("BROWSER_RECYCLE_AFTER_PAGES", "200"))
+BROWSER_LAUNCH_ARGS = ["--disable-blink-features=AutomationControlled"]
+BROWSER_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+BROWSER_VIEWPORT = {"width": 1280, "height": 720}
+
+
+class PooledBrowser:
+    """A launched browser plus the bookkeeping used for recycling"""
+
+    def __init__(self, browser: Browser):
+        self.browser = browser
+        self.pages_served = 0
+        self.active_contexts = 0
+        self.retiring = False
+
+    @property
+    def healthy(self) -> bool:
+        return not self.retiring and self.browser.is_connected()
+
+
+class BrowserPool:
+    """
+    Process-wide pool of long-lived Chromium browsers
+
+    Browsers are launched once and shared; each scrape leases a fresh
+    BrowserContext. Browsers are recycled after serving a number of pages
+    or when they disconnect (crash).
+    """
+
+    def __init__(
+        self,
+        size: int = BROWSER_POOL_SIZE,
+        max_contexts: int = BROWSER_MAX_CONTEXTS,
+        recycle_after_pages: int = BROWSER_RECYCLE_AFTER_PAGES,
+    ):
+        self.size = max(1, size)
+        self.max_contexts = max(1, max_contexts)
+        self.recycle_after_pages = recycle_after_pages
+        self._playwright: Optional[Playwright] = None
+        self._browsers: List[PooledBrowser] = []
+        self._semaphore = asyncio.Semaphore(self.max_contexts)
+        self._lock = asyncio.Lock()
+        self._launches = 0
+        self._recycles = 0
+
+    @property
+    def started(self) -> bool:
+        return self._playwright is not None
+
+    async def start(self) -> None:
+        """Start Playwright and launch the configured number of browsers"""
+        async with self._lock:
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            while len(self._browsers) < self.size:
+                self._browsers.append(await self._launch())
+        logger.info(f"[POOL] Browser pool started with {len(self._browsers)} browser(s)")
+
+    async def stop(self) -> None:
+        """Close every browser and stop Playwright"""
+        async with self._lock:
+            browsers, self._browsers = self._browsers, []
+            for pooled in browsers:
+                await self._close(pooled)
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+        logger.info("[POOL] Browser pool stopped")
+
+    @asynccontextmanager
+    async def context(self) -> AsyncIterator[BrowserContext]:
+        """Lease a fresh BrowserContext from a pooled browser"""
+        async with self._semaphore:
+            pooled = await self._acquire()
+            pooled.active_contexts += 1
+            try:
+                context = await pooled.browser.new_context(
+                    user_agent=BROWSER_USER_AGENT,
+                    viewport=BROWSER_VIEWPORT
+                )
+            except Exception:
+                pooled.active_contexts -= 1
+                pooled.retiring = True
+                await self._maybe_retire(pooled)
+                raise
+
+            def _count_page(_page) -> None:
+                pooled.pages_served += 1
+
+            context.on("page", _count_page)
+
+            try:
+                yield context
+            finally:
+                try:
+                    await context.close()
+                except Exception as e:
+                    logger.debug(f"[POOL] Context close failed: {e}")
+                pooled.active_contexts -= 1
+                if pooled.pages_served >= self.recycle_after_pages:
+                    pooled.retiring = True
+                await self._maybe_retire(pooled)
+
+    def stats(self) -> dict:
+        """Pool utilization snapshot for monitoring"""
+        return {
+            "browsers": len(self._browsers),
+            "maxContexts": self.max_contexts,
+            "activeContexts": sum(b.active_contexts for b in self._browsers),
+            "pagesServed": sum(b.pages_served for b in self._browsers),
+            "launches": self._launches,
+            "recycles": self._recycles,
+        }
+
+    async def _acquire(self) -> PooledBrowser:
+        """Return the least-loaded healthy browser, replacing dead ones"""
+        async with self._lock:
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+
+            for pooled in list(self._browsers):
+                if not pooled.browser.is_connected():
+                    logger.warning("[POOL] Browser disconnected, replacing")
+                    self._browsers.remove(pooled)
+                    self._recycles += 1
+                    # Release the Playwright handle and any leftover process
+                    with contextlib.suppress(Exception):
+                        await pooled.browser.close()
+
+            healthy = [b for b in self._browsers if b.healthy]
+            if len(healthy) < self.size:
+                pooled = await self._launch()
+                self._browsers.append(pooled)
+                healthy.append(pooled)
+
+            return min(healthy, key=lambda b: b.active_contexts)
+
+    async def _launch(self) -> PooledBrowser:
+        browser = await self._playwright.chromium.launch(
+            headless=True,
+            args=BROWSER_LAUNCH_ARGS
+        )
+        self._launches += 1
+        return PooledBrowser(browser)
+
+    async def _maybe_retire(self, pooled: PooledBrowser) -> None:
+        """Close a retiring browser once its last context is released"""
+        if not pooled.retiring or pooled.active_contexts > 0:
+            return
+        async with self._lock:
+            if pooled in self._browsers:
+                self._browsers.remove(pooled)
+                self._recycles += 1
+        logger.info(f"[POOL] Recycling browser after {pooled.pages_served} pages")
+        await self._close(pooled)
+
+    async def _close(self, pooled: PooledBrowser) -> None:
+        try:
+            await pooled.browser.close()
+        except Exception as e:
+            logger.debug(f"[POOL] Browser close failed: {e}")
+
+
+# Shared pool, started and stopped by the FastAPI lifespan
+browser_pool = BrowserPool()
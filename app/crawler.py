@@ -0,0 +1,249 @@
+import asyncio
+import hashlib
+import logging
+import math
+import os
+from collections import deque
+from typing import AsyncIterator, Deque, Dict, Iterable, Optional, Set, Tuple
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+from app.http_client import HttpClientPool, http_client
+from app.limiter import DomainRateLimiter, ScrapeLimiter, crawl_rate_limiter
+from app.models import CrawlItem, ScraperError, ScraperResult, StrategyMode
+from app.scraper import WebScraper
+from app.utils import is_absolute_url, make_absolute_url, normalize_url, same_domain
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+CRAWL_MAX_PAGES = int(os.getenv("CRAWL_MAX_PAGES", "1000"))  # Upper bound for maxPages
+CRAWL_MAX_DEPTH = int(os.getenv("CRAWL_MAX_DEPTH", "5"))  # Upper bound for maxDepth
+CRAWL_CONCURRENCY = int(os.getenv("CRAWL_CONCURRENCY", "4"))  # Pages scraped at once per crawl
+CRAWL_RESPECT_ROBOTS = os.getenv("CRAWL_RESPECT_ROBOTS", "true").lower() == "true"
+CRAWL_ROBOTS_AGENT = os.getenv("CRAWL_ROBOTS_AGENT", "*")  # User-agent matched against robots.txt
+CRAWL_BLOOM_THRESHOLD = int(os.getenv("CRAWL_BLOOM_THRESHOLD", "10000"))  # maxPages from which a Bloom filter is used
+CRAWL_LINKS_PER_PAGE = 50  # Expected distinct links per page, to size the Bloom filter
+
+# Links that are never HTML pages
+SKIP_EXTENSIONS = (
+    ".pdf", ".zip", ".gz", ".tar", ".rar", ".7z", ".exe", ".dmg", ".iso",
+    ".jpg", ".jpeg", ".png", ".gif", ".webp", ".svg", ".ico", ".bmp",
+    ".mp3", ".mp4", ".avi", ".mov", ".webm", ".wav",
+    ".css", ".js", ".json", ".xml", ".rss", ".woff", ".woff2", ".ttf",
+    ".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx", ".csv",
+)
+
+
+class VisitedSet:
+    """Exact set of seen URLs, stored as 8-byte digests instead of strings"""
+
+    def __init__(self):
+        self._digests: Set[bytes] = set()
+
+    def add(self, key: str) -> None:
+        self._digests.add(_digest(key, 8))
+
+    def __contains__(self, key: str) -> bool:
+        return _digest(key, 8) in self._digests
+
+    def __len__(self) -> int:
+        return len(self._digests)
+
+
+class BloomFilter:
+    """
+    Fixed-size probabilistic set for very large crawls
+
+    Never reports a seen URL as new; with probability error_rate (once
+    `capacity` URLs were added) reports a new URL as seen, which only
+    means that page is skipped.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self._count = 0
+
+    def add(self, key: str) -> None:
+        for bit in self._bit_positions(key):
+            self._bits[bit >> 3] |= 1 << (bit & 7)
+        self._count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[bit >> 3] & (1 << (bit & 7)) for bit in self._bit_positions(key))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _bit_positions(self, key: str) -> Iterable[int]:
+        # Double hashing: k positions from two 64-bit hashes
+        digest = _digest(key, 16)
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+
+def _digest(key: str, size: int) -> bytes:
+    return hashlib.blake2b(key.encode("utf-8", "surrogatepass"), digest_size=size).digest()
+
+
+class RobotsCache:
+    """
+    robots.txt rules per host, fetched once per crawl
+
+    A missing robots.txt (4xx) allows everything; a server error
+    disallows the host, as RFC 9309 asks. Unreachable hosts are allowed,
+    the page fetch itself will then fail.
+    """
+
+    def __init__(self, client: Optional[HttpClientPool] = None, agent: str = CRAWL_ROBOTS_AGENT):
+        self.client = client or http_client
+        self.agent = agent
+        self._parsers: Dict[str, RobotFileParser] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def allowed(self, url: str) -> bool:
+        parser = await self._parser(url)
+        return parser.can_fetch(self.agent, url)
+
+    async def delay(self, url: str) -> Optional[float]:
+        """Seconds between requests asked for by Crawl-delay or Request-rate"""
+        parser = await self._parser(url)
+        delay = parser.crawl_delay(self.agent)
+        if delay is not None:
+            return float(delay)
+        rate = parser.request_rate(self.agent)
+        if rate is not None and rate.requests:
+            return rate.seconds / rate.requests
+        return None
+
+    async def _parser(self, url: str) -> RobotFileParser:
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        parser = self._parsers.get(origin)
+        if parser is not None:
+            return parser
+        lock = self._locks.setdefault(origin, asyncio.Lock())
+        async with lock:
+            if origin not in self._parsers:
+                self._parsers[origin] = await self._fetch(origin)
+        return self._parsers[origin]
+
+    async def _fetch(self, origin: str) -> RobotFileParser:
+        parser = RobotFileParser(f"{origin}/robots.txt")
+        try:
+            response = await self.client.get(parser.url, timeout=10)
+        except Exception as e:
+            logger.info(f"[CRAWL] No robots.txt for {origin} ({e}), allowing all")
+            parser.parse([])
+            return parser
+        if response.status_code >= 500:
+            logger.info(f"[CRAWL] robots.txt for {origin} returned {response.status_code}, disallowing all")
+            parser.parse(["User-agent: *", "Disallow: /"])
+        elif response.status_code >= 400:
+            parser.parse([])
+        else:
+            parser.parse(response.text.splitlines())
+        return parser
+
+
+class SiteCrawler:
+    """
+    Breadth-first crawl of one site through the WebScraper pipeline
+
+    Starting at start_url, every page is scraped like a /scrape request
+    and the same-domain links in its sections are queued one level
+    deeper, up to max_depth levels and max_pages scraped pages. URLs are
+    normalized before deduplication. robots.txt is honoured, including
+    its Crawl-delay, on top of the shared per-domain rate limit, and at
+    most `concurrency` pages of the crawl are in flight at once.
+    """
+
+    def __init__(
+        self,
+        start_url: str,
+        max_depth: int = 2,
+        max_pages: int = 50,
+        strategy: StrategyMode = "auto",
+        concurrency: int = CRAWL_CONCURRENCY,
+        limiter: Optional[ScrapeLimiter] = None,
+        rate_limiter: Optional[DomainRateLimiter] = None,
+        robots: Optional[RobotsCache] = None,
+        respect_robots: bool = CRAWL_RESPECT_ROBOTS,
+    ):
+        self.start_url = start_url
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.strategy = strategy
+        self.concurrency = max(1, concurrency)
+        self.limiter = limiter
+        self.rate_limiter = rate_limiter or crawl_rate_limiter
+        self.robots = robots or RobotsCache()
+        self.respect_robots = respect_robots
+        if max_pages >= CRAWL_BLOOM_THRESHOLD:
+            self.visited = BloomFilter(max_pages * CRAWL_LINKS_PER_PAGE)
+        else:
+            self.visited = VisitedSet()
+        self.frontier: Deque[Tuple[str, int]] = deque()
+        self.robots_skipped = 0
+
+    async def crawl(self) -> AsyncIterator[CrawlItem]:
+        """Yield one item per scraped page, in completion order"""
+        self._enqueue([self.start_url], 0)
+        started = 0
+        pending = set()
+        try:
+            while self.frontier or pending:
+                while self.frontier and started < self.max_pages and len(pending) < self.concurrency:
+                    url, depth = self.frontier.popleft()
+                    if self.respect_robots and not await self.robots.allowed(url):
+                        self.robots_skipped += 1
+                        logger.info(f"[CRAWL] robots.txt disallows {url}")
+                        continue
+                    started += 1
+                    pending.add(asyncio.create_task(self._scrape(url, depth)))
+                if not pending:
+                    break
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    item = task.result()
+                    if item.result is not None and item.depth < self.max_depth:
+                        self._enqueue(_links(item.result), item.depth + 1)
+                    yield item
+        finally:
+            for task in pending:
+                task.cancel()
+        logger.info(f"[CRAWL] Crawl of {self.start_url} done: {started} pages, {self.robots_skipped} disallowed")
+
+    def _enqueue(self, urls: Iterable[str], depth: int) -> None:
+        for url in urls:
+            if not is_absolute_url(url) or not same_domain(url, self.start_url):
+                continue
+            if urlsplit(url).path.lower().endswith(SKIP_EXTENSIONS):
+                continue
+            key = normalize_url(url)
+            if key in self.visited:
+                continue
+            self.visited.add(key)
+            self.frontier.append((url, depth))
+
+    async def _scrape(self, url: str, depth: int) -> CrawlItem:
+        try:
+            delay = await self.robots.delay(url) if self.respect_robots else None
+            await self.rate_limiter.wait(url, min_interval=delay)
+            scraper = WebScraper(limiter=self.limiter, paginate=False)
+            result = await scraper.scrape(url, strategy=self.strategy)
+            return CrawlItem(url=url, depth=depth, result=result)
+        except Exception as e:
+            logger.error(f"[CRAWL] Scrape of {url} failed: {e}")
+            return CrawlItem(url=url, depth=depth, error=ScraperError(message=str(e), phase="unknown"))
+
+
+def _links(result: ScraperResult) -> Iterable[str]:
+    """Link targets found in a scraped page's sections, in page order"""
+    for section in result.sections:
+        for link in section.content.links:
+            yield make_absolute_url(link.href, section.sourceUrl)
@@ -0,0 +1,288 @@
+import logging
+import re
+from functools import cached_property
+from typing import Iterator, List, Optional
+from urllib.parse import urldefrag, urljoin, urlsplit
+
+from bs4 import BeautifulSoup
+
+from app import lxml_parser
+from app.fetch_cache import content_hash
+from app.models import Metadata, Section
+from app.section_parser import SECTION_PARSER_ENGINE, iter_sections_from_soup, strip_noise, strip_scripts
+
+logger = logging.getLogger(__name__)
+
+# Static HTML markers suggesting the interaction phase would find something
+INTERACTION_SIGNAL_SELECTORS = {
+    "tabs": "[role='tab'], [role='tablist'], .tab-button, .nav-tab",
+    "load-more": "[data-action='load-more'], .load-more, [class*='load-more']",
+    "pagination": "a[rel='next'], link[rel='next'], a[aria-label='Next page'], .pagination a.next",
+    "infinite-scroll": "[data-infinite-scroll], [class*='infinite-scroll'], [data-next-page]",
+}
+LOAD_MORE_TEXT = re.compile(r"\b(load|show|view|see) more\b", re.IGNORECASE)
+
+# Links to further pages of a listing: "next" links anywhere, and
+# numbered links inside pagination widgets
+PAGINATION_LINK_SELECTOR = (
+    "a[rel~='next'], link[rel~='next'], a[aria-label='Next page'], a.page-numbers, "
+    ".pagination a, .pager a, nav[aria-label*='agination'] a"
+)
+NEXT_LINK_TEXT = re.compile(r"^(next\b|›|»|>)", re.IGNORECASE)
+
+# Cached results that can be exported and restored
+ANALYSIS_FIELDS = ("quality_score", "metadata", "interaction_signals", "pagination_links", "sections")
+
+
+class ParsedDocument:
+    """
+    An HTML document parsed once and shared by every analysis stage
+
+    Scripts and styles are stripped once on parsing; quality scoring and
+    metadata read the page as served otherwise. Noise (cookie banners,
+    ads, popups) is then stripped once for interaction signals,
+    pagination links and section extraction, which read the same tree
+    without mutating it. Each result is computed on first access and
+    cached. The tree itself
+    is only built once a result is needed, so a document whose results
+    were restored from the fetch cache is never parsed.
+
+    The engine ("bs4" or "lxml", default SECTION_PARSER_ENGINE) selects
+    the tree type; both engines produce the same results.
+    """
+
+    def __init__(self, html: str, url: str, engine: Optional[str] = None):
+        self.html = html
+        self.url = url
+        self.engine = engine or SECTION_PARSER_ENGINE
+        self.parsed_in_worker = False  # Results computed from this HTML by a parse worker
+
+    @cached_property
+    def tree(self):
+        """lxml tree without scripts and styles, parsed on first use"""
+        tree = lxml_parser.parse_html(self.html)
+        lxml_parser.strip_scripts(tree)
+        return tree
+
+    @cached_property
+    def soup(self) -> BeautifulSoup:
+        """BeautifulSoup tree without scripts and styles, parsed on first use"""
+        soup = BeautifulSoup(self.html, "lxml")
+        strip_scripts(soup)
+        return soup
+
+    @cached_property
+    def content_root(self):
+        """
+        The engine's tree with noise stripped too, for content extraction
+        Consent tools put noise classes on <html> and <body>, so the
+        quality score and metadata are taken from the tree first
+        """
+        self.quality_score
+        self.metadata
+        if self.engine == "lxml":
+            lxml_parser.strip_noise(self.tree)
+            return self.tree
+        strip_noise(self.soup)
+        return self.soup
+
+    @cached_property
+    def content_hash(self) -> str:
+        return content_hash(self.html)
+
+    @property
+    def parsed(self) -> bool:
+        """Whether the HTML has been parsed (results restored from a cache need no tree)"""
+        return self.parsed_in_worker or "tree" in self.__dict__ or "soup" in self.__dict__
+
+    def export_analysis(self) -> dict:
+        """Results computed so far, as JSON-serializable values"""
+        analysis = {}
+        for name in ANALYSIS_FIELDS:
+            if name in self.__dict__:
+                analysis[name] = _dump(self.__dict__[name])
+        return analysis
+
+    def restore_analysis(self, analysis: dict) -> None:
+        """Reuse results exported from a document with the same HTML"""
+        for name, value in analysis.items():
+            if name == "metadata":
+                value = Metadata.model_validate(value)
+            elif name == "sections":
+                value = [Section.model_validate(section) for section in value]
+            elif name not in ANALYSIS_FIELDS:
+                continue
+            self.__dict__[name] = value
+
+    @cached_property
+    def quality_score(self) -> int:
+        """
+        Score HTML content quality to determine if JS rendering is needed
+        Higher score = better content
+        """
+        if self.engine == "lxml":
+            return lxml_parser.quality_score(self.tree)
+        soup = self.soup
+
+        # Count text
+        text_length = len(soup.get_text(strip=True))
+
+        # Check for main element
+        has_main = bool(soup.find(["main", "article"]))
+
+        # Check for heading
+        has_heading = bool(soup.find(["h1", "h2", "h3"]))
+
+        # Score
+        score = text_length
+        if has_main:
+            score += 300
+        if has_heading:
+            score += 200
+
+        return score
+
+    @cached_property
+    def metadata(self) -> Metadata:
+        """Extract page metadata"""
+        if self.engine == "lxml":
+            return lxml_parser.extract_metadata(self.tree)
+        soup = self.soup
+
+        # Title
+        title = ""
+        title_tag = soup.find("title")
+        if title_tag:
+            title = title_tag.get_text(strip=True)
+        if not title:
+            og_title = soup.find("meta", property="og:title")
+            if og_title:
+                title = og_title.get("content", "")
+
+        # Description
+        description = ""
+        desc_tag = soup.find("meta", attrs={"name": "description"})
+        if desc_tag:
+            description = desc_tag.get("content", "")
+        if not description:
+            og_desc = soup.find("meta", property="og:description")
+            if og_desc:
+                description = og_desc.get("content", "")
+
+        # Language
+        language = "en"
+        html_tag = soup.find("html")
+        if html_tag:
+            language = html_tag.get("lang", "en").split("-")[0]
+
+        # Canonical
+        canonical = None
+        canonical_tag = soup.find("link", attrs={"rel": "canonical"})
+        if canonical_tag:
+            canonical = canonical_tag.get("href")
+
+        return Metadata(
+            title=title,
+            description=description,
+            language=language,
+            canonical=canonical
+        )
+
+    @cached_property
+    def interaction_signals(self) -> List[str]:
+        """Kinds of interactive content (tabs, load more, ...) present in the HTML"""
+        if self.engine == "lxml":
+            root = self.content_root
+            signals = [
+                name for name, selector in INTERACTION_SIGNAL_SELECTORS.items()
+                if lxml_parser.select_one(root, selector) is not None
+            ]
+            buttons = (lxml_parser.element_text(b, " ") for b in root.iter("button", "a"))
+        else:
+            soup = self.content_root
+            signals = [
+                name for name, selector in INTERACTION_SIGNAL_SELECTORS.items()
+                if soup.select_one(selector)
+            ]
+            buttons = (b.get_text(" ", strip=True) for b in soup.find_all(["button", "a"]))
+
+        if "load-more" not in signals:
+            for button_text in buttons:
+                if LOAD_MORE_TEXT.search(button_text):
+                    signals.append("load-more")
+                    break
+
+        return signals
+
+    @cached_property
+    def pagination_links(self) -> List[str]:
+        """Absolute URLs of next and numbered pages on the same host, in page order"""
+        if self.engine == "lxml":
+            candidates = (
+                (a.get("href"), a.get("rel"), a.get("aria-label"), a.get("class"), lxml_parser.element_text(a, " "))
+                for a in lxml_parser.select(self.content_root, PAGINATION_LINK_SELECTOR)
+            )
+        else:
+            candidates = (
+                (a.get("href"), " ".join(a.get("rel") or ()), a.get("aria-label"),
+                 " ".join(a.get("class") or ()), a.get_text(" ", strip=True))
+                for a in self.content_root.select(PAGINATION_LINK_SELECTOR)
+            )
+
+        host = urlsplit(self.url).netloc.lower()
+        links = []
+        for href, rel, label, classes, text in candidates:
+            if not href or href.startswith(("#", "javascript:")):
+                continue
+            rel, label, classes = (rel or "").lower(), (label or "").lower(), (classes or "").lower()
+            is_next = (
+                "next" in rel.split() or "next" in label or "next" in classes.split()
+                or NEXT_LINK_TEXT.match(text)
+            )
+            if not is_next and not text.isdigit():
+                continue  # Previous, first/last, ellipsis, ...
+            link = urldefrag(urljoin(self.url, href)).url
+            if urlsplit(link).netloc.lower() == host and link != self.url and link not in links:
+                links.append(link)
+        return links
+
+    @cached_property
+    def sections(self) -> List[Section]:
+        """Semantic sections of the page"""
+        return list(self._extract_sections())
+
+    @property
+    def has_sections(self) -> bool:
+        """Whether the sections were computed and kept"""
+        return "sections" in self.__dict__
+
+    def iter_sections(self, keep: bool = True) -> Iterator[Section]:
+        """
+        Sections of the page, each yielded as soon as it is extracted
+        Once exhausted, the sections are cached like the sections property;
+        with keep=False they are not, so a streamed page is never held whole
+        """
+        if self.has_sections:
+            yield from self.sections
+            return
+        if not keep:
+            yield from self._extract_sections()
+            return
+        sections = []
+        for section in self._extract_sections():
+            sections.append(section)
+            yield section
+        self.__dict__["sections"] = sections
+
+    def _extract_sections(self) -> Iterator[Section]:
+        if self.engine == "lxml":
+            return lxml_parser.iter_sections_from_tree(self.content_root, self.url)
+        return iter_sections_from_soup(self.content_root, self.url)
+
+
+def _dump(value):
+    if isinstance(value, list):
+        return [_dump(item) for item in value]
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    return value
@@ -0,0 +1,246 @@
+import asyncio
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+DOMAIN_PROFILES_DB_PATH = os.getenv("DOMAIN_PROFILES_DB_PATH", ".cache/domain_profiles.sqlite3")  # Empty: memory only
+DOMAIN_PROFILES_MAX = int(os.getenv("DOMAIN_PROFILES_MAX", "10000"))  # Profiles kept in memory, least recently used dropped
+DOMAIN_PROFILES_MIN_SCRAPES = int(os.getenv("DOMAIN_PROFILES_MIN_SCRAPES", "3"))  # Scrapes before a domain is routed
+DOMAIN_PROFILES_PROBE_RATE = float(os.getenv("DOMAIN_PROFILES_PROBE_RATE", "0.05"))  # Routed scrapes re-probed in full
+PROFILE_WEIGHT = 0.3  # Weight of the latest scrape in the moving averages
+ROUTE_CONFIDENCE = 0.8  # js_rate from which a domain is rendered directly (up to 1 - this: static)
+USELESS_INTERACTION_RATE = 0.1  # interaction_rate below which the interaction phase is skipped
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS domain_profiles (
+    domain TEXT PRIMARY KEY,
+    scrapes INTEGER NOT NULL,
+    js_rate REAL NOT NULL,
+    quality_score REAL,
+    interaction_scrapes INTEGER NOT NULL,
+    interaction_rate REAL NOT NULL,
+    render_ms REAL,
+    updated_at REAL NOT NULL
+);
+"""
+_COLUMNS = ("domain", "scrapes", "js_rate", "quality_score", "interaction_scrapes", "interaction_rate", "render_ms")
+
+
+@dataclass
+class DomainProfile:
+    """What auto scrapes of one domain needed so far, as moving averages"""
+    domain: str
+    scrapes: int = 0  # Scrapes whose static HTML was scored
+    js_rate: float = 0.0  # How often the static HTML was insufficient (0..1)
+    quality_score: Optional[float] = None  # Static content quality score
+    interaction_scrapes: int = 0  # Scrapes that ran the interaction phase
+    interaction_rate: float = 0.0  # How often interactions added sections (0..1)
+    render_ms: Optional[float] = None  # JS render time
+
+    @property
+    def needs_js(self) -> bool:
+        return self.js_rate >= 0.5
+
+    def observe(
+        self,
+        needs_js: Optional[bool],
+        quality_score: Optional[int],
+        interacted: bool,
+        interactions_found: bool,
+        render_ms: Optional[float]
+    ) -> None:
+        if needs_js is not None:
+            self.js_rate = _average(self.js_rate if self.scrapes else None, float(needs_js))
+            self.scrapes += 1
+        if quality_score is not None:
+            self.quality_score = _average(self.quality_score, quality_score)
+        if interacted:
+            self.interaction_rate = _average(
+                self.interaction_rate if self.interaction_scrapes else None, float(interactions_found)
+            )
+            self.interaction_scrapes += 1
+        if render_ms is not None:
+            self.render_ms = _average(self.render_ms, render_ms)
+
+
+@dataclass
+class RoutingPlan:
+    """How an auto scrape should proceed, from its domain's profile"""
+    profile: Optional[DomainProfile] = None
+    path: Optional[str] = None  # "static" or "js" once the domain's needs are known
+    skip_interactions: bool = False  # Interactions never added anything on this domain
+    probe: bool = False  # A routed domain run through the full auto path this time
+
+
+class DomainProfiles:
+    """
+    Learned static-vs-JS routing per domain
+
+    Every auto scrape records whether its static HTML was sufficient,
+    its quality score, whether the interaction phase added sections and
+    how long rendering took. Scrapes that never scored static HTML (a
+    render won the hedge, the domain was routed to JS, the fetch failed)
+    say nothing about the first. After min_scrapes scored scrapes, a
+    domain that (nearly) always needed JS is rendered without a static
+    fetch, one that (nearly) never did is not hedged, and interactions
+    that never found anything are skipped. A probe_rate share of those scrapes
+    still runs the full auto path, so a site that changed is noticed.
+
+    Profiles are stored in SQLite so they survive restarts, the recently
+    used ones in an in-memory LRU. Before start() (or without db_path)
+    they live in memory only.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = DOMAIN_PROFILES_DB_PATH,
+        max_domains: int = DOMAIN_PROFILES_MAX,
+        min_scrapes: int = DOMAIN_PROFILES_MIN_SCRAPES,
+        probe_rate: float = DOMAIN_PROFILES_PROBE_RATE,
+    ):
+        self.db_path = db_path
+        self.max_domains = max(1, max_domains)
+        self.min_scrapes = max(1, min_scrapes)
+        self.probe_rate = probe_rate
+        self._profiles: "OrderedDict[str, DomainProfile]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._counters = {"routedJs": 0, "routedStatic": 0, "interactionsSkipped": 0, "probes": 0}
+
+    async def start(self) -> None:
+        """Open the database"""
+        if self.db_path and self._db is None:
+            await asyncio.to_thread(self._open)
+        logger.info(f"[PROFILE] Domain profiles started ({self.db_path or 'memory only'})")
+
+    async def stop(self) -> None:
+        if self._db is not None:
+            with self._db_lock:
+                self._db.close()
+            self._db = None
+        logger.info("[PROFILE] Domain profiles stopped")
+
+    async def get(self, url: str) -> Optional[DomainProfile]:
+        domain = _domain(url)
+        profile = self._profiles.get(domain)
+        if profile is not None:
+            self._profiles.move_to_end(domain)
+            return profile
+        if self._db is None:
+            return None
+        row = await asyncio.to_thread(self._load, domain)
+        return self._remember(DomainProfile(*row)) if row else None
+
+    async def plan(self, url: str) -> RoutingPlan:
+        """Routing for an auto scrape of url"""
+        profile = await self.get(url)
+        plan = RoutingPlan(profile=profile)
+        if profile is None or profile.scrapes < self.min_scrapes:
+            return plan
+        if profile.js_rate >= ROUTE_CONFIDENCE:
+            plan.path = "js"
+        elif profile.js_rate <= 1 - ROUTE_CONFIDENCE:
+            plan.path = "static"
+        plan.skip_interactions = (
+            profile.interaction_scrapes >= self.min_scrapes
+            and profile.interaction_rate < USELESS_INTERACTION_RATE
+        )
+        if (plan.path or plan.skip_interactions) and random.random() < self.probe_rate:
+            logger.info(f"[PROFILE] Re-probing {profile.domain} through the full auto path")
+            self._counters["probes"] += 1
+            return RoutingPlan(profile=profile, probe=True)
+        if plan.path == "js":
+            self._counters["routedJs"] += 1
+        elif plan.path == "static":
+            self._counters["routedStatic"] += 1
+        if plan.skip_interactions:
+            self._counters["interactionsSkipped"] += 1
+        return plan
+
+    async def record(
+        self,
+        url: str,
+        needs_js: Optional[bool],
+        quality_score: Optional[int] = None,
+        interacted: bool = False,
+        interactions_found: bool = False,
+        render_ms: Optional[float] = None
+    ) -> DomainProfile:
+        """
+        Fold the outcome of an auto scrape into its domain's profile
+        needs_js is None when no static HTML was scored
+        """
+        profile = await self.get(url) or self._remember(DomainProfile(domain=_domain(url)))
+        was_js = profile.needs_js if profile.scrapes else None
+        profile.observe(needs_js, quality_score, interacted, interactions_found, render_ms)
+        if was_js is not None and was_js != profile.needs_js:
+            logger.info(f"[PROFILE] {profile.domain} now {'needs' if profile.needs_js else 'does not need'} JS")
+        if self._db is not None:
+            await asyncio.to_thread(self._save, profile)
+        return profile
+
+    def stats(self) -> dict:
+        return {
+            "persistent": self._db is not None,
+            "cachedDomains": len(self._profiles),
+            "maxDomains": self.max_domains,
+            "jsDomains": sum(1 for profile in self._profiles.values() if profile.needs_js),
+            **self._counters,
+        }
+
+    def _remember(self, profile: DomainProfile) -> DomainProfile:
+        self._profiles[profile.domain] = profile
+        self._profiles.move_to_end(profile.domain)
+        while len(self._profiles) > self.max_domains:
+            self._profiles.popitem(last=False)
+        return profile
+
+    # SQLite access (runs in worker threads)
+
+    def _open(self) -> None:
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(self.db_path, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.executescript(_SCHEMA)
+        self._db = db
+
+    def _load(self, domain: str) -> Optional[tuple]:
+        with self._db_lock:
+            return self._db.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM domain_profiles WHERE domain = ?", (domain,)
+            ).fetchone()
+
+    def _save(self, profile: DomainProfile) -> None:
+        values = tuple(getattr(profile, column) for column in _COLUMNS)
+        with self._db_lock, self._db:
+            self._db.execute(
+                f"INSERT OR REPLACE INTO domain_profiles ({', '.join(_COLUMNS)}, updated_at) "
+                f"VALUES ({', '.join('?' * len(_COLUMNS))}, ?)",
+                values + (time.time(),)
+            )
+
+
+def _average(previous: Optional[float], value: float) -> float:
+    """Exponential moving average; the first value is taken as is"""
+    if previous is None:
+        return value
+    return previous + PROFILE_WEIGHT * (value - previous)
+
+
+def _domain(url: str) -> str:
+    return urlsplit(url).netloc.lower()
+
+
+# Shared store, started and stopped by the FastAPI lifespan
+domain_profiles = DomainProfiles()
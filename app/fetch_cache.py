@@ -0,0 +1,343 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+FETCH_CACHE_ENABLED = os.getenv("FETCH_CACHE_ENABLED", "true").lower() == "true"
+FETCH_CACHE_TTL = int(os.getenv("FETCH_CACHE_TTL", "300"))  # Max seconds before revalidation
+FETCH_CACHE_RENDER_TTL = int(os.getenv("FETCH_CACHE_RENDER_TTL", "60"))  # Seconds a render is reused, 0 = never
+FETCH_CACHE_MEMORY_MAX_BYTES = int(os.getenv("FETCH_CACHE_MEMORY_MAX_BYTES", str(64 * 1024 * 1024)))
+FETCH_CACHE_DIR = os.getenv("FETCH_CACHE_DIR", ".cache/fetch")  # Empty disables the disk store
+FETCH_CACHE_DISK_MAX_BYTES = int(os.getenv("FETCH_CACHE_DISK_MAX_BYTES", str(512 * 1024 * 1024)))
+# Part of analysis keys; bumped when parsing results change, so analyses
+# stored by an older version are not restored
+ANALYSIS_VERSION = 2
+
+
+def content_hash(body: str) -> str:
+    """Content address of a response body"""
+    return hashlib.sha256(body.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+@dataclass
+class CachedResponse:
+    """A fetched or rendered body with the validators needed to revalidate it"""
+    url: str
+    body: str
+    content_hash: str
+    stored_at: float
+    expires_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    @property
+    def revalidatable(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+    def conditional_headers(self) -> dict:
+        """If-None-Match / If-Modified-Since headers for a conditional GET"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class FetchCache:
+    """
+    Response cache shared by static fetches and JS renders
+
+    Entries live in a byte-bounded in-memory LRU backed by a byte-bounded
+    directory of JSON files, so they survive restarts. Static responses are
+    served from cache while fresh and revalidated with their ETag or
+    Last-Modified once stale. Freshness comes from the response's
+    Cache-Control max-age or Expires, capped by the TTL; no-cache, or
+    validators without freshness information, mean every use is
+    revalidated. Renders carry no validators: they are reused for the
+    shorter render_ttl, then simply redone.
+
+    The cache also keeps the analysis (sections, metadata, ...) of parsed
+    documents, addressed by URL, engine and content hash, so an unchanged
+    body is never parsed twice.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = FETCH_CACHE_ENABLED,
+        ttl: int = FETCH_CACHE_TTL,
+        render_ttl: int = FETCH_CACHE_RENDER_TTL,
+        memory_max_bytes: int = FETCH_CACHE_MEMORY_MAX_BYTES,
+        disk_dir: Optional[str] = FETCH_CACHE_DIR,
+        disk_max_bytes: int = FETCH_CACHE_DISK_MAX_BYTES,
+    ):
+        self.enabled = enabled
+        self.ttl = ttl
+        self.render_ttl = render_ttl
+        self.memory_max_bytes = memory_max_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.disk_max_bytes = disk_max_bytes
+        self._memory: "OrderedDict[str, tuple[dict, int]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_index: Optional["OrderedDict[str, int]"] = None  # File name -> size, LRU order
+        self._disk_bytes = 0
+        self._disk_lock = threading.RLock()
+        self._counters = {"hits": 0, "misses": 0, "revalidated": 0, "stores": 0, "evictions": 0}
+
+    # Responses
+
+    async def get_response(self, kind: str, url: str) -> Optional[CachedResponse]:
+        """Cached static ("static") or rendered ("js") body for a URL"""
+        value = await self.get(f"{kind}:{url}")
+        if value is None:
+            return None
+        cached = CachedResponse(**value)
+        if not cached.fresh and not cached.revalidatable:
+            await self.delete(f"{kind}:{url}")
+            return None
+        return cached
+
+    async def put_response(
+        self,
+        kind: str,
+        url: str,
+        body: str,
+        headers: Optional[Mapping[str, str]] = None
+    ) -> Optional[CachedResponse]:
+        """Store a body with its validators, unless the server forbids it or it could never be reused"""
+        headers = headers or {}
+        if "no-store" in _cache_control(headers):
+            return None
+        now = time.time()
+        cached = CachedResponse(
+            url=url,
+            body=body,
+            content_hash=content_hash(body),
+            stored_at=now,
+            expires_at=now,
+            etag=headers.get("etag"),
+            last_modified=headers.get("last-modified"),
+        )
+        cached.expires_at = now + self._lifetime(kind, headers, cached.revalidatable)
+        if not cached.fresh and not cached.revalidatable:
+            return None
+        await self.put(f"{kind}:{url}", asdict(cached))
+        return cached
+
+    async def revalidated(
+        self,
+        kind: str,
+        cached: CachedResponse,
+        headers: Optional[Mapping[str, str]] = None
+    ) -> None:
+        """Record a 304: the stored body is fresh for as long as the 304's headers allow"""
+        self._counters["revalidated"] += 1
+        cached.expires_at = time.time() + self._lifetime(kind, headers or {}, cached.revalidatable)
+        await self.put(f"{kind}:{cached.url}", asdict(cached))
+
+    def _lifetime(self, kind: str, headers: Mapping[str, str], revalidatable: bool) -> float:
+        """Seconds a response stays fresh, from its headers and capped by the TTL"""
+        if kind == "js":
+            return self.render_ttl
+        directives = _cache_control(headers)
+        if "no-cache" in directives:
+            return 0
+        for name in ("s-maxage", "max-age"):
+            if name in directives:
+                try:
+                    return max(0, min(int(directives[name]), self.ttl))
+                except ValueError:
+                    return 0  # Invalid freshness information means stale
+        if "expires" in headers:
+            try:
+                expires = parsedate_to_datetime(headers["expires"]).timestamp()
+                date = parsedate_to_datetime(headers["date"]).timestamp() if "date" in headers else time.time()
+            except (TypeError, ValueError):
+                return 0  # E.g. "Expires: 0", already expired
+            return max(0, min(expires - date, self.ttl))
+        # Without freshness information, validators are used every time
+        return 0 if revalidatable else self.ttl
+
+    # Parsed documents
+
+    async def get_analysis(self, url: str, engine: str, body_hash: str) -> Optional[dict]:
+        return await self.get(f"analysis:v{ANALYSIS_VERSION}:{engine}:{url}:{body_hash}")
+
+    async def put_analysis(self, url: str, engine: str, body_hash: str, analysis: dict) -> None:
+        await self.put(f"analysis:v{ANALYSIS_VERSION}:{engine}:{url}:{body_hash}", analysis)
+
+    # Storage
+
+    async def get(self, key: str) -> Optional[dict]:
+        if not self.enabled:
+            return None
+        item = self._memory.get(key)
+        if item is not None:
+            self._memory.move_to_end(key)
+            self._counters["hits"] += 1
+            return item[0]
+
+        value = await asyncio.to_thread(self._disk_read, key) if self.disk_dir else None
+        if value is None:
+            self._counters["misses"] += 1
+            return None
+        self._counters["hits"] += 1
+        self._remember(key, value)
+        return value
+
+    async def put(self, key: str, value: dict) -> None:
+        if not self.enabled:
+            return
+        self._counters["stores"] += 1
+        self._remember(key, value)
+        if self.disk_dir:
+            await asyncio.to_thread(self._disk_write, key, value)
+
+    async def delete(self, key: str) -> None:
+        item = self._memory.pop(key, None)
+        if item is not None:
+            self._memory_bytes -= item[1]
+        if self.disk_dir:
+            await asyncio.to_thread(self._disk_remove, self._file_name(key))
+
+    def stats(self) -> dict:
+        """Cache utilization snapshot for monitoring"""
+        return {
+            "enabled": self.enabled,
+            "memoryEntries": len(self._memory),
+            "memoryBytes": self._memory_bytes,
+            "diskEntries": len(self._disk_index or ()),
+            "diskBytes": self._disk_bytes,
+            **self._counters,
+        }
+
+    def _remember(self, key: str, value: dict) -> None:
+        """Insert into the memory LRU, evicting the oldest entries past the byte budget"""
+        size = _approximate_size(value)
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= old[1]
+        if size > self.memory_max_bytes:
+            return
+        self._memory[key] = (value, size)
+        self._memory_bytes += size
+        while self._memory_bytes > self.memory_max_bytes:
+            _, (_, evicted_size) = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted_size
+            self._counters["evictions"] += 1
+
+    # Disk store (runs in worker threads)
+
+    def _file_name(self, key: str) -> str:
+        return hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json"
+
+    def _load_disk_index(self) -> "OrderedDict[str, int]":
+        if self._disk_index is None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            files = sorted(self.disk_dir.glob("*.json"), key=lambda path: path.stat().st_mtime)
+            self._disk_index = OrderedDict((path.name, path.stat().st_size) for path in files)
+            self._disk_bytes = sum(self._disk_index.values())
+        return self._disk_index
+
+    def _disk_read(self, key: str) -> Optional[dict]:
+        with self._disk_lock:
+            return self._disk_read_locked(key)
+
+    def _disk_read_locked(self, key: str) -> Optional[dict]:
+        index = self._load_disk_index()
+        name = self._file_name(key)
+        if name not in index:
+            return None
+        try:
+            with open(self.disk_dir / name, encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.debug(f"[CACHE] Dropping unreadable entry {name}: {e}")
+            self._disk_remove(name)
+            return None
+        if stored.get("key") != key:
+            return None  # Hash collision
+        index.move_to_end(name)
+        return stored["value"]
+
+    def _disk_write(self, key: str, value: dict) -> None:
+        with self._disk_lock:
+            self._disk_write_locked(key, value)
+
+    def _disk_write_locked(self, key: str, value: dict) -> None:
+        index = self._load_disk_index()
+        name = self._file_name(key)
+        data = json.dumps({"key": key, "value": value})
+        path = self.disk_dir / name
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"[CACHE] Could not write {path}: {e}")
+            return
+
+        self._disk_bytes += len(data) - index.pop(name, 0)
+        index[name] = len(data)
+        while self._disk_bytes > self.disk_max_bytes and len(index) > 1:
+            oldest = next(iter(index))
+            self._disk_remove(oldest)
+            self._counters["evictions"] += 1
+
+    def _disk_remove(self, name: str) -> None:
+        with self._disk_lock:
+            index = self._load_disk_index()
+            self._disk_bytes -= index.pop(name, 0)
+            try:
+                (self.disk_dir / name).unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.debug(f"[CACHE] Could not remove {name}: {e}")
+
+
+def _approximate_size(value: dict) -> int:
+    """Rough in-memory size of an entry, dominated by its strings"""
+    size = 0
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            size += len(item)
+        elif isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+        else:
+            size += 8
+    return size
+
+
+def _cache_control(headers: Mapping[str, str]) -> dict:
+    """Cache-Control directives, lowercased, e.g. {"max-age": "60", "no-cache": ""}"""
+    directives = {}
+    for part in headers.get("cache-control", "").lower().split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name] = value.strip().strip('"')
+    return directives
+
+
+# Shared cache, used by StaticScraper, JSScraper and WebScraper
+fetch_cache = FetchCache()
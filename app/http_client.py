@@ -0,0 +1,194 @@
+import asyncio
+import importlib.util
+import logging
+import os
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "6"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+# HTTP/2 needs the optional "h2" package (pip install httpx[http2])
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "true").lower() == "true"
+HTTP_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+    " (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+
+# httpcore trace events (without ".started"/".complete") timed into FetchTimings fields
+TRACE_FIELDS = {
+    "connection.connect_tcp": "connectMs",
+    "connection.start_tls": "tlsMs",
+    "http11.receive_response_headers": "ttfbMs",
+    "http2.receive_response_headers": "ttfbMs",
+    "http11.receive_response_body": "downloadMs",
+    "http2.receive_response_body": "downloadMs",
+}
+
+
+def http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def timing_trace(timings) -> Callable[[str, dict], Awaitable[None]]:
+    """
+    httpcore trace callback (extensions={"trace": ...}) adding the time
+    of each traced step to the matching field of a FetchTimings; steps
+    repeated across redirects are summed
+    """
+    started: Dict[str, float] = {}
+
+    async def trace(event_name: str, info: dict) -> None:
+        name, _, state = event_name.rpartition(".")
+        field = TRACE_FIELDS.get(name)
+        if field is None:
+            return
+        if state == "started":
+            started[name] = time.perf_counter()
+        elif name in started:
+            ms = (time.perf_counter() - started.pop(name)) * 1000
+            setattr(timings, field, round((getattr(timings, field) or 0.0) + ms, 1))
+
+    return trace
+
+
+class HttpClientPool:
+    """
+    Process-wide httpx client with connection reuse
+
+    One AsyncClient is created for the life of the app so that DNS, TCP
+    and TLS setup are paid once per connection rather than per request.
+    Requests to the same host share at most max_per_host connections.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = HTTP_MAX_CONNECTIONS,
+        max_per_host: int = HTTP_MAX_CONNECTIONS_PER_HOST,
+        max_keepalive: int = HTTP_MAX_KEEPALIVE,
+        keepalive_expiry: float = HTTP_KEEPALIVE_EXPIRY,
+        http2: bool = HTTP2_ENABLED,
+    ):
+        self.max_connections = max(1, max_connections)
+        self.max_per_host = max(1, max_per_host)
+        self.max_keepalive = max_keepalive
+        self.keepalive_expiry = keepalive_expiry
+        self.http2 = http2 and http2_available()
+        if http2 and not self.http2:
+            logger.info("[HTTP] h2 package not installed, using HTTP/1.1 only")
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        self._host_active: Dict[str, int] = defaultdict(int)
+        self._host_waiting: Dict[str, int] = defaultdict(int)
+        self._requests = 0
+
+    @property
+    def started(self) -> bool:
+        return self._client is not None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The shared client, created on first use if start() was not called"""
+        if self._client is None:
+            self._client = self._create_client()
+        return self._client
+
+    async def start(self) -> None:
+        """Create the shared client"""
+        if self._client is None:
+            self._client = self._create_client()
+        logger.info(
+            f"[HTTP] Client pool started (http2={self.http2}, "
+            f"max {self.max_connections} connections, {self.max_per_host} per host)"
+        )
+
+    async def stop(self) -> None:
+        """Close the client and every pooled connection"""
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
+        logger.info("[HTTP] Client pool stopped")
+
+    @asynccontextmanager
+    async def host_slot(self, url: str) -> AsyncIterator[httpx.AsyncClient]:
+        """Wait for a free connection slot for the URL's host"""
+        host = urlsplit(url).netloc.lower()
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots[host] = asyncio.Semaphore(self.max_per_host)
+
+        self._host_waiting[host] += 1
+        try:
+            await slot.acquire()
+        finally:
+            self._host_waiting[host] -= 1
+        self._host_active[host] += 1
+        self._requests += 1
+        try:
+            yield self.client
+        finally:
+            self._host_active[host] -= 1
+            slot.release()
+            if not self._host_active[host] and not self._host_waiting[host]:
+                # Forget idle hosts so the tables stay bounded
+                self._host_slots.pop(host, None)
+                self._host_active.pop(host, None)
+                self._host_waiting.pop(host, None)
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        """GET within the host's connection limit"""
+        async with self.host_slot(url) as client:
+            return await client.get(url, **kwargs)
+
+    @asynccontextmanager
+    async def stream(self, url: str, **kwargs) -> AsyncIterator[httpx.Response]:
+        """Streaming GET within the host's connection limit; the body is read by the caller"""
+        async with self.host_slot(url) as client:
+            async with client.stream("GET", url, **kwargs) as response:
+                yield response
+
+    def stats(self) -> dict:
+        """Connection pool snapshot for monitoring"""
+        connections = self._connections()
+        return {
+            "http2": self.http2,
+            "maxConnections": self.max_connections,
+            "maxConnectionsPerHost": self.max_per_host,
+            "requests": self._requests,
+            "connections": len(connections),
+            "idleConnections": sum(1 for c in connections if c.is_idle()),
+            "http2Connections": sum(1 for c in connections if "HTTP/2" in c.info()),
+            "activeByHost": {host: n for host, n in self._host_active.items() if n},
+            "waitingByHost": {host: n for host, n in self._host_waiting.items() if n},
+        }
+
+    def _create_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            http2=self.http2,
+            follow_redirects=True,
+            headers={"User-Agent": HTTP_USER_AGENT},
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+        )
+
+    def _connections(self) -> list:
+        # httpx does not expose its pool; read it from the default transport
+        pool = getattr(getattr(self._client, "_transport", None), "_pool", None)
+        return list(getattr(pool, "connections", []))
+
+
+# Shared client, started and stopped by the FastAPI lifespan
+http_client = HttpClientPool()
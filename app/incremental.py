@@ -0,0 +1,157 @@
+import logging
+import os
+from typing import Callable, Optional
+
+from lxml import etree
+
+from app import lxml_parser
+from app.models import Metadata
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+INCREMENTAL_PARSE_ENABLED = os.getenv("INCREMENTAL_PARSE_ENABLED", "true").lower() == "true"
+
+_SKIPPED_TEXT_TAGS = {"script", "style"} | lxml_parser.HIDDEN_TEXT_TAGS
+
+
+class IncrementalAnalysis:
+    """
+    Quality signals and head metadata of a page while it downloads
+
+    Decoded chunks of the static body are fed to lxml's pull parser as
+    they arrive. The running quality score counts text the way
+    ParsedDocument.quality_score does (scripts and styles excluded) and
+    only grows, so once it reaches the threshold
+    the static HTML is known to be sufficient and feeding stops. Once the
+    whole body was fed, quality_score is the score of the page and the
+    JS fallback can be decided before the full parse. on_sufficient is
+    called once the threshold is reached, while the body may still be
+    downloading.
+
+    The page's metadata is read from the tree as soon as </head> was
+    parsed, and on_metadata is called. It only differs from the full
+    parse's when the body carries the title or meta tags.
+
+    Elements are discarded as soon as they were counted, so only the
+    open ancestors of the current element are kept in memory.
+    """
+
+    def __init__(
+        self,
+        threshold: int,
+        on_sufficient: Optional[Callable[[], None]] = None,
+        on_metadata: Optional[Callable[[], None]] = None
+    ):
+        self.threshold = threshold
+        self.on_sufficient = on_sufficient
+        self.on_metadata = on_metadata
+        self.text_length = 0
+        self.has_main = False
+        self.has_heading = False
+        self.metadata: Optional[Metadata] = None  # Set once </head> was parsed
+        self.complete = False  # The whole body was fed
+        self.sufficient_at: Optional[int] = None  # Characters fed when the threshold was reached
+        self.fed = 0
+        self._parser = etree.HTMLPullParser(events=("start", "end"))
+        self._root: Optional[etree._Element] = None
+        self._skip_depth = 0  # Open script and style elements
+        self._failed = False
+
+    @property
+    def quality_score(self) -> int:
+        """Score of the HTML fed so far; the page's score once complete"""
+        score = self.text_length
+        if self.has_main:
+            score += 300
+        if self.has_heading:
+            score += 200
+        return score
+
+    @property
+    def sufficient(self) -> bool:
+        return self.sufficient_at is not None
+
+    @property
+    def done(self) -> bool:
+        """Nothing more to learn: the threshold was reached, the body ended or parsing failed"""
+        return self.sufficient or self.complete or self._failed
+
+    def feed(self, text: str) -> None:
+        if self.done or not text:
+            return
+        self.fed += len(text)
+        try:
+            self._parser.feed(text)
+            self._handle_events()
+        except etree.LxmlError as e:
+            self._fail(e)
+            return
+        if self.quality_score >= self.threshold:
+            self.sufficient_at = self.fed
+            self._discard()
+            if self.on_sufficient is not None:
+                self.on_sufficient()
+
+    def close(self) -> None:
+        """The body has ended"""
+        if self.done:
+            return
+        try:
+            self._parser.close()
+            self._handle_events()
+        except etree.LxmlError as e:
+            self._fail(e)
+            return
+        if self.quality_score >= self.threshold:
+            self.sufficient_at = self.fed
+        self.complete = True
+        self._root = None
+
+    def _handle_events(self) -> None:
+        for event, element in self._parser.read_events():
+            if event == "start":
+                self._start(element)
+            else:
+                self._end(element)
+
+    def _start(self, element: etree._Element) -> None:
+        if self._root is None:
+            self._root = element.getroottree().getroot()
+        if self._skip_depth or element.tag in _SKIPPED_TEXT_TAGS:
+            self._skip_depth += 1
+            return
+        if element.tag in ("main", "article"):
+            self.has_main = True
+        elif element.tag in ("h1", "h2", "h3"):
+            self.has_heading = True
+
+    def _end(self, element: etree._Element) -> None:
+        if element.tag == "head" and self.metadata is None:
+            self.metadata = lxml_parser.extract_metadata(self._root)
+            if self.on_metadata is not None:
+                self.on_metadata()
+        if self._skip_depth:
+            # Text inside scripts and styles does not count
+            self._skip_depth -= 1
+        else:
+            # The element's text and its children's tails are final now
+            if element.text:
+                self.text_length += len(element.text.strip())
+            for child in element:
+                if child.tail:
+                    self.text_length += len(child.tail.strip())
+        del element[:]
+
+    def _fail(self, error: Exception) -> None:
+        # The full parse still runs; this page just gets no early decision
+        logger.warning(f"[STATIC] Incremental parse failed: {error}")
+        self._failed = True
+        self._root = None
+
+    def _discard(self) -> None:
+        try:
+            self._parser.close()
+        except etree.LxmlError:
+            pass
+        self._root = None
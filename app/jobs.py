@@ -0,0 +1,288 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.limiter import ScrapeLimiter, scrape_limiter
+from app.models import Job, ScraperError, ScraperResult, StrategyMode
+from app.singleflight import coalesced_scrape
+from app.utils import normalize_url
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+JOBS_DB_PATH = os.getenv("JOBS_DB_PATH", ".cache/jobs.sqlite3")
+JOBS_WORKERS = int(os.getenv("JOBS_WORKERS", "4"))
+JOBS_TIMEOUT = int(os.getenv("JOBS_TIMEOUT", "120"))  # Seconds per job
+JOBS_RETENTION = int(os.getenv("JOBS_RETENTION", str(24 * 3600)))  # Seconds finished jobs are kept
+JOBS_POLL_INTERVAL = 5.0  # Seconds; workers are also woken on submit
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    strategy TEXT NOT NULL,
+    dedup_key TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at);
+CREATE INDEX IF NOT EXISTS jobs_dedup ON jobs (dedup_key, status);
+"""
+
+
+class JobQueue:
+    """
+    Durable queue of scrape jobs run by background workers
+
+    Jobs are stored in SQLite, so queued jobs survive restarts; jobs that
+    were running when the app stopped are queued again on startup.
+    Submitting a URL that already has a queued or running job with the
+    same options returns that job instead of creating another one.
+    """
+
+    def __init__(
+        self,
+        db_path: str = JOBS_DB_PATH,
+        workers: int = JOBS_WORKERS,
+        timeout: int = JOBS_TIMEOUT,
+        retention: int = JOBS_RETENTION,
+        limiter: Optional[ScrapeLimiter] = None,
+    ):
+        self.db_path = db_path
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.retention = retention
+        self.limiter = limiter or scrape_limiter
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._submit_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._workers: List[asyncio.Task] = []
+        self._running: Dict[str, asyncio.Task] = {}
+
+    async def start(self) -> None:
+        """Open the database, requeue interrupted jobs and start the workers"""
+        await asyncio.to_thread(self._open)
+        requeued = await self._execute(
+            "UPDATE jobs SET status = 'queued', started_at = NULL WHERE status = 'running'"
+        )
+        await self._prune()
+        self._workers = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        logger.info(f"[JOBS] Job queue started with {self.workers} workers ({requeued} jobs requeued)")
+
+    async def stop(self) -> None:
+        """Stop the workers; interrupted jobs are requeued on next start"""
+        workers, self._workers = self._workers, []
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        if self._db is not None:
+            with self._db_lock:
+                self._db.close()
+            self._db = None
+        logger.info("[JOBS] Job queue stopped")
+
+    async def submit(self, url: str, strategy: StrategyMode = "auto") -> Job:
+        """Queue a scrape, or return the identical job already in flight"""
+        dedup_key = f"{strategy} {normalize_url(url)}"
+        async with self._submit_lock:
+            row = await self._fetchone(
+                "SELECT * FROM jobs WHERE dedup_key = ? AND status IN ('queued', 'running') "
+                "ORDER BY created_at LIMIT 1",
+                (dedup_key,)
+            )
+            if row is not None:
+                logger.info(f"[JOBS] {url} already in flight as job {row['id']}")
+                return _to_job(row)
+
+            job_id = uuid.uuid4().hex
+            await self._execute(
+                "INSERT INTO jobs (id, url, strategy, dedup_key, status, created_at) "
+                "VALUES (?, ?, ?, ?, 'queued', ?)",
+                (job_id, url, strategy, dedup_key, time.time())
+            )
+        self._wakeup.set()
+        return await self.get(job_id)
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        row = await self._fetchone("SELECT * FROM jobs WHERE id = ?", (job_id,))
+        return _to_job(row) if row is not None else None
+
+    async def cancel(self, job_id: str) -> Optional[Job]:
+        """Cancel a queued or running job; finished jobs are left as they are"""
+        await self._execute(
+            "UPDATE jobs SET status = 'cancelled', finished_at = ? "
+            "WHERE id = ? AND status IN ('queued', 'running')",
+            (time.time(), job_id)
+        )
+        task = self._running.get(job_id)
+        if task is not None:
+            task.cancel()
+        return await self.get(job_id)
+
+    async def stats(self) -> dict:
+        rows = await self._fetchall("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status")
+        return {
+            "workers": len(self._workers),
+            "running": len(self._running),
+            "byStatus": {row["status"]: row["n"] for row in rows},
+        }
+
+    async def _worker(self, number: int) -> None:
+        while True:
+            try:
+                await self._work_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # A database error must not kill the worker for good
+                logger.exception(f"[JOBS] Worker {number} failed, retrying")
+                await asyncio.sleep(JOBS_POLL_INTERVAL)
+
+    async def _work_once(self) -> None:
+        """Run the next queued job, or wait for one to be submitted"""
+        job = await self._claim_next()
+        if job is None:
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=JOBS_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                await self._prune()
+            return
+
+        task = asyncio.create_task(self._run(job))
+        self._running[job.id] = task
+        try:
+            await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done():
+                # The worker itself is stopping: abandon the job, it is
+                # requeued on next start
+                task.cancel()
+                raise
+        finally:
+            self._running.pop(job.id, None)
+
+    async def _run(self, job: Job) -> None:
+        logger.info(f"[JOBS] Running job {job.id} for {job.url}")
+        try:
+            result = await asyncio.wait_for(
+                coalesced_scrape(job.url, strategy=job.strategy, limiter=self.limiter),
+                timeout=self.timeout
+            )
+            await self._finish(job.id, "done", result=result)
+        except asyncio.TimeoutError:
+            error = ScraperError(message=f"Job timed out after {self.timeout} seconds", phase="timeout")
+            await self._finish(job.id, "failed", error=error)
+        except asyncio.CancelledError:
+            # Cancelled through cancel(), which already updated the row
+            logger.info(f"[JOBS] Job {job.id} cancelled")
+        except Exception as e:
+            logger.error(f"[JOBS] Job {job.id} failed: {e}")
+            await self._finish(job.id, "failed", error=ScraperError(message=str(e), phase="unknown"))
+
+    async def _claim_next(self) -> Optional[Job]:
+        """Mark the oldest queued job as running and return it"""
+        def claim() -> Optional[sqlite3.Row]:
+            with self._db_lock, self._db:
+                row = self._db.execute(
+                    "SELECT * FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+                ).fetchone()
+                if row is None:
+                    return None
+                self._db.execute(
+                    "UPDATE jobs SET status = 'running', started_at = ? WHERE id = ?",
+                    (time.time(), row["id"])
+                )
+                return self._db.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+
+        row = await asyncio.to_thread(claim)
+        return _to_job(row) if row is not None else None
+
+    async def _finish(
+        self,
+        job_id: str,
+        status: str,
+        result: Optional[ScraperResult] = None,
+        error: Optional[ScraperError] = None
+    ) -> None:
+        await self._execute(
+            "UPDATE jobs SET status = ?, finished_at = ?, result = ?, error = ? "
+            "WHERE id = ? AND status = 'running'",
+            (
+                status,
+                time.time(),
+                result.model_dump_json() if result else None,
+                error.model_dump_json() if error else None,
+                job_id,
+            )
+        )
+
+    async def _prune(self) -> None:
+        """Delete finished jobs older than the retention period"""
+        await self._execute(
+            "DELETE FROM jobs WHERE status NOT IN ('queued', 'running') AND finished_at < ?",
+            (time.time() - self.retention,)
+        )
+
+    # SQLite access (runs in worker threads)
+
+    def _open(self) -> None:
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(self.db_path, check_same_thread=False)
+        db.row_factory = sqlite3.Row
+        db.execute("PRAGMA journal_mode=WAL")
+        db.executescript(_SCHEMA)
+        self._db = db
+
+    async def _execute(self, sql: str, params: tuple = ()) -> int:
+        def execute() -> int:
+            with self._db_lock, self._db:
+                return self._db.execute(sql, params).rowcount
+        return await asyncio.to_thread(execute)
+
+    async def _fetchone(self, sql: str, params: tuple = ()) -> Optional[sqlite3.Row]:
+        def fetchone() -> Optional[sqlite3.Row]:
+            with self._db_lock:
+                return self._db.execute(sql, params).fetchone()
+        return await asyncio.to_thread(fetchone)
+
+    async def _fetchall(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        def fetchall() -> List[sqlite3.Row]:
+            with self._db_lock:
+                return self._db.execute(sql, params).fetchall()
+        return await asyncio.to_thread(fetchall)
+
+
+def _to_job(row: sqlite3.Row) -> Job:
+    return Job(
+        id=row["id"],
+        url=row["url"],
+        strategy=row["strategy"],
+        status=row["status"],
+        createdAt=_iso(row["created_at"]),
+        startedAt=_iso(row["started_at"]),
+        finishedAt=_iso(row["finished_at"]),
+        result=ScraperResult.model_validate_json(row["result"]) if row["result"] else None,
+        error=ScraperError.model_validate_json(row["error"]) if row["error"] else None,
+    )
+
+
+def _iso(timestamp: Optional[float]) -> Optional[str]:
+    if timestamp is None:
+        return None
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(timestamp)) + "Z"
+
+
+# Shared queue, started and stopped by the FastAPI lifespan
+job_queue = JobQueue()
@@ -1,202 +1,307 @@
-
 import asyncio
 import logging
-from typing import Optional, List
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Optional, List
+from urllib.parse import urljoin
+from playwright.async_api import Page, TimeoutError as PlaywrightTimeout
 
-from app.models import Interactions
+from app.browser_pool import BrowserPool, browser_pool
+from app.fetch_cache import FetchCache, fetch_cache
+from app.metrics import fetched_bytes_total
+from app.models import Interactions, RenderTimings, StepTiming
+from app.page_settle import SETTLE_MAX_MS, PageSettler
+from app.resource_policy import RenderRequestStats, ResourcePolicy, resource_policy
 
 logger = logging.getLogger(__name__)
 
+# Interaction selectors
+TAB_SELECTORS = [
+    "[role='tab']",
+    ".tab-button",
+    ".nav-tab",
+    "button[aria-selected='false']"
+]
+LOAD_MORE_SELECTORS = [
+    "button:has-text('Load More')",
+    "button:has-text('Show More')",
+    "button:has-text('View More')",
+    "a:has-text('Load More')",
+    "[data-action='load-more']"
+]
+PAGINATION_SELECTORS = [
+    "a[rel='next']",
+    ".pagination a.next",
+    "a:has-text('Next')",
+    "a[aria-label='Next page']"
+]
+
+
+@dataclass
+class PageSnapshot:
+    """DOM captured after a render or interaction step"""
+    url: str  # Page URL at the time of the snapshot
+    html: str
+    step: str  # "render", "click:<selector>", "page:<url>", "scroll:<n>"
+
+
+@dataclass
+class RenderSession:
+    """
+    State of a single JS session for one URL
+
+    Filled in progressively so that snapshots taken before a timeout
+    are still available to the caller.
+    """
+    url: str
+    snapshots: List[PageSnapshot] = field(default_factory=list)
+    interactions: Optional[Interactions] = None
+    interacted: bool = False  # Whether the interaction steps ran
+    requests: Optional[RenderRequestStats] = None  # Requests made and blocked, if intercepted
+    interaction_seconds: float = 0.0  # Time spent in the interaction steps
+    timings: RenderTimings = field(default_factory=RenderTimings)
+
+    def __post_init__(self):
+        if self.interactions is None:
+            self.interactions = Interactions(pages=[self.url])
+
+    @property
+    def html(self) -> Optional[str]:
+        """HTML of the initial render"""
+        return self.snapshots[0].html if self.snapshots else None
+
+    @property
+    def interaction_snapshots(self) -> List[PageSnapshot]:
+        """Snapshots taken after interaction steps"""
+        return self.snapshots[1:]
+
 
 class JSScraper:
     """Render and extract content from JS-heavy pages"""
-    
-    def __init__(self, timeout: int = 15):
+
+    def __init__(
+        self,
+        timeout: int = 15,
+        pool: Optional[BrowserPool] = None,
+        cache: Optional[FetchCache] = None,
+        policy: Optional[ResourcePolicy] = None,
+        follow_pagination: bool = True
+    ):
         self.timeout = timeout
-    
+        self.pool = pool or browser_pool
+        self.cache = cache or fetch_cache
+        self.policy = policy or resource_policy
+        # Off when pages are crawled separately (see app.pagination)
+        self.follow_pagination = follow_pagination
+
     async def render(self, url: str) -> Optional[str]:
         """Render page with Playwright and return HTML"""
+        session = RenderSession(url=url)
+        await self.run_session(session, interact=False)
+        return session.html
+
+    async def run_session(
+        self,
+        session: RenderSession,
+        interact: bool = True,
+        interact_if: Optional[Callable[[str], Awaitable[bool]]] = None
+    ) -> RenderSession:
+        """
+        Render the page once and, optionally, run interaction steps on it
+        A DOM snapshot is appended to the session after every step
+
+        interact_if lets the caller decide from the rendered HTML whether
+        interactions are worth running when interact is False.
+        
+        Render-only sessions are served from the fetch cache while the
+        last render of the URL is fresh, and are rendered in lightweight
+        mode (stylesheets blocked too) since nothing is clicked.
+        """
+        url = session.url
+        render_only = not interact and interact_if is None
+        if render_only:
+            cached = await self.cache.get_response("js", url)
+            if cached and cached.fresh:
+                logger.info(f"[CACHE] Fresh render of {url}")
+                session.timings.cached = True
+                session.snapshots.append(PageSnapshot(url=url, html=cached.body, step="render"))
+                return session
+        
+        timings = session.timings
+        started = time.perf_counter()
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(
-                    headless=True,
-                    args=["--disable-blink-features=AutomationControlled"]
-                )
-                
-                context = await browser.new_context(
-                    user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-                    viewport={"width": 1280, "height": 720}
-                )
-                
+            async with self.pool.context() as context:
                 page = await context.new_page()
-                
+                timings.browserMs = _ms_since(started)
+                session.requests = await self.policy.attach(page, light=render_only)
+                settler = PageSettler(page)
+
                 try:
-                    # Navigate with timeout
-                    await page.goto(url, wait_until="domcontentloaded", timeout=15000)
-                    
-                    # Wait for content
-                    try:
-                        await page.wait_for_load_state("networkidle", timeout=10000)
-                    except PlaywrightTimeout:
-                        # Fallback: wait for selector
+                    await self._navigate(page, settler, url, timings)
+                    started = time.perf_counter()
+                    await self._snapshot(page, session, "render")
+                    timings.contentMs = _ms_since(started)
+                    fetched_bytes_total.inc(len(session.html.encode("utf-8", "surrogatepass")), source="js")
+                    if session.requests is not None:
+                        logger.info(
+                            f"[JS] Rendered {url}: blocked {session.requests.blocked} of "
+                            f"{session.requests.requests} requests {dict(session.requests.blocked_by_reason)}"
+                        )
+                    await self.cache.put_response("js", url, session.html)
+
+                    if interact or (interact_if is not None and await interact_if(session.html)):
+                        session.interacted = True
+                        interactions_started = time.perf_counter()
                         try:
-                            await page.wait_for_selector("body", timeout=5000)
-                        except PlaywrightTimeout:
-                            # Last resort: fixed sleep
-                            await page.wait_for_timeout(2000)
-                    
-                    # Get rendered HTML
-                    content = await page.content()
-                    return content
-                
+                            await self._run_interactions(page, settler, session)
+                        finally:
+                            session.interaction_seconds = time.perf_counter() - interactions_started
+                    return session
+
                 finally:
-                    await context.close()
-                    await browser.close()
-        
+                    await page.close()
+
         except PlaywrightTimeout:
+            if session.html is not None:
+                # Render succeeded; only an interaction step timed out
+                logger.warning(f"Playwright timeout during interactions on {url}")
+                return session
             logger.error(f"Playwright timeout rendering {url}")
             raise TimeoutError(f"JS rendering timed out for {url}")
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
+            if session.html is not None:
+                logger.warning(f"Interaction handling failed: {e}")
+                return session
             logger.error(f"Error rendering {url}: {e}")
             raise
-    
-    async def handle_interactions(self, url: str) -> Optional[Interactions]:
+
+    async def _navigate(
+        self,
+        page: Page,
+        settler: PageSettler,
+        url: str,
+        timings: Optional[RenderTimings] = None
+    ) -> None:
+        """Navigate and wait for the page to settle"""
+        started = time.perf_counter()
+        await page.goto(url, wait_until="domcontentloaded", timeout=15000)
+        navigated = time.perf_counter()
+        await settler.wait(SETTLE_MAX_MS)
+        if timings is not None:
+            timings.navigationMs = _ms_since(started, navigated)
+            timings.settleMs = _ms_since(navigated)
+
+    async def _snapshot(self, page: Page, session: RenderSession, step: str) -> None:
+        """Capture the current DOM, skipping it if nothing changed"""
+        html = await page.content()
+        if session.snapshots and session.snapshots[-1].html == html:
+            return
+        # Attribute content to the last page navigated to (input URL or pagination link)
+        current_url = session.interactions.pages[-1]
+        session.snapshots.append(PageSnapshot(url=current_url, html=html, step=step))
+
+    async def _run_interactions(self, page: Page, settler: PageSettler, session: RenderSession) -> None:
         """
         Handle user interactions: tabs, load more, pagination, infinite scroll
-        Returns interactions object with clicks, scrolls, and visited pages
+        Records clicks, scrolls and visited pages on the session, and the
+        duration of each step; every step waits for the page to settle
+        rather than a fixed delay
         """
-        try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                context = await browser.new_context(
-                    user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-                    viewport={"width": 1280, "height": 720}
-                )
-                page = await context.new_page()
-                
+        interactions = session.interactions
+
+        def step_done(step: str, started: float) -> None:
+            session.timings.steps.append(StepTiming(step=step, ms=_ms_since(started)))
+
+        # 1. Click tabs
+        for selector in TAB_SELECTORS:
+            elements = await page.query_selector_all(selector)
+            for i, element in enumerate(elements[:5]):  # Max 5 tabs
                 try:
-                    visited_pages = [url]
-                    clicks_performed = []
-                    scroll_count = 0
-                    
-                    # Navigate to URL
-                    await page.goto(url, wait_until="networkidle", timeout=15000)
-                    await page.wait_for_timeout(1000)
-                    
-                    # 1. Click tabs
-                    tab_selectors = [
-                        "[role='tab']",
-                        ".tab-button",
-                        ".nav-tab",
-                        "button[aria-selected='false']"
-                    ]
-                    
-                    for selector in tab_selectors:
-                        elements = await page.query_selector_all(selector)
-                        for i, element in enumerate(elements[:5]):  # Max 5 tabs
-                            try:
-                                is_visible = await element.is_visible()
-                                if is_visible:
-                                    await element.click()
-                                    clicks_performed.append(f"{selector}[{i}]")
-                                    await page.wait_for_timeout(1500)
-                            except Exception as e:
-                                logger.debug(f"Tab click failed: {e}")
-                    
-                    # 2. Click "Load More" buttons
-                    load_more_selectors = [
-                        "button:has-text('Load More')",
-                        "button:has-text('Show More')",
-                        "button:has-text('View More')",
-                        "a:has-text('Load More')",
-                        "[data-action='load-more']"
-                    ]
-                    
-                    for i in range(3):  # Max 3 load more clicks
-                        clicked = False
-                        for selector in load_more_selectors:
-                            try:
-                                elements = await page.query_selector_all(selector)
-                                if elements:
-                                    await elements[0].click()
-                                    clicks_performed.append(selector)
-                                    await page.wait_for_timeout(1500)
-                                    clicked = True
-                                    break
-                            except Exception:
-                                pass
-                        if not clicked:
-                            break
-                    
-                    # 3. Handle pagination
-                    pagination_selectors = [
-                        "a[rel='next']",
-                        ".pagination a.next",
-                        "a:has-text('Next')",
-                        "a[aria-label='Next page']"
-                    ]
-                    
-                    for i in range(3):  # Max 3 pages
-                        found_next = False
-                        for selector in pagination_selectors:
-                            try:
-                                next_link = await page.query_selector(selector)
-                                if next_link:
-                                    next_url = await next_link.get_attribute("href")
-                                    if next_url:
-                                        if not next_url.startswith("http"):
-                                            from urllib.parse import urljoin
-                                            next_url = urljoin(url, next_url)
-                                        
-                                        if next_url not in visited_pages and next_url.startswith(("http://", "https://")):
-                                            await page.goto(next_url, wait_until="networkidle", timeout=10000)
-                                            visited_pages.append(next_url)
-                                            found_next = True
-                                            await page.wait_for_timeout(500)
-                                            break
-                            except Exception:
-                                pass
-                        if not found_next:
-                            break
-                    
-                    # 4. Infinite scroll
-                    for i in range(3):  # Max 3 scrolls
-                        try:
-                            # Get current height
-                            prev_height = await page.evaluate("document.body.scrollHeight")
-                            
-                            # Scroll down
-                            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                            
-                            # Wait for new content
-                            try:
-                                await page.wait_for_load_state("networkidle", timeout=5000)
-                            except:
-                                await page.wait_for_timeout(2000)
-                            
-                            # Check new height
-                            new_height = await page.evaluate("document.body.scrollHeight")
-                            
-                            if new_height > prev_height:
-                                scroll_count += 1
-                            else:
-                                break  # No new content
-                        except Exception as e:
-                            logger.debug(f"Scroll failed: {e}")
-                            break
-                    
-                    # Return interactions
-                    return Interactions(
-                        pages=visited_pages,
-                        clicks=clicks_performed,
-                        scrolls=scroll_count
-                    )
-                
-                finally:
-                    await context.close()
-                    await browser.close()
-        
-        except Exception as e:
-            logger.warning(f"Interaction handling failed: {e}")
-            return Interactions(pages=[url])
\ No newline at end of file
+                    is_visible = await element.is_visible()
+                    if is_visible:
+                        started = time.perf_counter()
+                        await element.click()
+                        interactions.clicks.append(f"{selector}[{i}]")
+                        await settler.wait()
+                        await self._snapshot(page, session, f"click:{selector}[{i}]")
+                        step_done(f"click:{selector}[{i}]", started)
+                except Exception as e:
+                    logger.debug(f"Tab click failed: {e}")
+
+        # 2. Click "Load More" buttons
+        for i in range(3):  # Max 3 load more clicks
+            clicked = False
+            for selector in LOAD_MORE_SELECTORS:
+                try:
+                    elements = await page.query_selector_all(selector)
+                    if elements:
+                        started = time.perf_counter()
+                        await elements[0].click()
+                        interactions.clicks.append(selector)
+                        await settler.wait()
+                        await self._snapshot(page, session, f"click:{selector}")
+                        step_done(f"click:{selector}", started)
+                        clicked = True
+                        break
+                except Exception:
+                    pass
+            if not clicked:
+                break
+
+        # 3. Handle pagination
+        for i in range(3 if self.follow_pagination else 0):  # Max 3 pages
+            found_next = False
+            for selector in PAGINATION_SELECTORS:
+                try:
+                    next_link = await page.query_selector(selector)
+                    if next_link:
+                        next_url = await next_link.get_attribute("href")
+                        if next_url:
+                            if not next_url.startswith("http"):
+                                next_url = urljoin(interactions.pages[-1], next_url)
+
+                            if next_url not in interactions.pages and next_url.startswith(("http://", "https://")):
+                                started = time.perf_counter()
+                                await self._navigate(page, settler, next_url)
+                                interactions.pages.append(next_url)
+                                await self._snapshot(page, session, f"page:{next_url}")
+                                step_done(f"page:{next_url}", started)
+                                found_next = True
+                                break
+                except Exception:
+                    pass
+            if not found_next:
+                break
+
+        # 4. Infinite scroll
+        for i in range(3):  # Max 3 scrolls
+            try:
+                started = time.perf_counter()
+                # Get current height
+                prev_height = await page.evaluate("document.body.scrollHeight")
+
+                # Scroll down
+                await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+
+                # Wait for new content
+                await settler.wait()
+
+                # Check new height
+                new_height = await page.evaluate("document.body.scrollHeight")
+
+                if new_height > prev_height:
+                    interactions.scrolls += 1
+                    await self._snapshot(page, session, f"scroll:{interactions.scrolls}")
+                    step_done(f"scroll:{interactions.scrolls}", started)
+                else:
+                    step_done("scroll:none", started)
+                    break  # No new content
+            except Exception as e:
+                logger.debug(f"Scroll failed: {e}")
+                break
+
+
+def _ms_since(started: float, until: Optional[float] = None) -> float:
+    return round(((until or time.perf_counter()) - started) * 1000, 1)
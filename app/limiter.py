@@ -0,0 +1,130 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+from urllib.parse import urlsplit
+
+from app.browser_pool import BROWSER_MAX_CONTEXTS
+
+# Configuration
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "16"))
+BATCH_PER_DOMAIN_CONCURRENCY = int(os.getenv("BATCH_PER_DOMAIN_CONCURRENCY", "4"))
+BATCH_STATIC_WORKERS = int(os.getenv("BATCH_STATIC_WORKERS", "12"))
+BATCH_BROWSER_WORKERS = int(os.getenv("BATCH_BROWSER_WORKERS", str(BROWSER_MAX_CONTEXTS)))
+CRAWL_RATE_PER_DOMAIN = float(os.getenv("CRAWL_RATE_PER_DOMAIN", "4"))  # Requests per second, 0 = unlimited
+
+
+class ScrapeLimiter:
+    """
+    Concurrency limits shared by every scrape it is given to
+
+    Each network phase takes, in order, a slot for its domain, a slot in
+    its own pool (static fetches or browser renders) and a global slot.
+    A page waiting for a browser therefore holds neither a static nor a
+    global slot, so slow JS pages cannot starve cheap static ones.
+
+    An auto scrape that hedges its static fetch with a render still holds
+    the fetch's slots while the render runs, so the render needs a second
+    domain and global slot. Hedges are therefore only started when
+    has_capacity finds a browser slot free, and never queue behind (or
+    take capacity from) other scrapes.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = BATCH_MAX_CONCURRENCY,
+        per_domain: int = BATCH_PER_DOMAIN_CONCURRENCY,
+        static_workers: int = BATCH_STATIC_WORKERS,
+        browser_workers: int = BATCH_BROWSER_WORKERS,
+    ):
+        self.per_domain = max(1, per_domain)
+        self._global = asyncio.Semaphore(max(1, max_concurrency))
+        self._pools = {
+            "static": asyncio.Semaphore(max(1, static_workers)),
+            "browser": asyncio.Semaphore(max(1, browser_workers)),
+        }
+        self._domains: Dict[str, asyncio.Semaphore] = {}
+        self._domain_users: Dict[str, int] = {}
+        self._active = {"static": 0, "browser": 0}
+
+    @asynccontextmanager
+    async def slot(self, pool: str, url: str) -> AsyncIterator[None]:
+        """Hold a slot in the "static" or "browser" pool for one URL"""
+        domain = urlsplit(url).netloc.lower()
+        domain_slot = self._domains.get(domain)
+        if domain_slot is None:
+            domain_slot = self._domains[domain] = asyncio.Semaphore(self.per_domain)
+            self._domain_users[domain] = 0
+        self._domain_users[domain] += 1
+        try:
+            async with domain_slot, self._pools[pool], self._global:
+                self._active[pool] += 1
+                try:
+                    yield
+                finally:
+                    self._active[pool] -= 1
+        finally:
+            self._domain_users[domain] -= 1
+            if not self._domain_users[domain]:
+                # Forget idle domains so the table stays bounded
+                del self._domains[domain], self._domain_users[domain]
+
+    def has_capacity(self, pool: str, url: str) -> bool:
+        """Whether a slot in the pool for the URL could be taken right now"""
+        domain_slot = self._domains.get(urlsplit(url).netloc.lower())
+        if domain_slot is not None and domain_slot.locked():
+            return False
+        return not self._pools[pool].locked() and not self._global.locked()
+
+    def stats(self) -> dict:
+        return {
+            "activeStatic": self._active["static"],
+            "activeBrowser": self._active["browser"],
+            "domains": len(self._domains),
+        }
+
+
+class DomainRateLimiter:
+    """
+    Spaces out requests to the same domain
+
+    Each caller is given the next free start time for its domain, so at
+    most `rate` requests per second start against any one domain however
+    many crawls are running. A caller may ask for a longer gap for its
+    request, e.g. a robots.txt Crawl-delay.
+    """
+
+    def __init__(self, rate: float = CRAWL_RATE_PER_DOMAIN):
+        self.interval = 1 / rate if rate > 0 else 0.0
+        self._next_start: Dict[str, float] = {}
+        self._delayed = 0
+
+    async def wait(self, url: str, min_interval: Optional[float] = None) -> None:
+        """Sleep until the URL's domain may be requested again"""
+        interval = max(self.interval, min_interval or 0.0)
+        if not interval:
+            return
+        domain = urlsplit(url).netloc.lower()
+        now = asyncio.get_running_loop().time()
+        start = max(now, self._next_start.get(domain, now))
+        self._next_start[domain] = start + interval
+        if len(self._next_start) > 1024:
+            # Forget domains whose slot has passed so the table stays bounded
+            self._next_start = {d: t for d, t in self._next_start.items() if t > now}
+        if start > now:
+            self._delayed += 1
+            await asyncio.sleep(start - now)
+
+    def stats(self) -> dict:
+        return {
+            "ratePerDomain": 1 / self.interval if self.interval else 0,
+            "domains": len(self._next_start),
+            "delayed": self._delayed,
+        }
+
+
+# Shared by every batch request so they draw on the same workers
+scrape_limiter = ScrapeLimiter()
+
+# Shared by every crawl (pagination, ...) so politeness holds across requests
+crawl_rate_limiter = DomainRateLimiter()
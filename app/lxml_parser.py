@@ -0,0 +1,472 @@
+import logging
+from html import escape
+from typing import Iterator, List, Optional, Set
+from urllib.parse import urljoin
+
+import lxml.html
+from lxml import etree
+from lxml.cssselect import CSSSelector
+
+from app.models import Section, ContentData, ContentLink, ContentImage, Metadata
+from app.section_parser import (
+    MAX_RAW_HTML_LENGTH, NOISE_SELECTORS, LANDMARK_TAGS, HEADING_TAGS, SECTION_HEADING_TAGS,
+    NodeIndex, _generate_label_from_text, _finalize_sections
+)
+
+logger = logging.getLogger(__name__)
+
+# Noise elements are replaced by this comment rather than dropped, so that the
+# text around them stays split into separate strings exactly as BeautifulSoup
+# leaves it after decompose()
+NOISE_PLACEHOLDER = "lyftr:noise"
+NOISE_PLACEHOLDER_HTML = f"<!--{NOISE_PLACEHOLDER}-->"
+
+# Elements whose strings BeautifulSoup does not return from get_text()
+HIDDEN_TEXT_TAGS = {"template", "rt", "rp"}
+
+_NOISE_SELECTOR = CSSSelector(", ".join(NOISE_SELECTORS), translator="html")
+
+
+def parse_html(html: str) -> etree._Element:
+    """Parse an HTML string into an lxml tree"""
+    if not html.strip():
+        return lxml.html.document_fromstring("<html></html>")
+    try:
+        return lxml.html.document_fromstring(html)
+    except ValueError:
+        # Unicode strings with an XML encoding declaration are rejected
+        parser = lxml.html.HTMLParser(encoding="utf-8")
+        return lxml.html.document_fromstring(html.encode("utf-8", "replace"), parser=parser)
+
+
+def strip_noise(root: etree._Element) -> None:
+    """Replace noise elements, scripts and styles with placeholder comments"""
+    _replace_with_placeholders(_NOISE_SELECTOR(root) + list(root.iter("script", "style")))
+
+
+def strip_scripts(root: etree._Element) -> None:
+    """Replace scripts and styles only (the page as scored for quality)"""
+    _replace_with_placeholders(list(root.iter("script", "style")))
+
+
+def _replace_with_placeholders(elements: List[etree._Element]) -> None:
+    for element in elements:
+        parent = element.getparent()
+        if parent is None:
+            continue
+        placeholder = etree.Comment(NOISE_PLACEHOLDER)
+        placeholder.tail = element.tail
+        parent.replace(element, placeholder)
+
+
+def parse_sections_from_html(html: str, base_url: str) -> List[Section]:
+    """Parse HTML into semantic sections using the lxml engine"""
+    return list(iter_sections_from_html(html, base_url))
+
+
+def iter_sections_from_html(html: str, base_url: str) -> Iterator[Section]:
+    """Generator version of parse_sections_from_html"""
+    root = parse_html(html)
+    strip_noise(root)
+    return iter_sections_from_tree(root, base_url)
+
+
+def parse_sections_from_tree(root: etree._Element, base_url: str) -> List[Section]:
+    """Extract sections from a tree already cleaned by strip_noise"""
+    return _LxmlSectionParser(root, base_url).parse()
+
+
+def iter_sections_from_tree(root: etree._Element, base_url: str) -> Iterator[Section]:
+    """Generator version of parse_sections_from_tree"""
+    return _LxmlSectionParser(root, base_url).iter_sections()
+
+
+def quality_score(root: etree._Element) -> int:
+    """Content quality score, see ParsedDocument.quality_score"""
+    score = len(_join_text(_iter_strings(root, set())))
+    if _first(root.iter("main", "article")) is not None:
+        score += 300
+    if _first(root.iter("h1", "h2", "h3")) is not None:
+        score += 200
+    return score
+
+
+def extract_metadata(root: etree._Element) -> Metadata:
+    """Extract page metadata, see ParsedDocument.metadata"""
+    # Title
+    title = ""
+    title_tag = _first(root.iter("title"))
+    if title_tag is not None:
+        title = _join_text(_iter_strings(title_tag, set()))
+    if not title:
+        og_title = _first(m for m in root.iter("meta") if m.get("property") == "og:title")
+        if og_title is not None:
+            title = og_title.get("content", "")
+
+    # Description
+    description = ""
+    desc_tag = _first(m for m in root.iter("meta") if m.get("name") == "description")
+    if desc_tag is not None:
+        description = desc_tag.get("content", "")
+    if not description:
+        og_desc = _first(m for m in root.iter("meta") if m.get("property") == "og:description")
+        if og_desc is not None:
+            description = og_desc.get("content", "")
+
+    # Language
+    language = "en"
+    html_tag = _first(root.iter("html"))
+    if html_tag is not None:
+        language = html_tag.get("lang", "en").split("-")[0]
+
+    # Canonical
+    canonical = None
+    canonical_tag = _first(
+        link for link in root.iter("link")
+        if "canonical" in (link.get("rel") or "").split()
+    )
+    if canonical_tag is not None:
+        canonical = canonical_tag.get("href")
+
+    return Metadata(
+        title=title,
+        description=description,
+        language=language,
+        canonical=canonical
+    )
+
+
+def select_one(root: etree._Element, selector: str) -> Optional[etree._Element]:
+    """First element matching a CSS selector"""
+    return _first(CSSSelector(selector, translator="html")(root))
+
+
+def select(root: etree._Element, selector: str) -> List[etree._Element]:
+    """Every element matching a CSS selector, in document order"""
+    return CSSSelector(selector, translator="html")(root)
+
+
+def element_text(element: etree._Element, separator: str = "") -> str:
+    """Stripped text of an element, like BeautifulSoup get_text(separator, strip=True)"""
+    return separator.join(_iter_strings(element, set()))
+
+
+class _LxmlSectionParser:
+    """
+    Section extraction over an lxml tree
+
+    Mirrors the BeautifulSoup engine in section_parser. Heading sections
+    claim their heading and sibling elements; claimed elements are treated
+    as detached from the document for the block stage, without moving them.
+    """
+
+    def __init__(self, root: etree._Element, base_url: str):
+        self.root = root
+        self.base_url = base_url
+        self.claimed: Set[etree._Element] = set()
+        self.claimed_ancestors: Set[etree._Element] = set()
+        self.hidden: Set[etree._Element] = set()
+        for element in root.iter(*HIDDEN_TEXT_TAGS):
+            self.hidden.update(element.iterdescendants())
+        self.index = self._build_index()
+
+    def parse(self) -> List[Section]:
+        return list(self.iter_sections())
+
+    def iter_sections(self) -> Iterator[Section]:
+        """Sections in document order, deduplicated and typed as they are found"""
+        return _finalize_sections(self._iter_candidates())
+
+    def _iter_candidates(self) -> Iterator[Section]:
+        """Sections from the three stages, before deduplication"""
+        section_id = 0
+        # Serialized elements already turned into sections; BeautifulSoup
+        # compares tags structurally, so identical markup is only used once
+        processed_elements = set()
+
+        # Stage 1: Extract landmark-based sections
+        for landmark in LANDMARK_TAGS:
+            for element in self.root.iter(landmark):
+                if not self.index.text_len(element):
+                    continue  # Would produce an empty section
+                raw_html = self._serialize(element)
+                if raw_html not in processed_elements:
+                    section = self._extract_section([element], f"{landmark}-{section_id}", raw_html)
+                    if section and section.content.text.strip():
+                        yield section
+                        section_id += 1
+                        processed_elements.add(raw_html)
+
+        # Stage 2: Extract heading-based sections
+        for heading in list(self.root.iter(*SECTION_HEADING_TAGS)):
+            key = self._serialize(heading)
+            if key not in processed_elements:
+                section = self._extract_heading_section(heading, f"section-{section_id}")
+                if section and section.content.text.strip():
+                    yield section
+                    section_id += 1
+                    processed_elements.add(key)
+
+        # Stage 3: Extract remaining significant blocks
+        for div in list(self._iter_attached(self.root, "div")):
+            if div.get("class") is None:
+                continue
+            # Check if div looks like a section (has significant content)
+            if self.index.text_len(div) > 200:  # Significant content
+                raw_html = self._serialize(div)
+                if raw_html in processed_elements:
+                    continue
+                section = self._extract_section([div], f"block-{section_id}", raw_html)
+                if section and section.content.text.strip():
+                    yield section
+                    section_id += 1
+                    processed_elements.add(raw_html)
+
+    def _extract_heading_section(self, heading: etree._Element, section_id: str) -> Optional[Section]:
+        """Extract a section from a heading and its following siblings"""
+        content_elements = []
+        items = [heading]
+
+        # Collect sibling content until next heading; text between
+        # siblings lives in the tails
+        if heading.tail and heading.tail.strip():
+            content_elements.append(heading.tail)
+        if len(content_elements) <= 20:
+            for current in heading.itersiblings():
+                if _is_element(current):
+                    # Stop at next heading
+                    if current.tag in HEADING_TAGS:
+                        break
+                    content_elements.append(current)
+                    items.append(current)
+                elif current.tag is etree.Comment and current.text == NOISE_PLACEHOLDER:
+                    pass
+                elif current.text and current.text.strip():
+                    # Comments count as content like BeautifulSoup strings
+                    content_elements.append(current)
+
+                if len(content_elements) > 20:  # Limit elements per section
+                    break
+
+                if current.tail and current.tail.strip():
+                    content_elements.append(current.tail)
+                    if len(content_elements) > 20:
+                        break
+
+        section = None
+        if sum(self.index.text_len(item) for item in items):
+            raw_html = "<div>" + "".join(self._serialize(item) for item in items) + "</div>"
+            section = self._extract_section(items, section_id, raw_html, container=True)
+
+        for item in items:
+            self._claim(item)
+
+        return section
+
+    def _extract_section(
+        self,
+        roots: List[etree._Element],
+        section_id: str,
+        raw_html: str,
+        container: bool = False
+    ) -> Optional[Section]:
+        """
+        Extract a section from an element, or from the children of a
+        virtual container (heading sections)
+        """
+        found = {tag: [] for tag in ("h", "a", "img", "list", "table")}
+        for root in roots:
+            elements = self._iter_attached(root, include_self=container)
+            for element in elements:
+                tag = element.tag
+                if tag in HEADING_TAGS:
+                    found["h"].append(element)
+                elif tag == "a":
+                    found["a"].append(element)
+                elif tag == "img":
+                    found["img"].append(element)
+                elif tag in ("ul", "ol"):
+                    found["list"].append(element)
+                elif tag == "table":
+                    found["table"].append(element)
+
+        # Extract heading
+        heading_elem = found["h"][0] if found["h"] else None
+        heading_text = self._text(heading_elem) if heading_elem is not None else ""
+
+        # Extract all text
+        text = "".join(self._text(root) for root in roots)
+        if len(text) > 10000:
+            text = text[:10000]  # Truncate very long text
+
+        # Extract headings
+        headings = []
+        for h in found["h"]:
+            h_text = self._text(h)
+            if h_text:
+                headings.append(h_text)
+
+        # Extract links
+        links = []
+        for a in found["a"]:
+            href = a.get("href", "")
+            if href:
+                # Make absolute URL
+                href = urljoin(self.base_url, href)
+                if href.startswith(("http://", "https://")):
+                    link_text = self._text(a) or href
+                    links.append(ContentLink(text=link_text, href=href))
+
+        # Extract images
+        images = []
+        for img in found["img"]:
+            src = img.get("src", "")
+            if src:
+                src = urljoin(self.base_url, src)
+                alt = img.get("alt", "")
+                images.append(ContentImage(src=src, alt=alt))
+
+        # Extract lists
+        lists = []
+        for ul_ol in found["list"]:
+            items = []
+            for li in ul_ol:
+                if _is_element(li) and li.tag == "li" and li not in self.claimed:
+                    item_text = self._text(li)
+                    if item_text:
+                        items.append(item_text)
+            if items:
+                lists.append(items)
+
+        # Extract tables
+        tables = []
+        for table in found["table"]:
+            rows = []
+            for tr in self._iter_attached(table, "tr"):
+                row = [self._text(td) for td in self._iter_attached(tr, "td", "th")]
+                if row:
+                    rows.append(row)
+            if rows:
+                tables.append(rows)
+
+        # Generate label
+        label = heading_text or _generate_label_from_text(text)
+        if not label:
+            label = "Div" if container else roots[0].tag.title()
+
+        return Section(
+            id=section_id,
+            type="unknown",  # Will be assigned later
+            label=label,
+            sourceUrl=self.base_url,
+            content=ContentData(
+                headings=headings,
+                text=text,
+                links=links,
+                images=images,
+                lists=lists,
+                tables=tables
+            ),
+            rawHtml=raw_html[:MAX_RAW_HTML_LENGTH],
+            truncated=len(raw_html) > MAX_RAW_HTML_LENGTH
+        )
+
+    def _build_index(self) -> NodeIndex:
+        """Text length, link and image counts of every element, bottom-up"""
+        index = NodeIndex()
+        # Reverse document order visits children before their parents
+        for element in reversed(list(self.root.iter(etree.Element))):
+            hidden = element in self.hidden or element.tag in HIDDEN_TEXT_TAGS
+            text_len = links = images = 0
+            if element.text and not hidden:
+                text_len += len(element.text.strip())
+            for child in element:
+                if _is_element(child):
+                    child_text_len, child_links, child_images = index._stats[child]
+                    text_len += child_text_len
+                    links += child_links
+                    images += child_images
+                if child.tail and not hidden:
+                    text_len += len(child.tail.strip())
+            if element.tag == "a" and element.get("href"):
+                links += 1
+            elif element.tag == "img":
+                images += 1
+            index.set(element, text_len, links, images)
+        return index
+
+    def _claim(self, element: etree._Element) -> None:
+        """Treat an element as moved out of the document"""
+        if element in self.claimed:
+            return
+        self.index.detach(element, element.iterancestors(), lambda ancestor: ancestor in self.claimed)
+        self.claimed.add(element)
+        self.claimed_ancestors.update(element.iterancestors())
+
+    def _iter_attached(self, element: etree._Element, *tags: str, include_self: bool = False) -> Iterator[etree._Element]:
+        """Descendants in document order, skipping claimed subtrees"""
+        if include_self and (not tags or element.tag in tags):
+            yield element
+        if element not in self.claimed_ancestors:
+            # Fast path: nothing below has been claimed
+            for child in element.iterdescendants(*tags):
+                if _is_element(child):
+                    yield child
+            return
+        for child in element:
+            if not _is_element(child) or child in self.claimed:
+                continue
+            yield from self._iter_attached(child, *tags, include_self=True)
+
+    def _text(self, element: etree._Element) -> str:
+        if element in self.hidden or element.tag in HIDDEN_TEXT_TAGS:
+            return ""
+        return _join_text(_iter_strings(element, self.claimed))
+
+    def _serialize(self, element: etree._Element) -> str:
+        """Element HTML without the noise placeholders and claimed elements"""
+        if element not in self.claimed_ancestors:
+            html = etree.tostring(element, method="html", encoding="unicode", with_tail=False)
+            return html.replace(NOISE_PLACEHOLDER_HTML, "")
+
+        shell = etree.tostring(
+            etree.Element(element.tag, attrib=dict(element.attrib)),
+            method="html", encoding="unicode"
+        )
+        close_at = shell.rfind("</")
+        parts = [shell[:close_at], escape(element.text or "", quote=False)]
+        for child in element:
+            if _is_element(child) and child not in self.claimed:
+                parts.append(self._serialize(child))
+            elif not _is_element(child) and child.text != NOISE_PLACEHOLDER:
+                parts.append(etree.tostring(child, method="html", encoding="unicode", with_tail=False))
+            parts.append(escape(child.tail or "", quote=False))
+        parts.append(shell[close_at:])
+        return "".join(parts)
+
+
+def _iter_strings(element: etree._Element, skip: Set[etree._Element]) -> Iterator[str]:
+    """Non-empty stripped strings of a subtree in document order"""
+    if element.text:
+        stripped = element.text.strip()
+        if stripped:
+            yield stripped
+    for child in element:
+        if _is_element(child) and child not in skip and child.tag not in HIDDEN_TEXT_TAGS:
+            yield from _iter_strings(child, skip)
+        if child.tail:
+            stripped = child.tail.strip()
+            if stripped:
+                yield stripped
+
+
+def _join_text(strings: Iterator[str]) -> str:
+    return "".join(strings)
+
+
+def _is_element(node) -> bool:
+    return isinstance(node.tag, str)
+
+
+def _first(iterable):
+    return next(iter(iterable), None)
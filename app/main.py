@@ -1,30 +1,70 @@
 
 import asyncio
+import logging
 import os
 import json
+from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, HttpUrl, field_validator
+from pydantic import BaseModel, Field, HttpUrl, field_validator
 
-from app.scraper import WebScraper
-from app.models import ScraperResult
+from app.models import ScraperResult, StrategyMode
+from app.browser_pool import browser_pool
+from app.http_client import http_client
+from app.fetch_cache import fetch_cache
+from app.batch import BATCH_MAX_URLS, run_batch
+from app.streaming import StreamFormat, stream_batch, stream_crawl, stream_scrape, streaming_response
+from app.crawler import CRAWL_MAX_DEPTH, CRAWL_MAX_PAGES, SiteCrawler
+from app.limiter import crawl_rate_limiter, scrape_limiter
+from app.jobs import job_queue
+from app.singleflight import coalesced_scrape, scrape_flights
+from app.resource_policy import resource_policy
+from app.parse_pool import parse_pool
+from app.domain_profiles import domain_profiles
+from app.metrics import registry as metrics_registry
+
+logger = logging.getLogger(__name__)
 
 # Configuration
 APP_VERSION = "1.0.0"
 SCRAPE_TIMEOUT = int(os.getenv("SCRAPE_TIMEOUT", "60"))
 FRONTEND_DIST = Path(__file__).parent.parent / "frontend" / "dist"
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start shared resources on startup and release them on shutdown"""
+    await http_client.start()
+    await parse_pool.start()
+    await job_queue.start()
+    await domain_profiles.start()
+    try:
+        await browser_pool.start()
+    except Exception as e:
+        # Browsers are launched lazily on first render if startup fails
+        logger.warning(f"Browser pool failed to start: {e}")
+    try:
+        yield
+    finally:
+        await job_queue.stop()
+        await domain_profiles.stop()
+        await browser_pool.stop()
+        await parse_pool.stop()
+        await http_client.stop()
+
+
 # FastAPI app
 app = FastAPI(
     title="Lyftr AI Web Scraper",
     description="Universal website scraper with JS rendering and JSON viewer",
-    version=APP_VERSION
+    version=APP_VERSION,
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -36,9 +76,57 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Pool utilization, read whenever /metrics is scraped
+metrics_registry.gauge("scraper_browser_pool_browsers", "Launched browsers", lambda: browser_pool.stats()["browsers"])
+metrics_registry.gauge("scraper_browser_pool_contexts_max", "Browser contexts allowed at once", lambda: browser_pool.stats()["maxContexts"])
+metrics_registry.gauge("scraper_browser_pool_contexts_active", "Browser contexts leased", lambda: browser_pool.stats()["activeContexts"])
+metrics_registry.gauge("scraper_browser_pool_pages_served", "Pages served by the current browsers", lambda: browser_pool.stats()["pagesServed"])
+metrics_registry.gauge("scraper_browser_pool_launches", "Browsers launched since startup", lambda: browser_pool.stats()["launches"])
+metrics_registry.gauge("scraper_http_connections", "Pooled HTTP connections", lambda: http_client.stats()["connections"])
+metrics_registry.gauge("scraper_parse_pool_queue_depth", "Documents waiting for a parse worker", lambda: parse_pool.stats()["queueDepth"])
+metrics_registry.gauge("scraper_parse_pool_active", "Documents being parsed in workers", lambda: parse_pool.stats()["active"])
+metrics_registry.gauge("scraper_single_flight_in_flight", "Distinct scrapes in flight", lambda: scrape_flights.stats()["inFlight"])
+
 # Request model
 class ScrapeRequest(BaseModel):
     url: str
+    strategy: StrategyMode = "auto"
+    stream: Optional[StreamFormat] = None  # "ndjson" or "sse": emit sections as they are parsed
+    timings: bool = False  # Include a per-stage timing breakdown in the result
+    
+    @field_validator("url")
+    @classmethod
+    def validate_url(cls, v: str) -> str:
+        if not v.startswith(("http://", "https://")):
+            raise ValueError("URL must start with http:// or https://")
+        return v
+
+
+class BatchScrapeRequest(BaseModel):
+    # Invalid URLs are reported per item rather than rejecting the batch
+    urls: List[str] = Field(min_length=1, max_length=BATCH_MAX_URLS)
+    strategy: StrategyMode = "auto"
+    stream: Optional[StreamFormat] = None  # "ndjson" or "sse": emit each item as it completes
+
+
+class CrawlRequest(BaseModel):
+    url: str
+    maxDepth: int = Field(default=2, ge=0, le=CRAWL_MAX_DEPTH)  # Links followed from the start URL
+    maxPages: int = Field(default=50, ge=1, le=CRAWL_MAX_PAGES)
+    strategy: StrategyMode = "auto"
+    stream: Optional[StreamFormat] = None  # "ndjson" or "sse": emit each page as it is scraped
+    
+    @field_validator("url")
+    @classmethod
+    def validate_url(cls, v: str) -> str:
+        if not v.startswith(("http://", "https://")):
+            raise ValueError("URL must start with http:// or https://")
+        return v
+
+
+class JobRequest(BaseModel):
+    url: str
+    strategy: StrategyMode = "auto"
     
     @field_validator("url")
     @classmethod
@@ -58,16 +146,47 @@ async def health_check():
     }
 
 
+@app.get("/stats")
+async def stats():
+    """Resource utilization snapshot for monitoring"""
+    return {
+        "browserPool": browser_pool.stats(),
+        "httpPool": http_client.stats(),
+        "fetchCache": fetch_cache.stats(),
+        "batchLimiter": scrape_limiter.stats(),
+        "crawlRateLimiter": crawl_rate_limiter.stats(),
+        "jobs": await job_queue.stats(),
+        "singleFlight": scrape_flights.stats(),
+        "resourceBlocking": resource_policy.stats(),
+        "parsePool": parse_pool.stats(),
+        "domainProfiles": domain_profiles.stats()
+    }
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics: phase latency histograms, scrape counters and pool gauges"""
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.post("/scrape")
 async def scrape(request: ScrapeRequest):
     """
     Scrape a URL and return structured content
     
     Returns JSON matching the Lyftr AI schema with sections, metadata, and interactions
+    With "stream", returns NDJSON or server-sent events instead: "meta",
+    one "section" per section, then "done" with the rest of the result
     """
+    if request.stream:
+        return streaming_response(
+            stream_scrape(request.url, request.strategy, request.stream, timings=request.timings),
+            request.stream
+        )
+    
     try:
-        scraper = WebScraper(timeout=SCRAPE_TIMEOUT)
-        result = await scraper.scrape(request.url)
+        # Identical concurrent requests share one scrape
+        result = await coalesced_scrape(request.url, strategy=request.strategy, timings=request.timings)
         
         return JSONResponse(
             content={"result": result.model_dump()},
@@ -105,6 +224,84 @@ async def scrape(request: ScrapeRequest):
         )
 
 
+@app.post("/scrape/batch")
+async def scrape_batch(request: BatchScrapeRequest):
+    """
+    Scrape many URLs with shared concurrency limits
+    
+    Returns one item per input URL, in input order, each with either a
+    result or the error that prevented scraping it. With "stream", each
+    item is emitted (with its input index) as soon as it completes
+    """
+    if request.stream:
+        return streaming_response(
+            stream_batch(request.urls, request.strategy, request.stream, scrape_limiter),
+            request.stream
+        )
+    
+    items = await run_batch(request.urls, strategy=request.strategy, limiter=scrape_limiter)
+    return JSONResponse(
+        content={"results": [item.model_dump() for item in items]},
+        status_code=200
+    )
+
+
+@app.post("/crawl")
+async def crawl(request: CrawlRequest):
+    """
+    Crawl a site from a start URL, following same-domain links
+    
+    Every page goes through the /scrape pipeline, within maxDepth links
+    of the start URL and up to maxPages pages, honouring robots.txt.
+    Returns one item per page (with its depth) in crawl order; with
+    "stream", each item is emitted as soon as its page is scraped
+    """
+    crawler = SiteCrawler(
+        request.url,
+        max_depth=request.maxDepth,
+        max_pages=request.maxPages,
+        strategy=request.strategy,
+        limiter=scrape_limiter
+    )
+    if request.stream:
+        return streaming_response(stream_crawl(crawler, request.stream), request.stream)
+    
+    items = [item async for item in crawler.crawl()]
+    return JSONResponse(
+        content={"results": [item.model_dump() for item in items]},
+        status_code=200
+    )
+
+
+@app.post("/jobs", status_code=202)
+async def create_job(request: JobRequest):
+    """
+    Queue a scrape to run in the background and return its job
+    A URL already queued or running with the same strategy returns the
+    existing job
+    """
+    job = await job_queue.submit(request.url, strategy=request.strategy)
+    return {"job": job.model_dump()}
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Job status, with the ScraperResult once it is done"""
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"job": job.model_dump()}
+
+
+@app.post("/jobs/{job_id}/cancel")
+async def cancel_job(job_id: str):
+    """Cancel a queued or running job"""
+    job = await job_queue.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"job": job.model_dump()}
+
+
 # Serve frontend
 @app.get("/")
 async def serve_index():
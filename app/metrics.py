@@ -0,0 +1,207 @@
+import bisect
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Phase durations span fast cached fetches to full interaction sessions
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+
+
+def _format_labels(names: Sequence[str], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """Monotonic count, optionally split by labels"""
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(tuple(str(labels[name]) for name in self.labels), 0)
+
+    def samples(self) -> Iterator[str]:
+        for key, value in sorted(self._values.items()):
+            yield f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+
+
+class Histogram:
+    """Distribution of observed values in cumulative buckets, like prometheus_client"""
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], List[float]] = {}  # Bucket counts + [sum, count]
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            series[index] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def samples(self) -> Iterator[str]:
+        for key, series in sorted(self._series.items()):
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labels, key, le)} {_format_value(cumulative)}"
+            le = 'le="+Inf"'
+            yield f"{self.name}_bucket{_format_labels(self.labels, key, le)} {_format_value(series[-1])}"
+            yield f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(series[-2])}"
+            yield f"{self.name}_count{_format_labels(self.labels, key)} {_format_value(series[-1])}"
+
+
+class Gauge:
+    """Current value read from a callback at scrape time, e.g. pool utilization"""
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, read: Callable[[], Optional[float]]):
+        self.name = name
+        self.help = help
+        self.read = read
+
+    def samples(self) -> Iterator[str]:
+        value = self.read()
+        if value is not None:
+            yield f"{self.name} {_format_value(value)}"
+
+
+class MetricsRegistry:
+    """Metrics exposed on /metrics in the Prometheus text format"""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labels))
+
+    def histogram(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, labels, buckets))
+
+    def gauge(self, name: str, help: str, read: Callable[[], Optional[float]]) -> Gauge:
+        return self._register(Gauge(name, help, read))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+
+registry = MetricsRegistry()
+
+# Scrape pipeline metrics, recorded by WebScraper, StaticScraper and JSScraper
+phase_seconds = registry.histogram(
+    "scraper_phase_duration_seconds",
+    "Time spent in each scrape phase",
+    labels=("phase",)
+)
+scrapes_total = registry.counter(
+    "scraper_scrapes_total",
+    "Completed scrapes by requested strategy and the path the parsed HTML came from",
+    labels=("strategy", "path")
+)
+js_fallbacks_total = registry.counter(
+    "scraper_js_fallback_total",
+    "Scrapes whose static HTML was fetched but replaced by a JS render"
+)
+speculative_renders_total = registry.counter(
+    "scraper_speculative_renders_total",
+    "JS renders started before the static HTML was judged (hedged or after the incremental parse), by whether they were used",
+    labels=("outcome",)
+)
+timeouts_total = registry.counter(
+    "scraper_timeouts_total",
+    "Timeouts by phase",
+    labels=("phase",)
+)
+errors_total = registry.counter(
+    "scraper_errors_total",
+    "Errors reported in results, by ScraperError.phase",
+    labels=("phase",)
+)
+fetched_bytes_total = registry.counter(
+    "scraper_fetched_bytes_total",
+    "Bytes of HTML fetched over the network (static) or rendered (js)",
+    labels=("source",)
+)
+sections_total = registry.counter(
+    "scraper_sections_total",
+    "Sections produced"
+)
+
+
+class PhaseTimer:
+    """
+    Durations of one scrape's phases
+
+    A phase may be entered several times (parsing each snapshot); its
+    total is observed into phase_seconds once, when the scrape finishes.
+    """
+
+    def __init__(self):
+        self.durations: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float) -> None:
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    def timed(self, name: str, items: Iterator) -> Iterator:
+        """Iterate, counting only the time spent producing each item"""
+        iterator = iter(items)
+        while True:
+            with self.phase(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def finish(self) -> None:
+        for name, seconds in self.durations.items():
+            phase_seconds.observe(seconds, phase=name)
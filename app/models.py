@@ -1,5 +1,5 @@
 
-from typing import List, Optional, Literal, Any
+from typing import Dict, List, Optional, Literal, Any
 from datetime import datetime
 from pydantic import BaseModel, Field
 
@@ -52,12 +52,68 @@ class Interactions(BaseModel):
     pages: List[str] = Field(default_factory=list)  # URLs visited
 
 
+StrategyMode = Literal["static-only", "auto", "full"]
+
+
+class RenderRequests(BaseModel):
+    """Browser requests made and blocked during a JS render"""
+    requests: int = 0
+    blocked: int = 0
+    blockedByReason: Dict[str, int] = Field(default_factory=dict)  # Resource type or "domain"
+    bytesReceived: int = 0  # Content-Length of the responses that were let through
+
+
+class ScrapeStrategy(BaseModel):
+    """Which scraping path was taken"""
+    mode: StrategyMode = "auto"  # Requested strategy
+    path: Literal["static", "js"] = "static"  # Where the parsed HTML came from
+    interactions: bool = False  # Whether the interaction phase ran
+    signals: List[str] = Field(default_factory=list)  # Interaction signals found in the HTML
+    requests: Optional[RenderRequests] = None  # Set when a browser session ran
+    hedged: bool = False  # A render was started before the static fetch finished
+    routed: Optional[Literal["static", "js"]] = None  # Path chosen from the domain's profile
+    probe: bool = False  # Routing was skipped to keep the domain's profile current
+
+
 class ScraperError(BaseModel):
     """An error that occurred during scraping"""
     message: str
     phase: str  # "fetch", "render", "parse", "click", "scroll", etc.
 
 
+class FetchTimings(BaseModel):
+    """Where the static fetch spent its time, from httpcore trace events"""
+    cached: bool = False  # Served from the fetch cache without a request
+    connectMs: Optional[float] = None  # DNS resolution and TCP connect; None on a reused connection
+    tlsMs: Optional[float] = None
+    ttfbMs: Optional[float] = None  # Request sent until response headers received
+    downloadMs: Optional[float] = None  # Response body
+
+
+class StepTiming(BaseModel):
+    """One interaction step of a JS session"""
+    step: str  # "click:<selector>", "page:<url>" or "scroll:<n>"
+    ms: float
+
+
+class RenderTimings(BaseModel):
+    """Where the JS session spent its time"""
+    cached: bool = False  # Served from the fetch cache without a browser
+    browserMs: Optional[float] = None  # Leasing a browser context, including a launch if needed
+    navigationMs: Optional[float] = None  # page.goto until DOMContentLoaded
+    settleMs: Optional[float] = None  # Waiting for DOM and network to go quiet
+    contentMs: Optional[float] = None  # page.content() of the initial render
+    steps: List[StepTiming] = Field(default_factory=list)
+
+
+class Timings(BaseModel):
+    """Wall-time breakdown of a scrape, in milliseconds"""
+    totalMs: float
+    stages: Dict[str, float] = Field(default_factory=dict)  # static_fetch, parse, js_render, ...
+    fetch: Optional[FetchTimings] = None
+    render: Optional[RenderTimings] = None
+
+
 class ScraperResult(BaseModel):
     """Complete scraping result"""
     url: str  # Exact input URL
@@ -65,7 +121,9 @@ class ScraperResult(BaseModel):
     meta: Metadata
     sections: List[Section]
     interactions: Interactions
+    strategy: ScrapeStrategy = Field(default_factory=ScrapeStrategy)
     errors: List[ScraperError] = Field(default_factory=list)
+    timings: Optional[Timings] = None  # Only when requested
     
     class Config:
         json_schema_extra = {
@@ -101,6 +159,45 @@ class ScraperResult(BaseModel):
                     "scrolls": 0,
                     "pages": ["https://example.com"]
                 },
+                "strategy": {
+                    "mode": "auto",
+                    "path": "static",
+                    "interactions": False,
+                    "signals": []
+                },
                 "errors": []
             }
-        }
\ No newline at end of file
+        }
+
+class BatchItem(BaseModel):
+    """Outcome of one URL in a batch scrape"""
+    url: str
+    result: Optional[ScraperResult] = None
+    error: Optional[ScraperError] = None  # Set when the scrape itself failed
+
+
+class CrawlItem(BatchItem):
+    """Outcome of one page of a site crawl"""
+    depth: int  # Links followed from the start URL
+
+
+class ScrapeEvent(BaseModel):
+    """One record of a streamed scrape"""
+    event: Literal["meta", "section", "done", "item"]
+    data: Any  # Metadata, Section, ScraperResult (without sections), BatchItem or CrawlItem
+
+
+JobStatus = Literal["queued", "running", "done", "failed", "cancelled"]
+
+
+class Job(BaseModel):
+    """A scrape queued through POST /jobs"""
+    id: str
+    url: str
+    strategy: StrategyMode = "auto"
+    status: JobStatus = "queued"
+    createdAt: str  # ISO8601 datetime UTC
+    startedAt: Optional[str] = None
+    finishedAt: Optional[str] = None
+    result: Optional[ScraperResult] = None  # Set once status is "done"
+    error: Optional[ScraperError] = None  # Set when status is "failed"
@@ -0,0 +1,92 @@
+import asyncio
+import logging
+import os
+from typing import Set
+
+from playwright.async_api import Page, Request
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+SETTLE_QUIET_MS = int(os.getenv("SETTLE_QUIET_MS", "500"))  # DOM and network idle this long = settled
+SETTLE_MAX_MS = int(os.getenv("SETTLE_MAX_MS", "10000"))  # Cap after a navigation
+SETTLE_STEP_MAX_MS = int(os.getenv("SETTLE_STEP_MAX_MS", "4000"))  # Cap after a click or scroll
+SETTLE_POLL_MS = 100
+
+# Long-lived requests that never finish and would keep the page "busy"
+UNTRACKED_RESOURCE_TYPES = {"eventsource", "websocket"}
+
+# Installs a MutationObserver once per document and returns the
+# milliseconds since the DOM last changed
+_DOM_IDLE_SCRIPT = """
+() => {
+    const w = window;
+    if (!w.__settleObserver) {
+        w.__settleLastMutation = performance.now();
+        w.__settleObserver = new MutationObserver(() => {
+            w.__settleLastMutation = performance.now();
+        });
+        w.__settleObserver.observe(document, {
+            subtree: true, childList: true, attributes: true, characterData: true
+        });
+    }
+    return performance.now() - w.__settleLastMutation;
+}
+"""
+
+
+class PageSettler:
+    """
+    Waits for a page to stop changing
+
+    The page is settled once the DOM has not mutated and no request has
+    been in flight for quiet_ms, measured from the start of the wait so
+    that a just-triggered click has time to react. Each wait is capped,
+    so pages that never go quiet (tickers, polling) still move on.
+    """
+
+    def __init__(self, page: Page, quiet_ms: int = SETTLE_QUIET_MS):
+        self.page = page
+        self.quiet = quiet_ms / 1000
+        self._inflight: Set[Request] = set()
+        self._last_network = asyncio.get_running_loop().time()
+        page.on("request", self._on_request)
+        page.on("requestfinished", self._on_request_done)
+        page.on("requestfailed", self._on_request_done)
+
+    async def wait(self, max_ms: int = SETTLE_STEP_MAX_MS) -> bool:
+        """Wait until the page is quiet; False if the cap was reached first"""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        deadline = start + max_ms / 1000
+        while True:
+            now = loop.time()
+            idle = min(await self._dom_idle(), now - self._last_network, now - start)
+            if not self._inflight and idle >= self.quiet:
+                return True
+            if now >= deadline:
+                logger.debug(
+                    f"[JS] Page not settled after {max_ms}ms "
+                    f"({len(self._inflight)} requests in flight)"
+                )
+                return False
+            remaining = self.quiet - idle if not self._inflight else SETTLE_POLL_MS / 1000
+            await asyncio.sleep(max(0.0, min(remaining, SETTLE_POLL_MS / 1000, deadline - now)))
+
+    async def _dom_idle(self) -> float:
+        try:
+            return await self.page.evaluate(_DOM_IDLE_SCRIPT) / 1000
+        except Exception:
+            # The document is being replaced (navigation): not settled yet
+            return 0.0
+
+    def _on_request(self, request: Request) -> None:
+        if request.resource_type in UNTRACKED_RESOURCE_TYPES:
+            return
+        self._inflight.add(request)
+        self._last_network = asyncio.get_running_loop().time()
+
+    def _on_request_done(self, request: Request) -> None:
+        if request in self._inflight:
+            self._inflight.discard(request)
+            self._last_network = asyncio.get_running_loop().time()
@@ -0,0 +1,116 @@
+import asyncio
+import logging
+import os
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from app.document import ParsedDocument
+from app.limiter import DomainRateLimiter, crawl_rate_limiter
+from app.utils import normalize_url
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+PAGINATION_ENABLED = os.getenv("PAGINATION_ENABLED", "true").lower() == "true"
+PAGINATION_MAX_PAGES = int(os.getenv("PAGINATION_MAX_PAGES", "20"))  # Pages fetched beyond the first
+PAGINATION_CONCURRENCY = int(os.getenv("PAGINATION_CONCURRENCY", "4"))
+PAGINATION_TIMEOUT = int(os.getenv("PAGINATION_TIMEOUT", "30"))  # Seconds for the whole crawl
+
+
+class PaginationCrawler:
+    """
+    Fetches the further pages of a listing concurrently
+
+    Starting from the next/numbered links of the first page, pages are
+    fetched `concurrency` at a time and the links they reveal (pages
+    11, 12, ... once page 10 is reached) are queued in turn, until
+    max_pages pages were fetched, no new links turn up or the timeout
+    expires. Requests are spaced out per domain by the rate limiter.
+
+    fetch_page loads one URL into a ParsedDocument (statically or through
+    a browser context, as the caller sees fit) and returns None on
+    failure.
+    """
+
+    def __init__(
+        self,
+        fetch_page: Callable[[str], Awaitable[Optional[ParsedDocument]]],
+        max_pages: int = PAGINATION_MAX_PAGES,
+        concurrency: int = PAGINATION_CONCURRENCY,
+        timeout: float = PAGINATION_TIMEOUT,
+        rate_limiter: Optional[DomainRateLimiter] = None,
+    ):
+        self.fetch_page = fetch_page
+        self.max_pages = max_pages
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter or crawl_rate_limiter
+        self.timed_out = False
+
+    async def crawl(self, start_url: str, links: List[str]) -> AsyncIterator[ParsedDocument]:
+        """
+        Yield each further page in link order (the order pages were
+        discovered); a page loaded before an earlier one is held back
+        until that one is loaded, so results do not depend on timing
+        """
+        seen = {normalize_url(start_url)}
+        queue = deque()
+        positions: Dict[asyncio.Task, int] = {}
+        loaded: Dict[int, Optional[ParsedDocument]] = {}  # Position -> page, waiting for earlier pages
+        discovered = 0
+        released = 0
+
+        def enqueue(urls: List[str]) -> None:
+            nonlocal discovered
+            for link in urls:
+                key = normalize_url(link)
+                if key not in seen and len(seen) <= self.max_pages:
+                    seen.add(key)
+                    queue.append((discovered, link))
+                    discovered += 1
+
+        enqueue(links)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        pending = set()
+        try:
+            while queue or pending:
+                while queue and len(pending) < self.concurrency:
+                    position, link = queue.popleft()
+                    task = asyncio.create_task(self._fetch(link))
+                    positions[task] = position
+                    pending.add(task)
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    self.timed_out = True
+                    logger.warning(f"[PAGES] Pagination of {start_url} stopped after {self.timeout}s")
+                    break
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    loaded[positions.pop(task)] = task.result()
+                # Links are only followed from released pages, so the
+                # discovery order is the same on every run
+                while released in loaded:
+                    document = loaded.pop(released)
+                    released += 1
+                    if document is None:
+                        continue
+                    enqueue(document.pagination_links)
+                    yield document
+            # Pages loaded after one that never finished, still in order
+            for position in sorted(loaded):
+                if loaded[position] is not None:
+                    yield loaded[position]
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _fetch(self, url: str) -> Optional[ParsedDocument]:
+        await self.rate_limiter.wait(url)
+        try:
+            return await self.fetch_page(url)
+        except Exception as e:
+            logger.warning(f"[PAGES] Could not load {url}: {e}")
+            return None
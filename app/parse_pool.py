@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from app.document import ANALYSIS_FIELDS, ParsedDocument
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))  # 0 parses on the event loop
+PARSE_MAX_PENDING = int(os.getenv("PARSE_MAX_PENDING", str(PARSE_WORKERS * 4)))  # Submitted at once; callers beyond wait
+PARSE_INLINE_MAX_BYTES = int(os.getenv("PARSE_INLINE_MAX_BYTES", "20000"))  # Smaller pages are parsed in-process
+
+
+def analyze_html(html: str, url: str, engine: str) -> dict:
+    """Every analysis of a page, as exported by ParsedDocument (runs in a worker process)"""
+    document = ParsedDocument(html, url, engine)
+    for name in ANALYSIS_FIELDS:
+        getattr(document, name)
+    return document.export_analysis()
+
+
+class ParsePool:
+    """
+    Process pool that parses documents off the event loop
+
+    Only the HTML string goes to a worker and only the exported analysis
+    (sections, metadata, ...) comes back; the document is then restored
+    from it as if it came from the fetch cache. At most max_pending
+    documents are submitted at once, further callers wait for a free
+    slot. Small pages, and every page while the pool is not started, are
+    parsed in-process since shipping them costs more than parsing.
+    """
+
+    def __init__(
+        self,
+        workers: int = PARSE_WORKERS,
+        max_pending: int = PARSE_MAX_PENDING,
+        inline_max_bytes: int = PARSE_INLINE_MAX_BYTES,
+    ):
+        self.workers = workers
+        self.max_pending = max(1, max_pending)
+        self.inline_max_bytes = inline_max_bytes
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots = asyncio.Semaphore(self.max_pending)
+        self._waiting = 0
+        self._active = 0
+        self._counters = {"offloaded": 0, "inline": 0, "failures": 0}
+        self._parse_seconds = 0.0
+
+    @property
+    def started(self) -> bool:
+        return self._executor is not None
+
+    async def start(self) -> None:
+        if self.workers > 0 and self._executor is None:
+            self._executor = self._create_executor()
+        logger.info(f"[PARSE] Parse pool started with {self.workers} worker processes")
+
+    async def stop(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        logger.info("[PARSE] Parse pool stopped")
+
+    async def analyze(self, document: ParsedDocument) -> None:
+        """Compute the document's analysis, in a worker process when worthwhile"""
+        if self._executor is None or len(document.html) <= self.inline_max_bytes:
+            self._counters["inline"] += 1
+            return
+
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+        self._active += 1
+        started = time.perf_counter()
+        executor = self._executor
+        try:
+            loop = asyncio.get_running_loop()
+            analysis = await loop.run_in_executor(
+                executor, analyze_html, document.html, document.url, document.engine
+            )
+            document.restore_analysis(analysis)
+            document.parsed_in_worker = True
+            self._counters["offloaded"] += 1
+        except BrokenProcessPool:
+            # A worker died (e.g. out of memory); replace the pool and let
+            # the document parse itself in-process
+            logger.error(f"[PARSE] Worker process died while parsing {document.url}")
+            self._counters["failures"] += 1
+            self._restart(executor)
+        except Exception as e:
+            logger.warning(f"[PARSE] Parsing {document.url} in a worker failed, parsing in-process: {e}")
+            self._counters["failures"] += 1
+        finally:
+            self._parse_seconds += time.perf_counter() - started
+            self._active -= 1
+            self._slots.release()
+
+    def stats(self) -> dict:
+        offloaded = self._counters["offloaded"]
+        return {
+            "workers": self.workers if self.started else 0,
+            "maxPending": self.max_pending,
+            "active": self._active,
+            "queueDepth": self._waiting,
+            **self._counters,
+            "avgParseMs": round(self._parse_seconds / offloaded * 1000, 1) if offloaded else 0.0,
+        }
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        # spawn: forking a process that runs an event loop and threads is unsafe
+        return ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+        )
+
+    def _restart(self, broken: ProcessPoolExecutor) -> None:
+        # Callers that submitted to the same broken pool all get here; only
+        # the first replaces it, later ones must not shut down the new pool
+        if self._executor is not broken:
+            return
+        logger.warning("[PARSE] Restarting the parse pool")
+        broken.shutdown(wait=False, cancel_futures=True)
+        self._executor = self._create_executor()
+
+
+# Shared pool, started and stopped by the FastAPI lifespan
+parse_pool = ParsePool()
@@ -0,0 +1,154 @@
+import logging
+import os
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import FrozenSet, Optional
+from urllib.parse import urlsplit
+
+from playwright.async_api import Page, Request, Response, Route
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+RESOURCE_BLOCKING_ENABLED = os.getenv("RESOURCE_BLOCKING_ENABLED", "true").lower() == "true"
+# Playwright resource types aborted on every render
+BLOCK_RESOURCE_TYPES = os.getenv("BLOCK_RESOURCE_TYPES", "image,media,font")
+# Additionally aborted on render-only sessions, where layout does not matter
+LIGHT_RENDER_BLOCK_TYPES = os.getenv("LIGHT_RENDER_BLOCK_TYPES", "stylesheet")
+# Ad and analytics hosts (subdomains included); appended to the defaults
+BLOCK_DOMAINS = os.getenv("BLOCK_DOMAINS", "")
+DEFAULT_BLOCK_DOMAINS = [
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googletagservices.com",
+    "adservice.google.com",
+    "amazon-adsystem.com",
+    "adnxs.com",
+    "criteo.com",
+    "taboola.com",
+    "outbrain.com",
+    "scorecardresearch.com",
+    "quantserve.com",
+    "hotjar.com",
+    "segment.io",
+    "mixpanel.com",
+    "facebook.net",
+    "connect.facebook.net",
+    "ads-twitter.com",
+    "analytics.tiktok.com",
+    "clarity.ms",
+]
+
+
+def _split(value: str) -> FrozenSet[str]:
+    return frozenset(item.strip().lower() for item in value.split(",") if item.strip())
+
+
+@dataclass
+class RenderRequestStats:
+    """Requests made and aborted while rendering one page"""
+    requests: int = 0
+    blocked: int = 0
+    blocked_by_reason: Counter = field(default_factory=Counter)  # Resource type or "domain"
+    bytes_received: int = 0  # Content-Length of the responses that were let through
+
+    def to_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "blocked": self.blocked,
+            "blockedByReason": dict(self.blocked_by_reason),
+            "bytesReceived": self.bytes_received,
+        }
+
+
+class ResourcePolicy:
+    """
+    Request interception for JS renders
+
+    Aborts requests for resource types that never reach page.content()
+    (images, media, fonts and, on render-only sessions, stylesheets) and
+    for known ad/analytics hosts. Blocked images keep their src in the
+    DOM, so image URLs are still extracted. The page's own document is
+    never blocked.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = RESOURCE_BLOCKING_ENABLED,
+        block_types: str = BLOCK_RESOURCE_TYPES,
+        light_block_types: str = LIGHT_RENDER_BLOCK_TYPES,
+        block_domains: str = BLOCK_DOMAINS,
+    ):
+        self.enabled = enabled
+        self.block_types = _split(block_types)
+        self.light_block_types = self.block_types | _split(light_block_types)
+        self.block_domains = frozenset(DEFAULT_BLOCK_DOMAINS) | _split(block_domains)
+        self._totals = RenderRequestStats()
+        self._renders = 0
+
+    async def attach(self, page: Page, light: bool = False) -> Optional[RenderRequestStats]:
+        """
+        Install the interception route on a page before navigating
+        light blocks the extra render-only types; returns the counters
+        the page's requests are recorded in
+        """
+        if not self.enabled:
+            return None
+        stats = RenderRequestStats()
+        block_types = self.light_block_types if light else self.block_types
+        self._renders += 1
+
+        async def handle(route: Route) -> None:
+            request = route.request
+            reason = self.block_reason(request, block_types)
+            stats.requests += 1
+            self._totals.requests += 1
+            if reason is None:
+                await route.continue_()
+                return
+            stats.blocked += 1
+            stats.blocked_by_reason[reason] += 1
+            self._totals.blocked += 1
+            self._totals.blocked_by_reason[reason] += 1
+            await route.abort("blockedbyclient")
+
+        def count_bytes(response: Response) -> None:
+            try:
+                size = int(response.headers.get("content-length", 0))
+            except ValueError:
+                return
+            stats.bytes_received += size
+            self._totals.bytes_received += size
+
+        await page.route("**/*", handle)
+        page.on("response", count_bytes)
+        return stats
+
+    def block_reason(self, request: Request, block_types: FrozenSet[str]) -> Optional[str]:
+        """Why a request should be aborted, or None to let it through"""
+        if request.is_navigation_request() and request.frame.parent_frame is None:
+            return None
+        if request.resource_type in block_types:
+            return request.resource_type
+        if self.blocked_host(request.url):
+            return "domain"
+        return None
+
+    def blocked_host(self, url: str) -> bool:
+        host = (urlsplit(url).hostname or "").lower()
+        while host:
+            if host in self.block_domains:
+                return True
+            _, _, host = host.partition(".")
+        return False
+
+    def stats(self) -> dict:
+        """Totals across every render since startup"""
+        return {"enabled": self.enabled, "renders": self._renders, **self._totals.to_dict()}
+
+
+# Shared policy, used by JSScraper
+resource_policy = ResourcePolicy()
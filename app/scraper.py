@@ -1,14 +1,33 @@
 
 import asyncio
+import contextlib
 import logging
+import os
+import time
 from datetime import datetime
-from typing import Optional, List
+from typing import AsyncIterator, Awaitable, Callable, Optional, List, Tuple
 from urllib.parse import urljoin, urlparse
 
-from app.models import ScraperResult, Metadata, Interactions, ScraperError, Section, ContentData
+from app.models import (
+    ScraperResult, Metadata, Interactions, ScraperError, Section, ContentData,
+    FetchTimings, RenderRequests, RenderTimings, ScrapeEvent, ScrapeStrategy, StrategyMode, Timings
+)
 from app.static_scraper import StaticScraper
-from app.js_scraper import JSScraper
-from app.section_parser import parse_sections_from_html
+from app.http_client import HttpClientPool
+from app.fetch_cache import FetchCache, fetch_cache
+from app.limiter import ScrapeLimiter
+from app.js_scraper import JSScraper, RenderSession
+from app.browser_pool import BrowserPool
+from app.section_parser import SectionMerger
+from app.document import ParsedDocument
+from app.pagination import PAGINATION_ENABLED, PaginationCrawler
+from app.parse_pool import ParsePool, parse_pool
+from app.incremental import INCREMENTAL_PARSE_ENABLED, IncrementalAnalysis
+from app.domain_profiles import DomainProfiles, RoutingPlan, domain_profiles
+from app.metrics import (
+    PhaseTimer, errors_total, js_fallbacks_total, scrapes_total, sections_total,
+    speculative_renders_total, timeouts_total
+)
 
 logger = logging.getLogger(__name__)
 
@@ -16,115 +35,480 @@ logger = logging.getLogger(__name__)
 STATIC_CONTENT_MIN_LENGTH = 500
 STATIC_HEADING_REQUIRED = True
 JS_RENDER_THRESHOLD = 500
+JS_RENDER_TIMEOUT = 15
+INTERACTION_TIMEOUT = 20
+# Auto scrapes start rendering when the static fetch takes longer than
+# this, or right away for domains that usually need JS
+HEDGE_ENABLED = os.getenv("HEDGE_ENABLED", "true").lower() == "true"
+HEDGE_DELAY = float(os.getenv("HEDGE_DELAY_MS", "2000")) / 1000
 
 
 class WebScraper:
     """Main orchestrator for web scraping"""
     
-    def __init__(self, timeout: int = 60):
+    def __init__(
+        self,
+        timeout: int = 60,
+        browser_pool: Optional[BrowserPool] = None,
+        http_client: Optional[HttpClientPool] = None,
+        cache: Optional[FetchCache] = None,
+        limiter: Optional[ScrapeLimiter] = None,
+        paginate: bool = PAGINATION_ENABLED,
+        parser: Optional[ParsePool] = None,
+        collect_timings: bool = False,
+        profiles: Optional[DomainProfiles] = None
+    ):
         self.timeout = timeout
-        self.static_scraper = StaticScraper(timeout=10)
-        self.js_scraper = JSScraper(timeout=15)
+        # Attach a Timings breakdown to results
+        self.collect_timings = collect_timings
+        # Large documents are parsed in worker processes, off the event loop
+        self.parser = parser or parse_pool
+        # Site crawls turn this off: they reach listing pages through links
+        self.paginate = paginate
+        # Batch scrapes share concurrency limits across their WebScrapers
+        self.limiter = limiter
+        # What each domain needed before, to route and hedge auto scrapes
+        self.profiles = profiles or domain_profiles
+        self.cache = cache or fetch_cache
+        self.static_scraper = StaticScraper(timeout=10, client=http_client, cache=self.cache)
+        # Browsers are borrowed from the shared pool, never owned per scrape
+        # With the pagination crawler on, pages are fetched concurrently
+        # rather than followed one by one inside the browser session
+        self.js_scraper = JSScraper(
+            timeout=JS_RENDER_TIMEOUT,
+            pool=browser_pool,
+            cache=self.cache,
+            follow_pagination=not PAGINATION_ENABLED
+        )
         self.errors: List[ScraperError] = []
+        self.timer = PhaseTimer()
+        self.fetch_timings = FetchTimings()
     
-    async def scrape(self, url: str) -> ScraperResult:
+    async def scrape(self, url: str, strategy: StrategyMode = "auto") -> ScraperResult:
         """
         Scrape a URL using intelligent static-first, JS-fallback strategy
         
+        strategy:
+          static-only - never launch a browser
+          auto        - render only if static content is insufficient and run
+                        interactions only if the HTML shows interaction signals
+          full        - always run the JS session with interactions
+        
         Returns: ScraperResult with all required fields per schema
         """
+        sections = []
+        result = None
+        async for event in self.iter_scrape(url, strategy=strategy, keep_sections=True):
+            if event.event == "section":
+                sections.append(event.data)
+            elif event.event == "done":
+                result = event.data
+        result.sections = sections
+        return result
+    
+    async def iter_scrape(
+        self,
+        url: str,
+        strategy: StrategyMode = "auto",
+        keep_sections: bool = False
+    ) -> AsyncIterator[ScrapeEvent]:
+        """
+        Generator version of scrape, for streamed responses
+        
+        Yields a "meta" event (Metadata) once the page is loaded, then one
+        "section" event per section as it is parsed, then a "done" event
+        carrying the ScraperResult without its sections. Static-only
+        scrapes, and auto scrapes whose body scores enough while it
+        downloads, get "meta" as soon as the <head> was parsed; a second
+        "meta" event follows only if the full parse finds different
+        metadata. The scraper does not collect the sections itself; consumers decide what to keep.
+        Unless keep_sections is set, parsed pages do not keep their
+        sections either (so their sections are not cached), and memory
+        stays flat however many pages a scrape covers.
+        """
         self.errors = []
+        self.timer = timer = PhaseTimer()
+        self.fetch_timings = FetchTimings()
+        started = time.perf_counter()
+        render_timings: Optional[RenderTimings] = None  # Set once a JS session ran
         visited_urls = {url}
-        all_html_content = ""
+        report = ScrapeStrategy(mode=strategy)
+        static_document: Optional[ParsedDocument] = None
+        rendered_document: Optional[ParsedDocument] = None
+        speculative: Optional[asyncio.Task] = None
+        fetch: Optional[asyncio.Task] = None
+        static_loading: Optional[asyncio.Task] = None
+        static_html: Optional[str] = None
+        quality_score: Optional[int] = None
+        meta: Optional[Metadata] = None  # Last streamed metadata
+        early_meta = asyncio.Event()  # The static page's head metadata can be streamed
+        plan = RoutingPlan()
+        
+        def wants_interaction(signals: List[str]) -> bool:
+            return not plan.skip_interactions and _needs_interaction(signals)
+        
+        def load_static_document() -> asyncio.Task:
+            # Shared by the main flow and a render deciding on interactions
+            nonlocal static_loading
+            if static_loading is None:
+                static_loading = asyncio.create_task(self._load_document(static_html or "", url))
+            return static_loading
+        
+        async def interact_if(rendered_html: str) -> bool:
+            # SPA shells only reveal their tabs/pagination once rendered;
+            # the rendered page is analyzed off the event loop and reused
+            # as the scrape's document
+            nonlocal rendered_document
+            rendered_document = await self._load_document(rendered_html, url)
+            report.signals = rendered_document.interaction_signals
+            return wants_interaction(report.signals)
+        
+        async def speculative_interact_if(rendered_html: str) -> bool:
+            # Started before the static signals were known: interact if
+            # either the static (once fetched) or the rendered HTML asks for it
+            document = static_document
+            if document is None and static_html:
+                # Shielded: a cancelled render must not cancel the main flow's parse
+                document = await asyncio.shield(load_static_document())
+            if document is not None and wants_interaction(document.interaction_signals):
+                report.signals = document.interaction_signals
+                return True
+            return await interact_if(rendered_html)
+        
+        def head_parsed() -> None:
+            # Static-only pages are never replaced by a render
+            if strategy == "static-only" or analysis.sufficient:
+                early_meta.set()
+        
+        def static_sufficient() -> None:
+            # The body scored enough while downloading: a hedge render
+            # started for it can only lose, stop it before it takes a browser
+            nonlocal speculative
+            if analysis.metadata is not None:
+                early_meta.set()
+            if speculative is not None and speculative.cancel():
+                logger.info(f"[JS] Static content sufficient while downloading, cancelling the render")
+                speculative_renders_total.inc(outcome="cancelled")
+                speculative = None
+        
+        def start_render() -> asyncio.Task:
+            return asyncio.create_task(self._timed_js_session(
+                url, render_required=True, interact=False, interact_if=speculative_interact_if
+            ))
         
         try:
-            # Stage 1: Try static scraping
-            logger.info(f"[STATIC] Starting static scrape of {url}")
-            static_html = await self._fetch_static(url)
+            # Domains that always needed JS skip the static fetch, and
+            # interactions that never found anything there are skipped
+            if strategy == "auto":
+                plan = await self.profiles.plan(url)
+                report.routed = plan.path
+                report.probe = plan.probe
+            
+            # Stage 1: Try static scraping, scoring the body as it downloads.
+            # Auto scrapes hedge it with a render, started right away for
+            # domains that usually need JS or once the fetch is slow; a
+            # render that completes first wins and the fetch is cancelled
+            analysis = None
+            if INCREMENTAL_PARSE_ENABLED:
+                analysis = IncrementalAnalysis(
+                    JS_RENDER_THRESHOLD, on_sufficient=static_sufficient, on_metadata=head_parsed
+                )
+            known_js = plan.profile is not None and plan.profile.needs_js
+            render_won = False
+            if plan.path == "js":
+                logger.info(f"[PROFILE] Domain needs JS, rendering without a static fetch")
+                speculative = start_render()
+                await asyncio.wait({speculative})
+                # A failed render falls back to the static fetch, like a lost hedge
+                render_won = bool(speculative.result()[0].html)
+                if not render_won:
+                    logger.warning(f"[PROFILE] Render failed, falling back to the static fetch")
+            if not render_won:
+                logger.info(f"[STATIC] Starting static scrape of {url}")
+                fetch_started = time.perf_counter()
+                fetch = asyncio.create_task(self._fetch_static(url, analysis))
+                if strategy == "auto" and HEDGE_ENABLED and plan.path is None:
+                    if not known_js:
+                        await asyncio.wait({fetch}, timeout=HEDGE_DELAY)
+                    hedge = not fetch.done() and not (analysis is not None and analysis.sufficient)
+                    if hedge and not self._can_hedge(url):
+                        # The fetch still holds this scrape's slots; a render
+                        # would have to wait for, or take, another scrape's
+                        logger.info(f"[JS] No free browser slot, not hedging the static fetch")
+                        hedge = False
+                    if hedge:
+                        logger.info(f"[JS] Hedging the static fetch with a render (domain needs JS: {known_js})")
+                        report.hedged = True
+                        hedged_at = time.perf_counter()
+                        speculative = render = start_render()
+                        await asyncio.wait({fetch, render}, return_when=asyncio.FIRST_COMPLETED)
+                        if not fetch.done() and not render.cancelled() and render.result()[0].html:
+                            logger.info(f"[JS] Render finished before the static fetch, cancelling it")
+                            fetch.cancel()
+                            render_won = True
+                if render_won:
+                    # From the hedge on the scrape waited for the render,
+                    # which is timed as js_render
+                    timer.record("static_fetch", hedged_at - fetch_started)
+                else:
+                    if analysis is not None and not fetch.done():
+                        # Stream the head's metadata while the body downloads
+                        # once the page is known to stay static
+                        head_ready = asyncio.create_task(early_meta.wait())
+                        await asyncio.wait({fetch, head_ready}, return_when=asyncio.FIRST_COMPLETED)
+                        head_ready.cancel()
+                    if early_meta.is_set():
+                        logger.info(f"[META] Streaming head metadata before the full parse")
+                        meta = analysis.metadata
+                        yield ScrapeEvent(event="meta", data=meta)
+                    static_html = await fetch
+                    timer.record("static_fetch", time.perf_counter() - fetch_started)
+            needs_js = strategy != "static-only"
+            
+            # A body the incremental parse found insufficient is rendered
+            # while the full parse runs; the full parse has the final say
+            if (
+                speculative is None and strategy == "auto" and static_html
+                and analysis is not None and analysis.complete and not analysis.sufficient
+            ):
+                logger.info(f"[JS] Incremental quality score {analysis.quality_score}, rendering while parsing")
+                speculative = start_render()
+            
+            # Every stage reads this one parsed tree (or the cached results
+            # of an identical earlier body)
+            with timer.phase("parse"):
+                document = static_document = await load_static_document()
             
             if static_html:
-                all_html_content = static_html
-                quality_score = self._assess_content_quality(static_html)
+                with timer.phase("quality_assess"):
+                    quality_score = document.quality_score
                 logger.info(f"[STATIC] Content quality score: {quality_score}")
-                
-                # If static content is insufficient, trigger JS rendering
-                if quality_score < JS_RENDER_THRESHOLD:
+                needs_js = needs_js and quality_score < JS_RENDER_THRESHOLD
+                if needs_js:
                     logger.info(f"[JS] Static content insufficient, triggering JS rendering")
-                    try:
-                        js_html = await self._fetch_with_js(url)
-                        if js_html and len(js_html) > len(static_html):
-                            all_html_content = js_html
-                            self.errors.append(ScraperError(
-                                message="Static content insufficient, used JS rendering",
-                                phase="fallback"
-                            ))
-                    except Exception as e:
-                        logger.error(f"[JS] JS rendering failed: {e}")
-                        self.errors.append(ScraperError(
-                            message=f"JS rendering failed: {str(e)}",
-                            phase="render"
-                        ))
-            else:
-                # No static content, must use JS
+            elif needs_js:
                 logger.info(f"[JS] No static content, using JS rendering")
-                try:
-                    all_html_content = await self._fetch_with_js(url)
-                except Exception as e:
-                    logger.error(f"[JS] JS rendering failed: {e}")
-                    self.errors.append(ScraperError(
-                        message=f"JS rendering failed: {str(e)}",
-                        phase="render"
-                    ))
             
-            # Stage 2: Parse HTML into sections
-            logger.info(f"[PARSE] Parsing sections from HTML ({len(all_html_content)} chars)")
-            sections = parse_sections_from_html(all_html_content, url)
+            # Decide whether the interaction phase is worth a browser session
+            interact = strategy == "full"
+            if strategy == "auto" and static_html:
+                if rendered_document is None:
+                    report.signals = document.interaction_signals
+                interact = wants_interaction(document.interaction_signals)
+            logger.info(f"[STRATEGY] mode={strategy} render={needs_js} interact={interact} signals={report.signals}")
+            
+            if speculative is not None and not needs_js:
+                logger.info(f"[JS] Static content sufficient after the full parse, cancelling the render")
+                speculative_renders_total.inc(outcome="cancelled")
+                speculative.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await speculative
+                speculative = None
+            
+            # Stage 2: One JS session renders the page and runs interactions
+            # (tabs, load more, pagination, scroll) on the same navigation
+            session = RenderSession(url=url)
+            if speculative is not None or needs_js or interact:
+                if speculative is not None:
+                    speculative_renders_total.inc(outcome="used")
+                    session, seconds, errors = await speculative
+                    timer.record("js_session", seconds)
+                    self.errors.extend(errors)
+                else:
+                    logger.info(f"[INTERACTIONS] Rendering and detecting interactions")
+                    with timer.phase("js_session"):
+                        session = await self._run_js_session(
+                            url,
+                            render_required=needs_js,
+                            interact=interact,
+                            interact_if=interact_if if strategy == "auto" and not interact else None
+                        )
+                # Split the session into the render and the interaction steps
+                timer.record("js_render", timer.durations.pop("js_session") - session.interaction_seconds)
+                if session.interacted:
+                    timer.record("interactions", session.interaction_seconds)
+                render_timings = session.timings
+            interactions = session.interactions
+            visited_urls.update(interactions.pages)
+            report.interactions = session.interacted
+            if session.requests is not None:
+                report.requests = RenderRequests(**session.requests.to_dict())
+            
+            if needs_js and session.html:
+                if not static_html or len(session.html) > len(static_html):
+                    if rendered_document is not None and rendered_document.html is session.html:
+                        document = rendered_document
+                    else:
+                        with timer.phase("parse"):
+                            document = await self._load_document(session.html, url)
+                    report.path = "js"
+                    if static_html:
+                        self.errors.append(ScraperError(
+                            message="Static content insufficient, used JS rendering",
+                            phase="fallback"
+                        ))
             
             # Stage 3: Extract metadata
             logger.info(f"[META] Extracting metadata")
-            meta = self._extract_metadata(all_html_content, url)
+            with timer.phase("metadata"):
+                streamed, meta = meta, document.metadata
+            if meta != streamed:
+                yield ScrapeEvent(event="meta", data=meta)
             
-            # Stage 4: Handle interactions (tabs, load more, pagination)
-            logger.info(f"[INTERACTIONS] Detecting interactions")
-            interactions = await self._handle_interactions(url)
-            visited_urls.update(interactions.pages)
+            # Stage 4: Parse HTML into sections, including content revealed
+            # by interaction steps
+            logger.info(f"[PARSE] Parsing sections from HTML ({len(document.html)} chars)")
+            merger = SectionMerger()
+            section_count = 0
+            interaction_sections = 0
+            for section in timer.timed("parse", document.iter_sections(keep=keep_sections)):
+                merger.add_base(section)
+                section_count += 1
+                yield ScrapeEvent(event="section", data=section)
+            for snapshot in session.interaction_snapshots:
+                logger.info(f"[PARSE] Parsing snapshot after {snapshot.step}")
+                with timer.phase("parse"):
+                    snapshot_document = await self._parse_document(snapshot.html, snapshot.url)
+                for section in timer.timed("parse", snapshot_document.iter_sections(keep=False)):
+                    section = merger.add(section)
+                    if section is not None:
+                        section_count += 1
+                        interaction_sections += 1
+                        yield ScrapeEvent(event="section", data=section)
+            
+            # Stage 4b: Further pages of a listing, fetched concurrently;
+            # their sections carry their own sourceUrl
+            if self.paginate and document.pagination_links:
+                render_first = report.path == "js"
+                crawler = PaginationCrawler(
+                    lambda page_url: self._fetch_page(page_url, strategy, render_first)
+                )
+                logger.info(f"[PAGES] Crawling pagination from {len(document.pagination_links)} links")
+                pagination_started = time.perf_counter()
+                async for page in crawler.crawl(url, document.pagination_links):
+                    interactions.pages.append(page.url)
+                    for section in page.iter_sections(keep=keep_sections):
+                        section = merger.add(section)
+                        if section is not None:
+                            section_count += 1
+                            yield ScrapeEvent(event="section", data=section)
+                    await self._store_document(page)
+                timer.record("pagination", time.perf_counter() - pagination_started)
+                if crawler.timed_out:
+                    self.errors.append(ScraperError(
+                        message="Pagination crawl timed out, later pages were skipped",
+                        phase="pagination"
+                    ))
             
-            # Stage 5: Build result
+            await self._store_document(document)
+            if not section_count:
+                yield ScrapeEvent(event="section", data=self._create_empty_section(url))
+            
+            # Stage 5: Build result (sections were streamed above)
             result = ScraperResult(
                 url=url,
                 scrapedAt=datetime.utcnow().isoformat() + "Z",
                 meta=meta,
-                sections=sections if sections else [self._create_empty_section(url)],
+                sections=[],
                 interactions=interactions,
-                errors=self.errors
+                strategy=report,
+                errors=self.errors,
+                timings=self._timings(started, render_timings) if self.collect_timings else None
             )
             
-            logger.info(f"[SUCCESS] Scrape complete: {len(sections)} sections, {len(interactions.pages)} pages")
-            return result
+            if strategy == "auto" and (static_html or report.path == "js"):
+                # What the domain needs, even if this render failed; only
+                # a scored static body shows whether JS was needed
+                await self.profiles.record(
+                    url,
+                    needs_js=needs_js if quality_score is not None else None,
+                    quality_score=quality_score,
+                    interacted=session.interacted,
+                    interactions_found=interaction_sections > 0,
+                    render_ms=timer.durations["js_render"] * 1000 if session.html else None
+                )
+            logger.info(f"[SUCCESS] Scrape complete: {section_count} sections, {len(interactions.pages)} pages")
+            scrapes_total.inc(strategy=strategy, path=report.path)
+            if report.path == "js" and static_html:
+                js_fallbacks_total.inc()
+            sections_total.inc(section_count)
+            self._finish_metrics()
+            yield ScrapeEvent(event="done", data=result)
         
         except Exception as e:
             logger.error(f"[ERROR] Unexpected error: {e}", exc_info=True)
             self.errors.append(ScraperError(message=str(e), phase="unknown"))
+            self._finish_metrics()
             
             # Return minimal valid result
-            return ScraperResult(
+            yield ScrapeEvent(event="done", data=ScraperResult(
                 url=url,
                 scrapedAt=datetime.utcnow().isoformat() + "Z",
                 meta=Metadata(language="en"),
                 sections=[],
                 interactions=Interactions(pages=[url]),
-                errors=self.errors
+                strategy=report,
+                errors=self.errors,
+                timings=self._timings(started, render_timings) if self.collect_timings else None
+            ))
+        
+        finally:
+            # Tasks still running when the scrape failed or the consumer left
+            for task in (fetch, speculative, static_loading):
+                if task is not None and not task.done():
+                    task.cancel()
+    
+    def _timings(self, started: float, render: Optional[RenderTimings]) -> Timings:
+        """Wall-time breakdown of the scrape so far"""
+        return Timings(
+            totalMs=round((time.perf_counter() - started) * 1000, 1),
+            stages={name: round(seconds * 1000, 1) for name, seconds in self.timer.durations.items()},
+            fetch=self.fetch_timings,
+            render=render
+        )
+    
+    def _finish_metrics(self) -> None:
+        """Record this scrape's phase durations and errors"""
+        self.timer.finish()
+        for error in self.errors:
+            errors_total.inc(phase=error.phase)
+    
+    async def _load_document(self, html: str, url: str) -> ParsedDocument:
+        """Document for the HTML, with results restored if this body was parsed before"""
+        document = ParsedDocument(html, url)
+        if html:
+            analysis = await self.cache.get_analysis(url, document.engine, document.content_hash)
+            if analysis:
+                logger.info(f"[CACHE] Content unchanged, reusing parsed sections")
+                document.restore_analysis(analysis)
+            else:
+                await self.parser.analyze(document)
+        return document
+    
+    async def _parse_document(self, html: str, url: str) -> ParsedDocument:
+        """Document for the HTML, analyzed by the parse pool"""
+        document = ParsedDocument(html, url)
+        await self.parser.analyze(document)
+        return document
+    
+    async def _store_document(self, document: ParsedDocument) -> None:
+        """Remember the results of a newly parsed document, once complete"""
+        if document.html and document.parsed and document.has_sections:
+            await self.cache.put_analysis(
+                document.url, document.engine, document.content_hash, document.export_analysis()
             )
     
-    async def _fetch_static(self, url: str) -> Optional[str]:
-        """Fetch and return static HTML"""
+    async def _fetch_static(self, url: str, analysis: Optional[IncrementalAnalysis] = None) -> Optional[str]:
+        """Fetch and return static HTML, feeding it to analysis as it downloads"""
         try:
-            html = await asyncio.wait_for(
-                self.static_scraper.fetch(url),
-                timeout=10
-            )
+            async with self._slot("static", url):
+                html = await asyncio.wait_for(
+                    self.static_scraper.fetch(url, timings=self.fetch_timings, errors=self.errors, analysis=analysis),
+                    timeout=10
+                )
             return html
         except asyncio.TimeoutError:
+            timeouts_total.inc(phase="fetch")
             self.errors.append(ScraperError(
                 message="Static fetch timed out",
                 phase="fetch"
@@ -137,131 +521,96 @@ class WebScraper:
             ))
             return None
     
-    async def _fetch_with_js(self, url: str) -> Optional[str]:
-        """Fetch and return JS-rendered HTML"""
+    async def _run_js_session(
+        self,
+        url: str,
+        render_required: bool,
+        interact: bool,
+        interact_if: Optional[Callable[[str], Awaitable[bool]]] = None,
+        errors: Optional[List[ScraperError]] = None
+    ) -> RenderSession:
+        """
+        Render the page and run interactions in a single browser session
+        Snapshots captured before a timeout are kept; failures are
+        reported to errors (default: the scrape's errors)
+        """
+        errors = self.errors if errors is None else errors
+        session = RenderSession(url=url)
+        timeout = JS_RENDER_TIMEOUT
+        if interact or interact_if is not None:
+            timeout += INTERACTION_TIMEOUT
         try:
-            html = await asyncio.wait_for(
-                self.js_scraper.render(url),
-                timeout=15
-            )
-            return html
+            async with self._slot("browser", url):
+                await asyncio.wait_for(
+                    self.js_scraper.run_session(session, interact=interact, interact_if=interact_if),
+                    timeout=timeout
+                )
         except asyncio.TimeoutError:
-            self.errors.append(ScraperError(
-                message="JS rendering timed out",
-                phase="render"
-            ))
-            return None
+            timeouts_total.inc(phase="render" if session.html is None else "interactions")
+            if session.html is None and render_required:
+                errors.append(ScraperError(
+                    message="JS rendering timed out",
+                    phase="render"
+                ))
+            else:
+                logger.warning(f"Interaction handling timed out for {url}")
         except Exception as e:
-            self.errors.append(ScraperError(
-                message=f"JS rendering failed: {str(e)}",
-                phase="render"
-            ))
-            return None
+            if render_required:
+                logger.error(f"[JS] JS rendering failed: {e}")
+                errors.append(ScraperError(
+                    message=f"JS rendering failed: {str(e)}",
+                    phase="render"
+                ))
+            else:
+                logger.warning(f"Interaction handling failed: {e}")
+        
+        return session
     
-    def _assess_content_quality(self, html: str) -> int:
+    async def _timed_js_session(self, url: str, **kwargs) -> Tuple[RenderSession, float, List[ScraperError]]:
         """
-        Score HTML content quality to determine if JS rendering is needed
-        Higher score = better content
+        _run_js_session as a task of its own, with its wall time
+        Errors are returned rather than reported, the render may be discarded
         """
-        from bs4 import BeautifulSoup
-        
-        soup = BeautifulSoup(html, "lxml")
-        
-        # Remove script/style
-        for tag in soup(["script", "style"]):
-            tag.decompose()
-        
-        # Count text
-        text = soup.get_text(strip=True)
-        text_length = len(text)
-        
-        # Check for main element
-        has_main = bool(soup.find(["main", "article"]))
-        
-        # Check for heading
-        has_heading = bool(soup.find(["h1", "h2", "h3"]))
-        
-        # Score
-        score = text_length
-        if has_main:
-            score += 300
-        if has_heading:
-            score += 200
-        
-        return score
+        started = time.perf_counter()
+        errors: List[ScraperError] = []
+        session = await self._run_js_session(url, errors=errors, **kwargs)
+        return session, time.perf_counter() - started, errors
     
-    async def _handle_interactions(self, url: str) -> Interactions:
+    async def _fetch_page(self, url: str, strategy: StrategyMode, render_first: bool) -> Optional[ParsedDocument]:
         """
-        Detect and handle user interactions:
-        - Tab clicks
-        - Load more buttons
-        - Pagination
-        - Infinite scroll
-        
-        Returns interactions object with clicks, scrolls, pages
+        Load one further page of a listing
+        Static fetch first, falling back to a render in its own browser
+        context; pages of a listing that needed JS are rendered directly
         """
-        interactions = Interactions(pages=[url], clicks=[], scrolls=0)
-        
-        try:
-            # Use JS scraper to handle interactions
-            result = await asyncio.wait_for(
-                self.js_scraper.handle_interactions(url),
-                timeout=20
-            )
-            
-            if result:
-                interactions = result
-        except Exception as e:
-            logger.warning(f"Interaction handling failed: {e}")
-            # Return minimal interactions object
-            interactions = Interactions(pages=[url])
-        
-        return interactions
+        html = None
+        if not render_first or strategy == "static-only":
+            try:
+                async with self._slot("static", url):
+                    html = await asyncio.wait_for(self.static_scraper.fetch(url, errors=self.errors), timeout=10)
+            except Exception as e:
+                logger.warning(f"[PAGES] Static fetch of {url} failed: {e}")
+        document = await self._load_document(html or "", url)
+
+        if strategy != "static-only" and (not html or document.quality_score < JS_RENDER_THRESHOLD):
+            try:
+                async with self._slot("browser", url):
+                    rendered = await asyncio.wait_for(self.js_scraper.render(url), timeout=JS_RENDER_TIMEOUT)
+                if rendered and (not html or len(rendered) > len(html)):
+                    document = await self._load_document(rendered, url)
+            except Exception as e:
+                logger.warning(f"[PAGES] Render of {url} failed: {e}")
+
+        return document if document.html else None
     
-    def _extract_metadata(self, html: str, url: str) -> Metadata:
-        """Extract page metadata"""
-        from bs4 import BeautifulSoup
-        
-        soup = BeautifulSoup(html, "lxml")
-        
-        # Title
-        title = ""
-        title_tag = soup.find("title")
-        if title_tag:
-            title = title_tag.get_text(strip=True)
-        if not title:
-            og_title = soup.find("meta", property="og:title")
-            if og_title:
-                title = og_title.get("content", "")
-        
-        # Description
-        description = ""
-        desc_tag = soup.find("meta", attrs={"name": "description"})
-        if desc_tag:
-            description = desc_tag.get("content", "")
-        if not description:
-            og_desc = soup.find("meta", property="og:description")
-            if og_desc:
-                description = og_desc.get("content", "")
-        
-        # Language
-        language = "en"
-        html_tag = soup.find("html")
-        if html_tag:
-            language = html_tag.get("lang", "en").split("-")[0]
-        
-        # Canonical
-        canonical = None
-        canonical_tag = soup.find("link", attrs={"rel": "canonical"})
-        if canonical_tag:
-            canonical = canonical_tag.get("href")
-        
-        return Metadata(
-            title=title,
-            description=description,
-            language=language,
-            canonical=canonical
-        )
+    def _slot(self, pool: str, url: str):
+        """Concurrency slot for a network phase, if running under a limiter"""
+        if self.limiter is None:
+            return contextlib.nullcontext()
+        return self.limiter.slot(pool, url)
+    
+    def _can_hedge(self, url: str) -> bool:
+        """Whether a hedge render would get a browser slot without waiting"""
+        return self.limiter is None or self.limiter.has_capacity("browser", url)
     
     def _create_empty_section(self, url: str) -> Section:
         """Create a placeholder section when no content found"""
@@ -273,4 +622,12 @@ class WebScraper:
             content=ContentData(text="Unable to extract content from this page"),
             rawHtml="",
             truncated=False
-        )
\ No newline at end of file
+        )
+
+
+def _needs_interaction(signals: List[str]) -> bool:
+    """Whether interaction signals call for a browser session"""
+    if PAGINATION_ENABLED:
+        # Pagination is handled by the crawler, without a browser session
+        signals = [signal for signal in signals if signal != "pagination"]
+    return bool(signals)
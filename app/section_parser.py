@@ -1,9 +1,11 @@
 
+import itertools
 import logging
+import os
 import re
-from typing import List, Dict, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set
 from urllib.parse import urljoin
-from bs4 import BeautifulSoup, NavigableString, Tag
+from bs4 import BeautifulSoup, CData, NavigableString, Tag
 
 from app.models import Section, ContentData, ContentLink, ContentImage
 
@@ -18,198 +20,477 @@ NOISE_SELECTORS = [
     ".newsletter-popup", ".modal-backdrop",
     "[class*='advertisement']", "[class*='consent']"
 ]
+LANDMARK_TAGS = ["header", "nav", "main", "section", "article", "footer"]
+HEADING_TAGS = ["h1", "h2", "h3", "h4", "h5", "h6"]
+SECTION_HEADING_TAGS = ["h1", "h2", "h3", "h4"]
 
+# Extraction engine: "bs4" (BeautifulSoup) or "lxml" (faster, same output)
+SECTION_PARSER_ENGINE = os.getenv("SECTION_PARSER_ENGINE", "bs4")
 
-def parse_sections_from_html(html: str, base_url: str) -> List[Section]:
+
+def parse_sections_from_html(html: str, base_url: str, engine: Optional[str] = None) -> List[Section]:
     """
     Parse HTML into semantic sections
     Groups by landmarks, headings, and content blocks
     """
-    soup = BeautifulSoup(html, "lxml")
+    return list(iter_sections_from_html(html, base_url, engine))
+
+
+def iter_sections_from_html(html: str, base_url: str, engine: Optional[str] = None) -> Iterator[Section]:
+    """
+    Generator version of parse_sections_from_html
+    Each section is yielded as soon as it is extracted
+    """
+    if (engine or SECTION_PARSER_ENGINE) == "lxml":
+        from app import lxml_parser
+        return lxml_parser.iter_sections_from_html(html, base_url)
     
+    soup = BeautifulSoup(html, "lxml")
+    strip_noise(soup)
+    return iter_sections_from_soup(soup, base_url)
+
+
+def strip_noise(soup: BeautifulSoup) -> None:
+    """Remove noise elements, scripts and styles from a freshly parsed tree"""
     # Remove noise
     for selector in NOISE_SELECTORS:
         for element in soup.select(selector):
             element.decompose()
     
-    # Remove scripts and styles
+    strip_scripts(soup)
+
+
+def strip_scripts(soup: BeautifulSoup) -> None:
+    """Remove scripts and styles only (the page as scored for quality)"""
     for tag in soup(["script", "style"]):
         tag.decompose()
+
+
+def parse_sections_from_soup(soup: BeautifulSoup, base_url: str) -> List[Section]:
+    """
+    Extract sections from a tree already cleaned by strip_noise
+    The tree is not modified.
+    """
+    return _SoupSectionParser(soup, base_url).parse()
+
+
+def iter_sections_from_soup(soup: BeautifulSoup, base_url: str) -> Iterator[Section]:
+    """Generator version of parse_sections_from_soup"""
+    return _SoupSectionParser(soup, base_url).iter_sections()
+
+
+class NodeIndex:
+    """
+    Text length, link count and image count of every element
+
+    Built in a single bottom-up pass so that no stage has to walk a
+    subtree to make its decisions. Text length matches
+    len(get_text(strip=True)).
+    """
+    
+    def __init__(self, key: Optional[Callable[[Any], Any]] = None):
+        # Nodes are dict keys unless a key function is given
+        self._key = key or (lambda node: node)
+        self._stats: Dict[Any, List[int]] = {}
+    
+    def set(self, node: Any, text_len: int, links: int, images: int) -> None:
+        self._stats[self._key(node)] = [text_len, links, images]
+    
+    def text_len(self, node: Any) -> int:
+        return self._stats.get(self._key(node), _NO_STATS)[0]
+    
+    def links(self, node: Any) -> int:
+        return self._stats.get(self._key(node), _NO_STATS)[1]
+    
+    def images(self, node: Any) -> int:
+        return self._stats.get(self._key(node), _NO_STATS)[2]
+    
+    def detach(
+        self,
+        node: Any,
+        ancestors: Iterable[Any],
+        is_detached: Optional[Callable[[Any], bool]] = None
+    ) -> None:
+        """
+        Remove a node's counts from its ancestors, stopping at an ancestor
+        that is already detached (its counts no longer matter)
+        """
+        stats = self._stats.get(self._key(node))
+        if not stats:
+            return
+        for ancestor in ancestors:
+            if is_detached is not None and is_detached(ancestor):
+                break
+            ancestor_stats = self._stats.get(self._key(ancestor))
+            if ancestor_stats is None:
+                break
+            for i, value in enumerate(stats):
+                ancestor_stats[i] -= value
+
+
+_NO_STATS = (0, 0, 0)
+# String types counted by get_text(); comments, script and template strings are not
+TEXT_STRING_TYPES = (NavigableString, CData)
+
+
+class _SoupSectionParser:
+    """
+    Section extraction over a BeautifulSoup tree
+
+    A heading section is the range from its heading to the next heading
+    among its siblings. The elements in that range are claimed rather than
+    moved into a container: later stages treat claimed elements as
+    detached from the document, so the tree itself is never modified.
+
+    Tags hash by their serialization, so sets and the index use id().
+    """
+    
+    def __init__(self, soup: BeautifulSoup, base_url: str):
+        self.soup = soup
+        self.base_url = base_url
+        self.claimed: Set[int] = set()
+        self.claimed_ancestors: Set[int] = set()
+        self.index = self._build_index()
     
-    sections = []
-    section_id = 0
-    processed_elements = set()
-    
-    # Stage 1: Extract landmark-based sections
-    for landmark in ["header", "nav", "main", "section", "article", "footer"]:
-        for element in soup.find_all(landmark, recursive=True):
-            if element not in processed_elements:
-                section = _extract_section_from_element(
-                    element, base_url, f"{landmark}-{section_id}"
-                )
+    def parse(self) -> List[Section]:
+        return list(self.iter_sections())
+        
+    def iter_sections(self) -> Iterator[Section]:
+        """Sections in document order, deduplicated and typed as they are found"""
+        return _finalize_sections(self._iter_candidates())
+        
+    def _iter_candidates(self) -> Iterator[Section]:
+        """Sections from the three stages, before deduplication"""
+        section_id = 0
+        # Serialized elements already turned into sections; bs4 Tags compare
+        # structurally, so identical markup is only used once
+        processed_elements = set()
+        
+        # Stage 1: Extract landmark-based sections
+        for landmark in LANDMARK_TAGS:
+            for element in self.soup.find_all(landmark, recursive=True):
+                if not self.index.text_len(element):
+                    continue  # Would produce an empty section
+                raw_html = self._serialize(element)
+                if raw_html not in processed_elements:
+                    section = self._extract_section([element], f"{landmark}-{section_id}", raw_html)
+                    if section and section.content.text.strip():
+                        yield section
+                        section_id += 1
+                        processed_elements.add(raw_html)
+        
+        # Stage 2: Extract heading-based sections
+        for heading in self.soup.find_all(SECTION_HEADING_TAGS):
+            key = self._serialize(heading)
+            if key not in processed_elements:
+                section = self._extract_heading_section(heading, f"section-{section_id}")
                 if section and section.content.text.strip():
-                    sections.append(section)
+                    yield section
                     section_id += 1
-                    processed_elements.add(element)
-    
-    # Stage 2: Extract heading-based sections
-    for heading in soup.find_all(["h1", "h2", "h3", "h4"]):
-        if heading not in processed_elements:
-            section = _extract_heading_section(
-                heading, base_url, f"section-{section_id}"
-            )
-            if section and section.content.text.strip():
-                sections.append(section)
-                section_id += 1
-                processed_elements.add(heading)
-    
-    # Stage 3: Extract remaining significant blocks
-    for div in soup.find_all("div", class_=True):
-        if div not in processed_elements:
+                    processed_elements.add(key)
+        
+        # Stage 3: Extract remaining significant blocks
+        for div in self._find_all(self.soup, ["div"]):
+            if div.get("class") is None:
+                continue
             # Check if div looks like a section (has significant content)
-            text_len = len(div.get_text(strip=True))
-            if text_len > 200:  # Significant content
-                section = _extract_section_from_element(
-                    div, base_url, f"block-{section_id}"
-                )
-                if section and section.content.text.strip():
-                    sections.append(section)
-                    section_id += 1
-                    processed_elements.add(div)
-    
-    # Deduplicate similar sections
-    sections = _deduplicate_sections(sections)
-    
-    # Assign types
-    for section in sections:
-        section.type = _detect_section_type(section)
-    
-    return sections
-
-
-def _extract_section_from_element(element: Tag, base_url: str, section_id: str) -> Optional[Section]:
-    """Extract a section from a DOM element"""
-    if not element or not element.name:
-        return None
-    
-    # Extract heading
-    heading_elem = element.find(["h1", "h2", "h3", "h4", "h5", "h6"])
-    heading_text = heading_elem.get_text(strip=True) if heading_elem else ""
-    
-    # Extract all text
-    text = element.get_text(strip=True)
-    if len(text) > 10000:
-        text = text[:10000]  # Truncate very long text
-    
-    # Extract headings
-    headings = []
-    for h in element.find_all(["h1", "h2", "h3", "h4", "h5", "h6"]):
-        h_text = h.get_text(strip=True)
-        if h_text:
-            headings.append(h_text)
-    
-    # Extract links
-    links = []
-    for a in element.find_all("a", href=True):
-        href = a.get("href", "")
-        if href:
-            # Make absolute URL
-            href = urljoin(base_url, href)
-            if href.startswith(("http://", "https://")):
-                link_text = a.get_text(strip=True) or href
-                links.append(ContentLink(text=link_text, href=href))
-    
-    # Extract images
-    images = []
-    for img in element.find_all("img"):
-        src = img.get("src", "")
-        if src:
-            src = urljoin(base_url, src)
-            alt = img.get("alt", "")
-            images.append(ContentImage(src=src, alt=alt))
-    
-    # Extract lists
-    lists = []
-    for ul_ol in element.find_all(["ul", "ol"]):
-        items = []
-        for li in ul_ol.find_all("li", recursive=False):
-            item_text = li.get_text(strip=True)
-            if item_text:
-                items.append(item_text)
-        if items:
-            lists.append(items)
-    
-    # Extract tables
-    tables = []
-    for table in element.find_all("table"):
-        rows = []
-        for tr in table.find_all("tr"):
-            row = []
-            for td in tr.find_all(["td", "th"]):
-                row.append(td.get_text(strip=True))
-            if row:
-                rows.append(row)
-        if rows:
-            tables.append(rows)
-    
-    # Generate label
-    label = heading_text or _generate_label_from_text(text)
-    if not label:
-        label = element.name.title()
-    
-    # Get raw HTML
-    raw_html = str(element)[:MAX_RAW_HTML_LENGTH]
-    truncated = len(str(element)) > MAX_RAW_HTML_LENGTH
-    
-    return Section(
-        id=section_id,
-        type="unknown",  # Will be assigned later
-        label=label,
-        sourceUrl=base_url,
-        content=ContentData(
-            headings=headings,
-            text=text,
-            links=links,
-            images=images,
-            lists=lists,
-            tables=tables
-        ),
-        rawHtml=raw_html,
-        truncated=truncated
-    )
-
-
-def _extract_heading_section(heading: Tag, base_url: str, section_id: str) -> Optional[Section]:
-    """Extract a section starting from a heading"""
-    heading_text = heading.get_text(strip=True)
-    
-    # Collect sibling content until next heading
-    content_elements = []
-    current = heading.next_sibling
-    
-    while current:
-        if isinstance(current, NavigableString):
-            if str(current).strip():
+            if self.index.text_len(div) > 200:  # Significant content
+                raw_html = self._serialize(div)
+                if raw_html not in processed_elements:
+                    section = self._extract_section([div], f"block-{section_id}", raw_html)
+                    if section and section.content.text.strip():
+                        yield section
+                        section_id += 1
+                        processed_elements.add(raw_html)
+    
+    def _build_index(self) -> NodeIndex:
+        """Text length, link and image counts of every tag, bottom-up"""
+        index = NodeIndex(key=id)
+        stats = index._stats
+        tags = [self.soup] + list(self.soup.find_all(True))
+        
+        # Reverse document order visits children before their parents
+        for tag in reversed(tags):
+            text_len = links = images = 0
+            for child in tag.contents:
+                if isinstance(child, Tag):
+                    child_stats = stats[id(child)]
+                    text_len += child_stats[0]
+                    links += child_stats[1]
+                    images += child_stats[2]
+                elif type(child) in TEXT_STRING_TYPES:
+                    text_len += len(child.strip())
+            if tag.name == "a" and tag.get("href"):
+                links += 1
+            elif tag.name == "img":
+                images += 1
+            stats[id(tag)] = [text_len, links, images]
+        
+        return index
+    
+    def _extract_heading_section(self, heading: Tag, section_id: str) -> Optional[Section]:
+        """Extract a section from a heading and its following siblings"""
+        # Collect sibling content until next heading
+        content_elements = []
+        current = heading.next_sibling
+        
+        while current:
+            if isinstance(current, NavigableString):
+                if str(current).strip():
+                    content_elements.append(current)
+            elif isinstance(current, Tag):
+                # Stop at next heading
+                if current.name in HEADING_TAGS:
+                    break
                 content_elements.append(current)
-        elif isinstance(current, Tag):
-            # Stop at next heading
-            if current.name in ["h1", "h2", "h3", "h4", "h5", "h6"]:
+            
+            current = current.next_sibling
+            
+            if len(content_elements) > 20:  # Limit elements per section
                 break
-            content_elements.append(current)
         
-        current = current.next_sibling
+        # Strings between the elements stay behind, as they would if the
+        # elements were moved into a container
+        items = [heading] + [elem for elem in content_elements if isinstance(elem, Tag)]
         
-        if len(content_elements) > 20:  # Limit elements per section
-            break
-    
-    # Create temporary container
-    container = BeautifulSoup("", "lxml").new_tag("div")
-    container.append(heading)
-    for elem in content_elements:
-        if isinstance(elem, Tag):
-            container.append(elem)
+        section = None
+        if sum(self.index.text_len(item) for item in items):
+            raw_html = "<div>" + "".join(self._serialize(item) for item in items) + "</div>"
+            section = self._extract_section(items, section_id, raw_html, container=True)
+        
+        for item in items:
+            self._claim(item)
+        
+        return section
+    
+    def _extract_section(
+        self,
+        roots: List[Tag],
+        section_id: str,
+        raw_html: str,
+        container: bool = False
+    ) -> Optional[Section]:
+        """
+        Extract a section from an element, or from the children of a
+        virtual container (heading sections)
+        """
+        found = self._collect(roots, container)
+        found_headings = found["h"]
+        
+        # Extract heading
+        heading_elem = found_headings[0] if found_headings else None
+        heading_text = self._text(heading_elem) if heading_elem is not None else ""
+        
+        # Extract all text
+        # A container reads the text of its children as a plain div would
+        types = TEXT_STRING_TYPES if container else None
+        text = "".join(self._text(root, types) for root in roots)
+        if len(text) > 10000:
+            text = text[:10000]  # Truncate very long text
+        
+        # Extract headings
+        headings = []
+        for h in found_headings:
+            h_text = self._text(h)
+            if h_text:
+                headings.append(h_text)
+        
+        # Extract links
+        links = []
+        if sum(self.index.links(root) for root in roots):
+            for a in found["a"]:
+                href = a.get("href", "")
+                if href:
+                    # Make absolute URL
+                    href = urljoin(self.base_url, href)
+                    if href.startswith(("http://", "https://")):
+                        link_text = self._text(a) or href
+                        links.append(ContentLink(text=link_text, href=href))
+        
+        # Extract images
+        images = []
+        if sum(self.index.images(root) for root in roots):
+            for img in found["img"]:
+                src = img.get("src", "")
+                if src:
+                    src = urljoin(self.base_url, src)
+                    alt = img.get("alt", "")
+                    images.append(ContentImage(src=src, alt=alt))
+        
+        # Extract lists
+        lists = []
+        for ul_ol in found["list"]:
+            items = []
+            for li in ul_ol.find_all("li", recursive=False):
+                if id(li) in self.claimed:
+                    continue
+                item_text = self._text(li)
+                if item_text:
+                    items.append(item_text)
+            if items:
+                lists.append(items)
+        
+        # Extract tables
+        tables = []
+        for table in found["table"]:
+            rows = []
+            for tr in self._find_all(table, ["tr"]):
+                row = []
+                for td in self._find_all(tr, ["td", "th"]):
+                    row.append(self._text(td))
+                if row:
+                    rows.append(row)
+            if rows:
+                tables.append(rows)
+        
+        # Generate label
+        label = heading_text or _generate_label_from_text(text)
+        if not label:
+            label = "Div" if container else roots[0].name.title()
+        
+        return Section(
+            id=section_id,
+            type="unknown",  # Will be assigned later
+            label=label,
+            sourceUrl=self.base_url,
+            content=ContentData(
+                headings=headings,
+                text=text,
+                links=links,
+                images=images,
+                lists=lists,
+                tables=tables
+            ),
+            rawHtml=raw_html[:MAX_RAW_HTML_LENGTH],
+            truncated=len(raw_html) > MAX_RAW_HTML_LENGTH
+        )
+    
+    def _claim(self, tag: Tag) -> None:
+        """Treat a tag as moved out of the document"""
+        if id(tag) in self.claimed:
+            return
+        self.index.detach(tag, tag.parents, lambda ancestor: id(ancestor) in self.claimed)
+        self.claimed.add(id(tag))
+        self.claimed_ancestors.update(id(parent) for parent in tag.parents)
+    
+    def _collect(self, roots: List[Tag], include_self: bool = False) -> Dict[str, List[Tag]]:
+        """Headings, links, images, lists and tables below the roots, in one pass"""
+        found = {kind: [] for kind in ("h", "a", "img", "list", "table")}
+        for root in roots:
+            tags = self._iter_attached(root)
+            if include_self:
+                tags = itertools.chain([root], tags)
+            for tag in tags:
+                name = tag.name
+                if name in HEADING_TAGS:
+                    found["h"].append(tag)
+                elif name == "a":
+                    found["a"].append(tag)
+                elif name == "img":
+                    found["img"].append(tag)
+                elif name in ("ul", "ol"):
+                    found["list"].append(tag)
+                elif name == "table":
+                    found["table"].append(tag)
+        return found
+    
+    def _find_all(self, tag: Tag, names: List[str]) -> List[Tag]:
+        """Matching descendants in document order, skipping claimed subtrees"""
+        return [child for child in self._iter_attached(tag) if child.name in names]
+    
+    def _iter_attached(self, tag: Tag) -> Iterator[Tag]:
+        """Descendant tags in document order, skipping claimed subtrees"""
+        if id(tag) not in self.claimed_ancestors:
+            # Fast path: nothing below has been claimed
+            for child in tag.descendants:
+                if isinstance(child, Tag):
+                    yield child
+            return
+        for child in tag.contents:
+            if isinstance(child, Tag) and id(child) not in self.claimed:
+                yield child
+                yield from self._iter_attached(child)
+    
+    def _text(self, tag: Tag, types: Optional[tuple] = None) -> str:
+        """Like get_text(strip=True), leaving out claimed subtrees"""
+        types = types or tuple(tag.interesting_string_types or TEXT_STRING_TYPES)
+        if id(tag) not in self.claimed_ancestors:
+            return tag.get_text(strip=True, types=types)
+        return "".join(self._iter_strings(tag, types))
+    
+    def _iter_strings(self, tag: Tag, types) -> Iterator[str]:
+        for child in tag.contents:
+            if isinstance(child, Tag):
+                if id(child) not in self.claimed:
+                    yield from self._iter_strings(child, types)
+            elif type(child) in types:
+                stripped = child.strip()
+                if stripped:
+                    yield stripped
+    
+    def _serialize(self, tag: Tag) -> str:
+        """Tag HTML without claimed descendants"""
+        if id(tag) not in self.claimed_ancestors:
+            return str(tag)
+        
+        shell = str(self.soup.new_tag(tag.name, tag.namespace, tag.prefix, attrs=dict(tag.attrs)))
+        close_at = shell.rfind("</")
+        parts = [shell[:close_at]]
+        for child in tag.contents:
+            if isinstance(child, Tag):
+                if id(child) not in self.claimed:
+                    parts.append(self._serialize(child))
+            else:
+                parts.append(child.output_ready())
+        parts.append(shell[close_at:])
+        return "".join(parts)
+
+
+def merge_sections(sections: List[Section], extra: List[Section]) -> List[Section]:
+    """
+    Append sections parsed from another snapshot of the page
+    Drops sections already present and renumbers ids so they stay unique
+    """
+    merger = SectionMerger(sections)
+    merged = list(sections)
+    for section in extra:
+        section = merger.add(section)
+        if section is not None:
+            merged.append(section)
+    return merged
+
+
+class SectionMerger:
+    """
+    Incremental merge_sections, for sections that arrive one at a time
+    (streamed scrapes)
+    """
     
-    return _extract_section_from_element(container, base_url, section_id)
+    def __init__(self, sections: Iterable[Section] = ()):
+        self.seen_text = set()
+        self.next_id = 0
+        for section in sections:
+            self.add_base(section)
+    
+    def add_base(self, section: Section) -> None:
+        """Record a section of the first snapshot, kept as is"""
+        self.seen_text.add(_section_key(section))
+        self.next_id = max(self.next_id, _section_number(section) + 1)
+    
+    def add(self, section: Section) -> Optional[Section]:
+        """
+        Renumbered copy of a section of a later snapshot (the section
+        itself may be cached with its document and is left as is)
+        Returns None if the section is already present and must be dropped
+        """
+        key = _section_key(section)
+        if key in self.seen_text:
+            return None
+        prefix = section.id.rsplit("-", 1)[0]
+        section = section.model_copy(update={"id": f"{prefix}-{self.next_id}"})
+        self.seen_text.add(key)
+        self.next_id += 1
+        return section
 
 
 def _generate_label_from_text(text: str, max_words: int = 7) -> str:
@@ -224,20 +505,29 @@ def _generate_label_from_text(text: str, max_words: int = 7) -> str:
     return label
 
 
-def _deduplicate_sections(sections: List[Section]) -> List[Section]:
-    """Remove duplicate or highly overlapping sections"""
-    unique = []
+def _finalize_sections(candidates: Iterable[Section]) -> Iterator[Section]:
+    """Drop duplicate or highly overlapping sections and assign types, as they arrive"""
     seen_text = set()
     
-    for section in sections:
+    for section in candidates:
         # Create hash of content
-        content_hash = hash(section.content.text[:200])
+        content_hash = _section_key(section)
         
         if content_hash not in seen_text:
-            unique.append(section)
             seen_text.add(content_hash)
-    
-    return unique
+            section.type = _detect_section_type(section)
+            yield section
+
+
+def _section_number(section: Section) -> int:
+    """Numeric suffix of a section id ("hero-3" -> 3)"""
+    suffix = section.id.rsplit("-", 1)[-1]
+    return int(suffix) if suffix.isdigit() else -1
+
+
+def _section_key(section: Section) -> int:
+    """Key used to recognise duplicate sections"""
+    return hash(section.content.text[:200])
 
 
 def _detect_section_type(section: Section) -> str:
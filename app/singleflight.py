@@ -0,0 +1,103 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Optional
+
+from app.limiter import ScrapeLimiter
+from app.models import ScraperResult, StrategyMode
+from app.scraper import WebScraper
+from app.utils import normalize_url
+
+logger = logging.getLogger(__name__)
+
+
+class _Flight:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls into one
+
+    The first caller for a key starts the work; callers arriving while it
+    is in flight wait for the same result instead of starting their own.
+    The work is cancelled only when every waiting caller has gone.
+    """
+
+    def __init__(self):
+        self._flights: Dict[str, _Flight] = {}
+        self.hits = 0  # Calls that joined a flight in progress
+        self.misses = 0  # Calls that started a flight
+
+    async def run(self, key: str, work: Callable[[], Awaitable]):
+        flight = self._flights.get(key)
+        if flight is None:
+            self.misses += 1
+            flight = _Flight(asyncio.create_task(work()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+        else:
+            self.hits += 1
+            logger.info(f"[FLIGHT] Joining in-flight scrape for {key}")
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "inFlight": len(self._flights)}
+
+    def _forget(self, key: str, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+
+# Shared by /scrape and /scrape/batch
+scrape_flights = SingleFlight()
+
+
+async def coalesced_scrape(
+    url: str,
+    strategy: StrategyMode = "auto",
+    limiter: Optional[ScrapeLimiter] = None,
+    flights: Optional[SingleFlight] = None,
+    timings: bool = False
+) -> ScraperResult:
+    """
+    WebScraper.scrape, shared with identical scrapes already in flight
+    The shared scrape always collects timings; they are kept only for
+    callers that asked for them. It runs under the limiter of the caller
+    that started it: callers joining it add no work, so they take no
+    slots of their own limiter.
+    """
+    flights = flights or scrape_flights
+    key = f"{strategy} {normalize_url(url)}"
+    result = await flights.run(
+        key, lambda: WebScraper(limiter=limiter, collect_timings=True).scrape(url, strategy=strategy)
+    )
+    return _result_for(result, url, timings)
+
+
+def _result_for(result: ScraperResult, url: str, timings: bool) -> ScraperResult:
+    """
+    A caller's own copy of a shared result, reporting its own input URL
+    wherever the result carries the URL of the caller that started the
+    scrape (a variant with the same normalized form)
+    """
+    copy = result.model_copy(deep=True)
+    shared_url, copy.url = copy.url, url
+    if shared_url != url:
+        for section in copy.sections:
+            if section.sourceUrl == shared_url:
+                section.sourceUrl = url
+        copy.interactions.pages = [url if page == shared_url else page for page in copy.interactions.pages]
+    if not timings:
+        copy.timings = None
+    return copy
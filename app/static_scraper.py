@@ -1,41 +1,142 @@
 
+import codecs
 import logging
-from typing import Optional
+import os
+from typing import List, Optional, Tuple
 import httpx
 
+from app.fetch_cache import FetchCache, fetch_cache
+from app.http_client import HttpClientPool, http_client, timing_trace
+from app.incremental import IncrementalAnalysis
+from app.metrics import fetched_bytes_total
+from app.models import FetchTimings, ScraperError
+
 logger = logging.getLogger(__name__)
 
+# Configuration
+STATIC_MAX_BYTES = int(os.getenv("STATIC_MAX_BYTES", str(5 * 1024 * 1024)))  # Decoded body bytes read per page
+STATIC_CONTENT_TYPES = [
+    value.strip().lower()
+    for value in os.getenv(
+        "STATIC_CONTENT_TYPES", "text/html,application/xhtml+xml,application/xml,text/xml,text/plain"
+    ).split(",")
+    if value.strip()
+]
+
+
+class UnsupportedContentType(Exception):
+    """The response is not a document the parsers can read (image, PDF, ...)"""
+
 
 class StaticScraper:
     """Fetch and parse static HTML"""
     
-    def __init__(self, timeout: int = 10):
+    def __init__(
+        self,
+        timeout: int = 10,
+        client: Optional[HttpClientPool] = None,
+        cache: Optional[FetchCache] = None,
+        max_bytes: int = STATIC_MAX_BYTES
+    ):
         self.timeout = timeout
-        self.user_agent = (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            " (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        )
+        # Bodies are streamed and cut off at max_bytes, never buffered whole
+        self.max_bytes = max_bytes
+        # Connections are reused through the shared client, never opened per fetch
+        self.client = client or http_client
+        self.cache = cache or fetch_cache
     
-    async def fetch(self, url: str) -> Optional[str]:
-        """Fetch HTML from URL"""
+    async def fetch(
+        self,
+        url: str,
+        timings: Optional[FetchTimings] = None,
+        errors: Optional[List[ScraperError]] = None,
+        analysis: Optional[IncrementalAnalysis] = None
+    ) -> Optional[str]:
+        """
+        Fetch HTML from URL
+        Fresh cached bodies are returned as is; stale ones are revalidated
+        with a conditional GET. The body is streamed: non-HTML responses
+        are rejected from their Content-Type before it is read, and at most
+        max_bytes are read, the rest dropped (a truncation is appended to
+        errors, if given). Downloaded chunks are fed to analysis, if
+        given, as they are decoded. timings, if given, receives the
+        connect/TLS/TTFB/download split of the request
+        """
         try:
-            async with httpx.AsyncClient(
-                timeout=self.timeout,
-                follow_redirects=True
-            ) as client:
-                response = await client.get(
-                    url,
-                    headers={"User-Agent": self.user_agent}
-                )
+            cached = await self.cache.get_response("static", url)
+            if cached and cached.fresh:
+                logger.info(f"[CACHE] Fresh static copy of {url}")
+                if timings is not None:
+                    timings.cached = True
+                return cached.body
+            
+            headers = cached.conditional_headers() if cached else {}
+            extensions = {"trace": timing_trace(timings)} if timings is not None else None
+            async with self.client.stream(url, timeout=self.timeout, headers=headers, extensions=extensions) as response:
+                if response.status_code == 304 and cached:
+                    logger.info(f"[CACHE] Not modified: {url}")
+                    await self.cache.revalidated("static", cached, response.headers)
+                    return cached.body
+                
                 response.raise_for_status()
-                return response.text
+                content_type = response.headers.get("content-type", "").split(";")[0].strip().lower()
+                if content_type and content_type not in STATIC_CONTENT_TYPES:
+                    raise UnsupportedContentType(f"Unsupported content type {content_type}")
+                html, size, truncated = await self._read_text(response, analysis)
+            
+            fetched_bytes_total.inc(size, source="static")
+            if truncated:
+                logger.warning(f"[STATIC] {url} exceeds {self.max_bytes} bytes, truncated")
+                if errors is not None:
+                    errors.append(ScraperError(
+                        message=f"Response body truncated at {self.max_bytes} bytes",
+                        phase="fetch"
+                    ))
+            else:
+                # A cut-off body would be served later without the truncation error
+                await self.cache.put_response("static", url, html, response.headers)
+            return html
         
         except httpx.HTTPStatusError as e:
-            logger.error(f"HTTP error {e.status_code}: {url}")
+            logger.error(f"HTTP error {e.response.status_code}: {url}")
             raise
         except httpx.TimeoutException:
             logger.error(f"Timeout fetching {url}")
             raise
         except Exception as e:
             logger.error(f"Error fetching {url}: {e}")
-            raise
\ No newline at end of file
+            raise
+    
+    async def _read_text(
+        self,
+        response: httpx.Response,
+        analysis: Optional[IncrementalAnalysis] = None
+    ) -> Tuple[str, int, bool]:
+        """
+        Decode the body chunk by chunk, stopping at max_bytes
+        Returns the text, the bytes read and whether the body was cut off.
+        Decoding matches response.text (charset or UTF-8, errors replaced);
+        each decoded chunk is also fed to analysis
+        """
+        decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+        parts = []
+        size = 0
+        async for chunk in response.aiter_bytes():
+            remaining = self.max_bytes - size
+            if len(chunk) > remaining:
+                # A partial character at the cut is dropped, not replaced
+                parts.append(decoder.decode(chunk[:remaining]))
+                truncated = True
+                size += remaining
+                break
+            size += len(chunk)
+            parts.append(decoder.decode(chunk))
+            if analysis is not None:
+                analysis.feed(parts[-1])
+        else:
+            parts.append(decoder.decode(b"", final=True))
+            truncated = False
+        if analysis is not None:
+            analysis.feed(parts[-1])
+            analysis.close()
+        return "".join(parts), size, truncated
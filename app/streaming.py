@@ -0,0 +1,70 @@
+import json
+import logging
+from typing import AsyncIterator, List, Literal, Optional
+
+from fastapi.responses import StreamingResponse
+
+from app.batch import iter_batch
+from app.crawler import SiteCrawler
+from app.limiter import ScrapeLimiter
+from app.models import ScrapeEvent, StrategyMode
+from app.scraper import WebScraper
+
+logger = logging.getLogger(__name__)
+
+StreamFormat = Literal["ndjson", "sse"]
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "sse": "text/event-stream"}
+
+
+def encode_event(event: ScrapeEvent, fmt: StreamFormat) -> str:
+    """Serialize one event as an NDJSON line or a server-sent event"""
+    data = event.data
+    if hasattr(data, "model_dump"):
+        # A scrape's final result omits the sections already streamed
+        data = data.model_dump(exclude={"sections"} if event.event == "done" else None)
+    if fmt == "sse":
+        return f"event: {event.event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+    return json.dumps({"event": event.event, "data": data}, ensure_ascii=False) + "\n"
+
+
+async def stream_scrape(
+    url: str,
+    strategy: StrategyMode,
+    fmt: StreamFormat,
+    timings: bool = False
+) -> AsyncIterator[str]:
+    """Encoded events of a single scrape"""
+    scraper = WebScraper(collect_timings=timings)
+    async for event in scraper.iter_scrape(url, strategy=strategy):
+        yield encode_event(event, fmt)
+
+
+async def stream_batch(
+    urls: List[str],
+    strategy: StrategyMode,
+    fmt: StreamFormat,
+    limiter: Optional[ScrapeLimiter] = None
+) -> AsyncIterator[str]:
+    """Encoded batch items, each emitted as soon as its URL completes"""
+    async for position, item in iter_batch(urls, strategy, limiter):
+        data = {"index": position, **item.model_dump()}
+        yield encode_event(ScrapeEvent(event="item", data=data), fmt)
+    yield encode_event(ScrapeEvent(event="done", data={"count": len(urls)}), fmt)
+
+
+async def stream_crawl(crawler: SiteCrawler, fmt: StreamFormat) -> AsyncIterator[str]:
+    """Encoded crawl items, each emitted as soon as its page is scraped"""
+    count = 0
+    async for item in crawler.crawl():
+        count += 1
+        yield encode_event(ScrapeEvent(event="item", data=item.model_dump()), fmt)
+    yield encode_event(ScrapeEvent(event="done", data={"count": count}), fmt)
+
+
+def streaming_response(events: AsyncIterator[str], fmt: StreamFormat) -> StreamingResponse:
+    return StreamingResponse(
+        events,
+        media_type=MEDIA_TYPES[fmt],
+        # Keep proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,6 +1,6 @@
 
 import logging
-from urllib.parse import urljoin, urlparse
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlsplit, urlunsplit
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +17,33 @@ def make_absolute_url(url: str, base_url: str) -> str:
     return urljoin(base_url, url)
 
 
+def normalize_url(url: str) -> str:
+    """
+    Canonical form of a URL for deduplication
+    Lowercases scheme and host, drops default ports and the fragment,
+    and sorts query parameters
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if ":" in host:
+        host = f"[{host}]"  # IPv6 literal
+    try:
+        port = parts.port
+    except ValueError:
+        # Malformed port: keep the authority as given
+        host = parts.netloc.lower()
+    else:
+        if port and not (scheme == "http" and port == 80) and not (scheme == "https" and port == 443):
+            host = f"{host}:{port}"
+        if parts.username:
+            userinfo = parts.username + (f":{parts.password}" if parts.password else "")
+            host = f"{userinfo}@{host}"
+    path = parts.path or "/"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, path, query, ""))
+
+
 def same_domain(url1: str, url2: str) -> bool:
     """Check if two URLs are from same domain"""
     domain1 = urlparse(url1).netloc
@@ -0,0 +1,249 @@
+"""
+Offline fixture site for scripts/benchmark.py
+
+Serves the recorded pages in scripts/parity_corpus plus generated pages
+covering every scraping path: small static articles, a huge listing,
+SPA shells that only render with JS, and pages with tabs, load-more,
+pagination and infinite scroll. Pages are generated deterministically
+and never reference anything outside the site, so benchmarks run with
+no network access.
+
+Usage (standalone, to browse the fixtures):
+    python scripts/bench_site.py [PORT]
+"""
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+RECORDED_DIR = Path(__file__).resolve().parent / "parity_corpus"
+
+LOREM = (
+    "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor "
+    "incididunt ut labore et dolore magna aliqua. Ut enim ad minim veniam, quis nostrud "
+    "exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat. "
+)
+
+SMALL_PAGES = 20
+LISTING_ITEMS = 5000
+PAGINATED_PAGES = 8
+SPA_PAGES = 5
+
+
+def _page(title: str, body: str, head: str = "") -> str:
+    return (
+        f"<!DOCTYPE html><html lang=\"en\"><head><meta charset=\"utf-8\"><title>{title}</title>"
+        f"<meta name=\"description\" content=\"{title} fixture\">{head}</head>"
+        f"<body><header><nav><a href=\"/\">Home</a> <a href=\"/static/small-0\">Articles</a></nav></header>"
+        f"{body}<footer><p>Fixture site</p></footer></body></html>"
+    )
+
+
+def small_page(n: int) -> str:
+    sections = "".join(
+        f"<section><h2>Part {i}</h2><p>{LOREM * 2}</p>"
+        f"<ul><li><a href=\"/static/small-{(n + i) % SMALL_PAGES}\">Related {i}</a></li></ul></section>"
+        for i in range(4)
+    )
+    return _page(f"Article {n}", f"<main><article><h1>Article {n}</h1>{sections}</article></main>")
+
+
+def huge_listing() -> str:
+    items = "".join(
+        f"<li class=\"item\"><h3>Product {i}</h3><p>{LOREM[: 60 + i % 80]}</p>"
+        f"<a href=\"/static/small-{i % SMALL_PAGES}\">Details</a>"
+        f"<img src=\"/img/{i}.png\" alt=\"Product {i}\"></li>"
+        for i in range(LISTING_ITEMS)
+    )
+    table = "".join(f"<tr><td>{i}</td><td>{i * 3}</td></tr>" for i in range(300))
+    return _page(
+        "Huge listing",
+        f"<main><h1>Catalogue</h1><ul class=\"grid\">{items}</ul>"
+        f"<section><h2>Stock</h2><table><tr><th>Id</th><th>Qty</th></tr>{table}</table></section></main>"
+    )
+
+
+def paginated_page(n: int) -> str:
+    items = "".join(f"<li><h3>Entry {n}-{i}</h3><p>{LOREM}</p></li>" for i in range(10))
+    numbers = "".join(f"<a href=\"/listing?page={i}\">{i}</a>" for i in range(1, PAGINATED_PAGES + 1))
+    next_link = f"<a rel=\"next\" href=\"/listing?page={n + 1}\">Next</a>" if n < PAGINATED_PAGES else ""
+    return _page(
+        f"Listing page {n}",
+        f"<main><h1>Listing page {n}</h1><ul>{items}</ul>"
+        f"<nav class=\"pagination\">{numbers}{next_link}</nav></main>"
+    )
+
+
+def spa_shell(n: int) -> str:
+    script = f"""
+    <script>
+    document.addEventListener("DOMContentLoaded", function () {{
+      setTimeout(function () {{
+        var root = document.getElementById("root");
+        var html = "<main><h1>App view {n}</h1>";
+        for (var i = 0; i < 6; i++) {{
+          html += "<section><h2>Panel " + i + "</h2><p>{LOREM * 2}</p></section>";
+        }}
+        root.innerHTML = html + "</main>";
+      }}, 150);
+    }});
+    </script>"""
+    return (
+        f"<!DOCTYPE html><html lang=\"en\"><head><title>App {n}</title>{script}</head>"
+        f"<body><div id=\"root\">Loading...</div></body></html>"
+    )
+
+
+def tabs_page() -> str:
+    tabs = "".join(
+        f"<button role=\"tab\" aria-selected=\"{'true' if i == 0 else 'false'}\" data-panel=\"{i}\">Tab {i}</button>"
+        for i in range(4)
+    )
+    script = """
+    <script>
+    document.addEventListener("click", function (event) {
+      var tab = event.target.closest("[role=tab]");
+      if (!tab) return;
+      var panel = document.getElementById("panel");
+      setTimeout(function () {
+        panel.innerHTML = "<h2>Panel " + tab.dataset.panel + "</h2><p>Content of tab " +
+          tab.dataset.panel + ". " + "%s" + "</p>";
+      }, 100);
+    });
+    </script>""" % LOREM
+    return _page(
+        "Tabs",
+        f"<main><h1>Tabbed content</h1><div role=\"tablist\">{tabs}</div>"
+        f"<section id=\"panel\"><h2>Panel 0</h2><p>Content of tab 0. {LOREM}</p></section></main>",
+        head=script
+    )
+
+
+def load_more_page() -> str:
+    items = "".join(f"<li>Item {i}: {LOREM}</li>" for i in range(10))
+    script = """
+    <script>
+    var loaded = 10;
+    function loadMore() {
+      setTimeout(function () {
+        var list = document.getElementById("items");
+        for (var i = 0; i < 10; i++) {
+          var li = document.createElement("li");
+          li.textContent = "Item " + (loaded + i) + ": %s";
+          list.appendChild(li);
+        }
+        loaded += 10;
+        if (loaded >= 40) document.getElementById("more").remove();
+      }, 100);
+    }
+    </script>""" % LOREM
+    return _page(
+        "Load more",
+        f"<main><h1>Feed</h1><ul id=\"items\">{items}</ul>"
+        f"<button id=\"more\" data-action=\"load-more\" onclick=\"loadMore()\">Load More</button></main>",
+        head=script
+    )
+
+
+def infinite_scroll_page() -> str:
+    items = "".join(f"<div class=\"card\"><h3>Card {i}</h3><p>{LOREM}</p></div>" for i in range(15))
+    script = """
+    <script>
+    var batches = 0;
+    window.addEventListener("scroll", function () {
+      if (batches >= 3 || window.innerHeight + window.scrollY < document.body.scrollHeight - 10) return;
+      batches += 1;
+      setTimeout(function () {
+        var feed = document.getElementById("feed");
+        for (var i = 0; i < 10; i++) {
+          var card = document.createElement("div");
+          card.className = "card";
+          card.innerHTML = "<h3>Card " + (batches * 100 + i) + "</h3><p>%s</p>";
+          feed.appendChild(card);
+        }
+      }, 100);
+    });
+    </script>""" % LOREM
+    return _page(
+        "Infinite scroll",
+        f"<main><h1>Stream</h1><div id=\"feed\" data-infinite-scroll>{items}</div></main>",
+        head=script
+    )
+
+
+def recorded_pages() -> Dict[str, str]:
+    return {
+        path.stem: path.read_text(encoding="utf-8", errors="replace")
+        for path in sorted(RECORDED_DIR.glob("*.html"))
+    }
+
+
+class FixtureSite:
+    """The fixture pages, generated once, grouped by the path that should scrape them"""
+
+    def __init__(self):
+        self.pages: Dict[str, str] = {}
+        for name, html in recorded_pages().items():
+            self.pages[f"/recorded/{name}"] = html
+        for n in range(SMALL_PAGES):
+            self.pages[f"/static/small-{n}"] = small_page(n)
+        self.pages["/static/listing-huge"] = huge_listing()
+        for n in range(1, PAGINATED_PAGES + 1):
+            self.pages[f"/listing?page={n}"] = paginated_page(n)
+        for n in range(SPA_PAGES):
+            self.pages[f"/spa/app-{n}"] = spa_shell(n)
+        self.pages["/interactive/tabs"] = tabs_page()
+        self.pages["/interactive/load-more"] = load_more_page()
+        self.pages["/interactive/scroll"] = infinite_scroll_page()
+
+    def paths(self, prefix: str) -> List[str]:
+        return [path for path in self.pages if path.startswith(prefix)]
+
+    def get(self, path: str) -> Optional[str]:
+        parts = urlsplit(path)
+        if parts.path == "/listing":
+            page = parse_qs(parts.query).get("page", ["1"])[0]
+            return self.pages.get(f"/listing?page={page}")
+        return self.pages.get(parts.path)
+
+
+def serve(site: FixtureSite, port: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """Serve the site from a background thread; returns the server and its base URL"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if self.path == "/robots.txt":
+                self._send(200, "User-agent: *\nAllow: /\n", "text/plain")
+                return
+            html = site.get(self.path)
+            if html is None:
+                self._send(404, "<html><body><h1>Not found</h1></body></html>", "text/html")
+            else:
+                self._send(200, html, "text/html; charset=utf-8")
+
+        def _send(self, status: int, text: str, content_type: str):
+            body = text.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+if __name__ == "__main__":
+    server, base_url = serve(FixtureSite(), int(sys.argv[1]) if len(sys.argv) > 1 else 8765)
+    print(f"Serving fixtures on {base_url} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,263 @@
+"""
+Offline benchmark of the scrape pipeline against a local fixture site
+
+Serves the fixtures of scripts/bench_site.py on localhost and runs one
+suite per path through the scraper:
+
+    parse   ParsedDocument on every fixture page, per analysis stage
+    static  WebScraper with strategy "static-only" over HTTP
+    js      WebScraper with strategy "auto" on SPA shells and pages with
+            tabs, load-more and infinite scroll (skipped when no browser
+            can be launched)
+
+Each suite reports throughput, p50/p95 latency, the mean time per phase
+and the peak RSS of the process so far. The fetch cache is disabled so
+every round does the full work. Results are compared with a baseline
+saved earlier on the same machine; a metric more than --tolerance worse
+than its baseline is a regression.
+
+Usage:
+    python scripts/benchmark.py [--suite parse,static,js] [--rounds N]
+        [--concurrency N] [--baseline PATH] [--save-baseline]
+        [--tolerance 0.2] [--json PATH]
+
+Exits with status 1 on a regression or a failed scrape.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import resource
+import sys
+import time
+import warnings
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bs4 import XMLParsedAsHTMLWarning  # noqa: E402
+
+from app.browser_pool import browser_pool  # noqa: E402
+from app.document import ANALYSIS_FIELDS, ParsedDocument  # noqa: E402
+from app.fetch_cache import FetchCache  # noqa: E402
+from app.http_client import http_client  # noqa: E402
+from app.parse_pool import parse_pool  # noqa: E402
+from app.scraper import WebScraper  # noqa: E402
+from bench_site import FixtureSite, serve  # noqa: E402
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "bench_baseline.json"
+SUITES = ("parse", "static", "js")
+BASE_URL = "https://bench.test/page"
+
+# Metric name -> True when a higher value is better
+COMPARED_METRICS = {
+    "throughput": True,
+    "p50Ms": False,
+    "p95Ms": False,
+    "peakRssMb": False,
+}
+
+warnings.filterwarnings("ignore", category=XMLParsedAsHTMLWarning)
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if platform.system() == "Darwin" else 1024), 1)
+
+
+def summarize(latencies: List[float], wall: float, phases: Dict[str, float], failures: int) -> dict:
+    """Suite report from per-request latencies (seconds) and summed phase times"""
+    count = len(latencies)
+    return {
+        "requests": count,
+        "failures": failures,
+        "wallSeconds": round(wall, 3),
+        "throughput": round(count / wall, 2) if wall else 0.0,
+        "p50Ms": round(percentile(latencies, 0.5) * 1000, 1),
+        "p95Ms": round(percentile(latencies, 0.95) * 1000, 1),
+        "phasesMs": {name: round(total * 1000 / max(1, count), 1) for name, total in sorted(phases.items())},
+        "peakRssMb": peak_rss_mb(),
+    }
+
+
+def bench_parse(site: FixtureSite, rounds: int) -> dict:
+    """Every analysis stage of ParsedDocument on every page, in-process"""
+    pages = [html for path, html in site.pages.items() if not path.startswith("/spa/")]
+    latencies: List[float] = []
+    phases: Dict[str, float] = {}
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for html in pages:
+            page_start = time.perf_counter()
+            document = ParsedDocument(html, BASE_URL)
+            # Only the engine's own tree; the other one is never built
+            tree = "soup" if document.engine == "bs4" else "tree"
+            stage_start = time.perf_counter()
+            getattr(document, tree)
+            phases[tree] = phases.get(tree, 0.0) + time.perf_counter() - stage_start
+            for name in ANALYSIS_FIELDS:
+                stage_start = time.perf_counter()
+                getattr(document, name)
+                phases[name] = phases.get(name, 0.0) + time.perf_counter() - stage_start
+            latencies.append(time.perf_counter() - page_start)
+    return summarize(latencies, time.perf_counter() - started, phases, failures=0)
+
+
+async def bench_scrapes(urls: List[str], strategy: str, rounds: int, concurrency: int) -> dict:
+    """Scrape every URL `rounds` times, `concurrency` at a time, with the cache off"""
+    cache = FetchCache(enabled=False, disk_dir=None)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    latencies: List[float] = []
+    phases: Dict[str, float] = {}
+    failures = 0
+
+    async def run(url: str) -> None:
+        nonlocal failures
+        async with semaphore:
+            scraper = WebScraper(cache=cache, paginate=False, collect_timings=True)
+            start = time.perf_counter()
+            result = await scraper.scrape(url, strategy=strategy)
+            latencies.append(time.perf_counter() - start)
+        if not result.sections:
+            failures += 1
+            print(f"  FAIL {url}: {[error.message for error in result.errors]}")
+        if result.timings is not None:
+            for name, ms in result.timings.stages.items():
+                phases[name] = phases.get(name, 0.0) + ms / 1000
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        await asyncio.gather(*(run(url) for url in urls))
+    return summarize(latencies, time.perf_counter() - started, phases, failures)
+
+
+async def bench_static(site: FixtureSite, base_url: str, rounds: int, concurrency: int) -> dict:
+    urls = [base_url + path for path in site.paths("/static/") + site.paths("/recorded/") + site.paths("/listing")]
+    return await bench_scrapes(urls, "static-only", rounds, concurrency)
+
+
+async def bench_js(site: FixtureSite, base_url: str, rounds: int, concurrency: int) -> Optional[dict]:
+    try:
+        await browser_pool.start()
+    except Exception as e:
+        print(f"js: skipped, no browser could be launched ({str(e).splitlines()[0]})")
+        return None
+    try:
+        urls = [base_url + path for path in site.paths("/spa/") + site.paths("/interactive/")]
+        return await bench_scrapes(urls, "auto", rounds, concurrency)
+    finally:
+        await browser_pool.stop()
+
+
+async def run_suites(suites: List[str], rounds: int, concurrency: int) -> Dict[str, dict]:
+    site = FixtureSite()
+    server, base_url = serve(site)
+    results: Dict[str, dict] = {}
+    await http_client.start()
+    await parse_pool.start()
+    try:
+        for suite in suites:
+            print(f"Running {suite} ({rounds} rounds)...")
+            if suite == "parse":
+                report = bench_parse(site, rounds)
+            elif suite == "static":
+                report = await bench_static(site, base_url, rounds, concurrency)
+            else:
+                report = await bench_js(site, base_url, rounds, concurrency)
+            if report is not None:
+                results[suite] = report
+    finally:
+        await parse_pool.stop()
+        await http_client.stop()
+        server.shutdown()
+    return results
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    """Metrics worse than their baseline by more than `tolerance`"""
+    regressions = []
+    for suite, report in results.items():
+        expected = baseline.get(suite)
+        if not expected:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = expected.get(metric), report.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = -change if higher_is_better else change
+            if worse > tolerance:
+                regressions.append(f"{suite}.{metric}: {old} -> {new} ({change:+.0%})")
+    return regressions
+
+
+def print_report(results: Dict[str, dict], baseline: Dict[str, dict]) -> None:
+    for suite, report in results.items():
+        expected = baseline.get(suite, {})
+        print(f"\n{suite}: {report['requests']} requests in {report['wallSeconds']}s, {report['failures']} failed")
+        for metric in COMPARED_METRICS:
+            note = f"  (baseline {expected[metric]})" if metric in expected else ""
+            print(f"  {metric:<11} {report[metric]}{note}")
+        phases = ", ".join(f"{name} {ms}" for name, ms in report["phasesMs"].items())
+        print(f"  phases ms   {phases}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--suite", default=",".join(SUITES), help="Comma-separated suites to run")
+    parser.add_argument("--rounds", type=int, default=3, help="Passes over the fixture pages")
+    parser.add_argument("--concurrency", type=int, default=4, help="Scrapes in flight at once")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative regression")
+    parser.add_argument("--json", type=Path, help="Also write the results to this file")
+    args = parser.parse_args()
+
+    suites = [suite.strip() for suite in args.suite.split(",") if suite.strip()]
+    unknown = [suite for suite in suites if suite not in SUITES]
+    if unknown:
+        parser.error(f"unknown suite(s): {', '.join(unknown)}")
+
+    # The pipeline logs every scrape; keep the report readable
+    logging.basicConfig(level=logging.WARNING)
+    results = asyncio.run(run_suites(suites, args.rounds, args.concurrency))
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    print_report(results, baseline)
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2) + "\n")
+
+    failed = sum(report["failures"] for report in results.values())
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps({**baseline, **results}, indent=2) + "\n")
+        print(f"\nBaseline saved to {args.baseline}")
+        return 1 if failed else 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    if not baseline:
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to create one")
+    elif regressions:
+        print(f"\nRegressions beyond {args.tolerance:.0%}:")
+        for line in regressions:
+            print(f"  {line}")
+    else:
+        print(f"\nNo regressions beyond {args.tolerance:.0%}")
+    return 1 if regressions or failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""
+Parity check between the BeautifulSoup and lxml extraction engines
+
+Parses every saved page with both engines and compares quality score,
+metadata, interaction signals and sections. rawHtml is only reported:
+the two libraries serialize markup differently (attribute order, void
+tags), so the snippets are not expected to match byte for byte.
+
+Usage:
+    python scripts/check_parser_parity.py [PAGE_OR_DIR ...]
+
+Defaults to scripts/parity_corpus. Exits with status 1 on any mismatch.
+"""
+import sys
+import time
+import warnings
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from bs4 import XMLParsedAsHTMLWarning  # noqa: E402
+
+from app.document import ParsedDocument  # noqa: E402
+
+DEFAULT_CORPUS = Path(__file__).resolve().parent / "parity_corpus"
+BASE_URL = "https://parity.test/page"
+
+warnings.filterwarnings("ignore", category=XMLParsedAsHTMLWarning)
+
+
+def analyze(html: str, engine: str) -> tuple[dict, float]:
+    """Run every ParsedDocument stage and return comparable results"""
+    start = time.perf_counter()
+    document = ParsedDocument(html, BASE_URL, engine=engine)
+    result = {
+        "quality_score": document.quality_score,
+        "metadata": document.metadata.model_dump(),
+        "interaction_signals": document.interaction_signals,
+        "sections": [section.model_dump() for section in document.sections],
+    }
+    return result, time.perf_counter() - start
+
+
+def compare(page: Path) -> bool:
+    html = page.read_text(encoding="utf-8", errors="replace")
+    expected, bs4_time = analyze(html, "bs4")
+    actual, lxml_time = analyze(html, "lxml")
+
+    mismatches = []
+    for key in ("quality_score", "metadata", "interaction_signals"):
+        if expected[key] != actual[key]:
+            mismatches.append(f"{key}: {expected[key]!r} != {actual[key]!r}")
+
+    if len(expected["sections"]) != len(actual["sections"]):
+        mismatches.append(
+            f"section count: {len(expected['sections'])} != {len(actual['sections'])}"
+        )
+
+    raw_html_diffs = 0
+    for want, got in zip(expected["sections"], actual["sections"]):
+        if want.pop("rawHtml") != got.pop("rawHtml"):
+            raw_html_diffs += 1
+        want.pop("truncated")
+        got.pop("truncated")
+        if want != got:
+            fields = [field for field in want if want[field] != got[field]]
+            mismatches.append(f"section {want['id']}: {', '.join(fields)} differ")
+
+    status = "ok" if not mismatches else "FAIL"
+    print(
+        f"{status:4} {page.name}: {len(expected['sections'])} sections, "
+        f"bs4 {bs4_time * 1000:.0f} ms, lxml {lxml_time * 1000:.0f} ms, "
+        f"rawHtml differs in {raw_html_diffs}"
+    )
+    for mismatch in mismatches:
+        print(f"       {mismatch}")
+
+    return not mismatches
+
+
+def collect_pages(paths: list[str]) -> list[Path]:
+    pages = []
+    for arg in paths or [str(DEFAULT_CORPUS)]:
+        path = Path(arg)
+        if path.is_dir():
+            pages.extend(sorted(path.glob("*.html")))
+        else:
+            pages.append(path)
+    return pages
+
+
+def main() -> int:
+    pages = collect_pages(sys.argv[1:])
+    failures = [page for page in pages if not compare(page)]
+    print(f"\n{len(pages) - len(failures)}/{len(pages)} pages match")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())